@@ -0,0 +1,304 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import os
+import Queue
+import threading
+import time
+import numpy
+
+def strip_lines(text, comments):
+    "Returns C{text} without comments and blank lines."
+    lines = []
+    for line in text.splitlines():
+        if comments:
+            line = line.split(comments, 1)[0]
+        if line.strip():
+            lines.append(line)
+    return "\n".join(lines)
+
+def parse_chunk(text, width, columns=None, delimiter=None, comments='#',
+                dtype=numpy.float64):
+    """
+    Parses C{text}, whole lines of C{width} numbers each, into a 2D array
+    of the given C{columns}.  Plain numeric text is converted in a single
+    call; comments and blank lines are removed first if there are any.
+    """
+    if comments and comments in text:
+        text = strip_lines(text, comments)
+    if delimiter:
+        text = text.replace(delimiter, " ")
+
+    lines = text.count("\n") + (not text.endswith("\n") and len(text) > 0)
+    values = numpy.fromstring(text, dtype = dtype, sep = " ")
+    if len(values) != lines * width:
+        # Either blank lines, or a line that is not numbers.
+        text = strip_lines(text, None)
+        lines = text.count("\n") + (len(text) > 0)
+        values = numpy.fromstring(text, dtype = dtype, sep = " ")
+        if len(values) != lines * width:
+            raise ValueError("Expected %d numbers on each of %d lines, "
+                             "found %d numbers." % (width, lines, len(values)))
+
+    values = values.reshape(-1, width)
+    if columns is not None:
+        values = values[:, columns]
+    return values
+
+class AsciiLoader:
+    """
+    Loads large text files of numbers in columns.  The file is read and
+    parsed in chunks of about C{chunk} bytes, each chunk converting
+    straight into a preallocated array of the selected columns, so the
+    memory used is the size of the result plus a few chunks rather than
+    several times the size of the file.
+
+    With C{threads} greater than zero, chunks are parsed by that many
+    threads while the next ones are read.  A C{progress} function is
+    called after every chunk with the loader, whose C{GetData} then
+    returns the rows loaded so far, e.g. to plot them.
+
+    Given a C{ParseCache}, the result is stored in it and a file already
+    loaded with the same options is mapped from the cache instead.
+    """
+
+    def __init__(self, path, columns=None, delimiter=None, comments='#',
+                 skiprows=0, dtype=numpy.float64, chunk=1 << 24, threads=0,
+                 progress=None, cache=None):
+        self.path      = path
+        self.columns   = columns
+        self.delimiter = delimiter
+        self.comments  = comments
+        self.skiprows  = skiprows
+        self.dtype     = numpy.dtype(dtype)
+        self.chunk     = chunk
+        self.threads   = threads
+        self.progress  = progress
+        self.cache     = cache
+
+        self.data      = None
+        self.rows      = 0
+        self.bytes     = 0
+        self.size      = os.path.getsize(path)
+        self.elapsed   = 0.0
+        self.cached    = False
+
+        if columns is not None:
+            self.columns = list(numpy.atleast_1d(columns))
+
+    def GetData(self):
+        """
+        Returns the rows loaded so far, as a view of the result.
+        """
+        if self.data is None:
+            return numpy.zeros((0, 0), dtype = self.dtype)
+        return self.data[:self.rows]
+
+    def GetStatistics(self):
+        """
+        Returns the bytes and rows loaded, the time taken, the rates and
+        whether the result came from the cache.
+        """
+        elapsed = max(self.elapsed, 1e-9)
+        return { 'bytes'      : self.bytes
+               , 'rows'       : self.rows
+               , 'seconds'    : self.elapsed
+               , 'MBPerSecond': self.bytes / elapsed / 1e6
+               , 'rowsPerSecond' : self.rows / elapsed
+               , 'cached'     : self.cached
+               }
+
+    def GetOptions(self):
+        """
+        Returns the options that the result depends on, for the cache.
+        """
+        columns = self.columns
+        if columns is not None:
+            columns = [int(column) for column in columns]
+        return { 'columns'   : columns
+               , 'delimiter' : self.delimiter
+               , 'comments'  : self.comments
+               , 'skiprows'  : self.skiprows
+               , 'dtype'     : self.dtype.str
+               }
+
+    def ReadChunks(self, f):
+        """
+        Yields the text of the file in chunks of whole lines.
+        """
+        rest = ""
+        while True:
+            block = f.read(self.chunk)
+            if not block:
+                break
+            block = rest + block
+            end = block.rfind("\n") + 1
+            if end == 0:
+                rest = block
+                continue
+            rest = block[end:]
+            yield block[:end]
+        if rest.strip():
+            yield rest
+
+    def Start(self, f):
+        """
+        Skips the header rows and returns the number of columns, from the
+        first line of data.
+        """
+        for i in range(self.skiprows):
+            self.bytes += len(f.readline())
+
+        position = f.tell()
+        while True:
+            line = f.readline()
+            if not line:
+                raise ValueError("%s holds no data." % self.path)
+            if self.comments:
+                line = line.split(self.comments, 1)[0]
+            if self.delimiter:
+                line = line.replace(self.delimiter, " ")
+            if line.strip():
+                break
+        f.seek(position)
+        return len(line.split())
+
+    def Store(self, values):
+        """
+        Appends parsed rows to the result, growing it if needed.  A grown
+        result is a new array, so rows handed out before stay valid.
+        """
+        if self.data is None:
+            # Guess the number of rows from the density of the first chunk.
+            guess = int(1.05 * len(values) * self.size / max(1, self.bytes))
+            self.data = numpy.empty((max(guess, len(values)), values.shape[1]),
+                                    dtype = self.dtype)
+
+        if self.rows + len(values) > len(self.data):
+            grown = max(self.rows + len(values), len(self.data) * 3 // 2)
+            data = numpy.empty((grown, self.data.shape[1]), dtype = self.dtype)
+            data[:self.rows] = self.data[:self.rows]
+            self.data = data
+
+        self.data[self.rows:self.rows + len(values)] = values
+        self.rows += len(values)
+
+        if self.progress is not None:
+            self.progress(self)
+
+    def Load(self):
+        """
+        Reads the whole file and returns the selected columns as a 2D
+        array, one row per line.
+        """
+        start = time.time()
+        if self.cache is not None:
+            # The key is taken before reading, so a file changed while
+            # loading is not stored as if it were the new one.
+            key  = self.cache.GetKey(self.path, self.GetOptions())
+            data = self.cache.get(key)
+            if data is not None:
+                self.data, self.rows = data, len(data)
+                self.cached  = True
+                self.elapsed = time.time() - start
+                if self.progress is not None:
+                    self.progress(self)
+                return data
+
+        f = open(self.path, "rb")
+        try:
+            width = self.Start(f)
+            parse = lambda text: parse_chunk(text, width, self.columns,
+                                             self.delimiter, self.comments,
+                                             self.dtype)
+            if self.threads > 0:
+                self.LoadThreaded(f, parse)
+            else:
+                for text in self.ReadChunks(f):
+                    self.bytes += len(text)
+                    self.Store(parse(text))
+        finally:
+            f.close()
+            self.elapsed = time.time() - start
+
+        if self.data is None:
+            return self.GetData()
+        # Give back the rows guessed but not used, unless some of the
+        # result is already in use elsewhere, e.g. plotted.
+        try:
+            self.data.resize((self.rows, self.data.shape[1]))
+        except ValueError:
+            self.data = self.data[:self.rows]
+        if self.cache is not None:
+            self.cache.put(key, self.data, os.path.abspath(self.path))
+        return self.data
+
+    def LoadThreaded(self, f, parse):
+        """
+        Parses chunks on worker threads, storing the results in order.  At
+        most two chunks per thread are held at any time.
+        """
+        work    = Queue.Queue(2 * self.threads)
+        results = {}
+        done    = threading.Condition()
+
+        def worker():
+            while True:
+                item = work.get()
+                if item is None:
+                    return
+                number, text = item
+                try:
+                    result = parse(text), len(text)
+                except Exception, e:
+                    result = e, len(text)
+                done.acquire()
+                results[number] = result
+                done.notify()
+                done.release()
+
+        workers = [threading.Thread(target = worker)
+                   for i in range(self.threads)]
+        for thread in workers:
+            thread.setDaemon(True)
+            thread.start()
+
+        def store(number):
+            "Waits for chunk C{number} and stores it."
+            done.acquire()
+            while number not in results:
+                done.wait()
+            values, size = results.pop(number)
+            done.release()
+            if isinstance(values, Exception):
+                raise values
+            self.bytes += size
+            self.Store(values)
+
+        try:
+            stored = 0
+            for number, text in enumerate(self.ReadChunks(f)):
+                work.put((number, text))
+                if number - stored >= 2 * self.threads:
+                    store(stored)
+                    stored += 1
+            while stored < number + 1:
+                store(stored)
+                stored += 1
+        finally:
+            for thread in workers:
+                work.put(None)
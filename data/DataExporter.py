@@ -0,0 +1,165 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+from   cStringIO import StringIO
+import json
+import os
+import struct
+import tempfile
+import numpy
+from   numpy.lib import format as npy
+
+MAGIC   = "DEAPBIN1"
+ALIGN   = 64
+FORMATS = ('npy', 'npz', 'bin', 'csv')
+
+class DataExporter:
+    """
+    Writes labelled X, Y series to a file, as:
+
+      - C{npy}: a single series, as an (n, 2) array of X and Y;
+      - C{npz}: every series, as arrays C{x0}, C{y0}, C{x1}, ... with
+        their labels in C{labels};
+      - C{bin}: a JSON header, giving the label, length and offsets of
+        every series, followed by the X and Y values as little-endian
+        doubles, each array starting on a multiple of 64 bytes;
+      - C{csv}: lines of label, X and Y.
+
+    The format is taken from the extension of the path unless given.
+    Except for C{npz}, which numpy writes, series are written C{chunk}
+    samples at a time, so no copy of the data is ever made in full.
+    The file is written under another name and renamed when complete,
+    so a failed export never leaves a partial file at C{path}.
+    """
+
+    def __init__(self, path, format=None, chunk=1 << 16):
+        self.path   = path
+        self.format = format or os.path.splitext(path)[1][1:].lower()
+        self.chunk  = chunk
+        self.series = []
+
+        if self.format not in FORMATS:
+            raise ValueError("Cannot export to %s: the format must be one "
+                             "of %s." % (path, ", ".join(FORMATS)))
+
+    def Add(self, label, x, y):
+        """
+        Adds a series to write.  A label of C{None} is written as an
+        empty one, a unicode label in UTF-8, and any other as its string.
+        """
+        if label is None:
+            label = ""
+        elif isinstance(label, unicode):
+            label = label.encode('utf-8')
+        else:
+            label = str(label)
+        x, y = numpy.asarray(x).ravel(), numpy.asarray(y).ravel()
+        n = min(len(x), len(y))
+        self.series.append((label, x[:n], y[:n]))
+
+    def GetSize(self):
+        "Returns the number of samples of all the series."
+        return sum([len(x) for label, x, y in self.series])
+
+    def Write(self):
+        """
+        Writes the series.  Returns the number of samples written.
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        handle, temporary = tempfile.mkstemp(".tmp", "", directory)
+        f = os.fdopen(handle, "w" if self.format == 'csv' else "wb")
+        try:
+            getattr(self, "Write" + self.format.capitalize())(f)
+            f.close()
+            # Temporary files are private; the export is not.
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(temporary, 0666 & ~umask)
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            os.rename(temporary, self.path)
+        except:
+            f.close()
+            os.remove(temporary)
+            raise
+        return self.GetSize()
+
+    def Chunks(self, x, y):
+        "Yields consecutive pieces of C{x} and C{y}, as views."
+        for first in range(0, len(x), self.chunk):
+            yield x[first:first + self.chunk], y[first:first + self.chunk]
+
+    def WriteNpy(self, f):
+        if len(self.series) != 1:
+            raise ValueError("A .npy file holds one line, not %d; use .npz, "
+                             ".bin or .csv." % len(self.series))
+        label, x, y = self.series[0]
+        npy.write_array_header_1_0(f, { 'descr'         : '<f8'
+                                      , 'fortran_order' : False
+                                      , 'shape'         : (len(x), 2)
+                                      })
+        for xs, ys in self.Chunks(x, y):
+            rows = numpy.empty((len(xs), 2), '<f8')
+            rows[:, 0], rows[:, 1] = xs, ys
+            rows.tofile(f)
+
+    def WriteNpz(self, f):
+        labels = [label for label, x, y in self.series]
+        arrays = { 'labels' : numpy.array(labels) }
+        for n, (label, x, y) in enumerate(self.series):
+            arrays['x%d' % n], arrays['y%d' % n] = x, y
+        numpy.savez(f, **arrays)
+
+    def WriteBin(self, f):
+        layout, offset = [], 0
+        for label, x, y in self.series:
+            size = -(-len(x) * 8 // ALIGN) * ALIGN
+            layout.append({ 'label'  : label
+                          , 'length' : len(x)
+                          , 'x'      : offset
+                          , 'y'      : offset + size
+                          })
+            offset += 2 * size
+
+        header = { 'dtype' : '<f8', 'series' : layout, 'start' : 0 }
+        text   = json.dumps(header)
+        header['start'] = -(-(len(MAGIC) + 8 + len(text) + 32) // ALIGN) * ALIGN
+        text   = json.dumps(header)
+
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(text)))
+        f.write(text)
+        for (label, x, y), entry in zip(self.series, layout):
+            for values, key in ((x, 'x'), (y, 'y')):
+                f.seek(header['start'] + entry[key])
+                for first in range(0, len(values), self.chunk):
+                    chunk = values[first:first + self.chunk]
+                    numpy.asarray(chunk, '<f8').tofile(f)
+        f.seek(header['start'] + offset)
+        f.truncate()
+
+    def WriteCsv(self, f):
+        f.write("label,x,y\n")
+        for label, x, y in self.series:
+            prefix = '"%s",' % label.replace('"', '""')
+            for xs, ys in self.Chunks(x, y):
+                text = StringIO()
+                numpy.savetxt(text, numpy.column_stack((xs, ys)),
+                              fmt = "%.17g,%.17g")
+                text = text.getvalue()
+                f.write(prefix + text[:-1].replace("\n", "\n" + prefix))
+                f.write("\n")
@@ -0,0 +1,132 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+from   AsciiLoader import parse_chunk
+import os
+import numpy
+
+class FileFollower:
+    """
+    Follows a text data file that is being appended to, like C{tail -f}.
+    The byte offset reached and any incomplete last line are remembered,
+    so each C{Poll} reads and parses only the bytes appended since the
+    one before, and adds the new rows to the end of an array that grows
+    by doubling: the cost of a poll depends on the amount of new data,
+    not on the size of the file.  A file that shrinks, e.g., because it
+    was replaced, is followed again from the start.
+    """
+
+    def __init__(self, path, columns=None, delimiter=None, comments='#',
+                 skiprows=0, dtype=numpy.float64):
+        self.path      = path
+        self.columns   = columns
+        self.delimiter = delimiter
+        self.comments  = comments
+        self.skiprows  = skiprows
+        self.dtype     = numpy.dtype(dtype)
+
+        if columns is not None:
+            self.columns = list(numpy.atleast_1d(columns))
+        self.Reset()
+
+    def __repr__(self):
+        return "<FileFollower %s>" % self.path
+
+    def Reset(self):
+        "Forgets what was read, to follow the file from the start."
+        self.offset  = 0        # bytes read
+        self.partial = ""       # the last line read, if incomplete
+        self.skip    = self.skiprows
+        self.width   = None     # numbers per line
+        self.data    = None
+        self.rows    = 0
+
+    def GetData(self):
+        """
+        Returns the rows read so far, as a view of the result.
+        """
+        if self.data is None:
+            return numpy.zeros((0, len(self.columns or ())), self.dtype)
+        return self.data[:self.rows]
+
+    def Read(self):
+        "Returns the whole lines appended since the last read."
+        size = os.path.getsize(self.path)
+        if size < self.offset:
+            self.Reset()
+        if size == self.offset:
+            return ""
+
+        f = open(self.path, "rb")
+        try:
+            f.seek(self.offset)
+            text = f.read(size - self.offset)
+        finally:
+            f.close()
+        self.offset += len(text)
+
+        text = self.partial + text
+        end  = text.rfind("\n") + 1
+        self.partial = text[end:]
+        text = text[:end]
+
+        while self.skip and text:
+            text = text[text.find("\n") + 1:]
+            self.skip -= 1
+        return text
+
+    def GetWidth(self, text):
+        "Returns the numbers per line, from the first line of data in C{text}."
+        for line in text.splitlines():
+            if self.comments:
+                line = line.split(self.comments, 1)[0]
+            if self.delimiter:
+                line = line.replace(self.delimiter, " ")
+            if line.strip():
+                return len(line.split())
+        return None
+
+    def Store(self, values):
+        "Appends C{values} to the rows, growing the result if needed."
+        if self.data is None:
+            self.data = numpy.empty((max(1024, len(values)), values.shape[1]),
+                                    self.dtype)
+        if self.rows + len(values) > len(self.data):
+            grown = max(self.rows + len(values), 2 * len(self.data))
+            data  = numpy.empty((grown, self.data.shape[1]), self.dtype)
+            data[:self.rows] = self.data[:self.rows]
+            self.data = data
+        self.data[self.rows:self.rows + len(values)] = values
+        self.rows += len(values)
+
+    def Poll(self):
+        """
+        Reads the lines appended since the last poll and returns them as
+        rows of the selected columns; these are also added to the rows
+        returned by C{GetData}.
+        """
+        text = self.Read()
+        if self.width is None:
+            self.width = self.GetWidth(text)
+        if self.width is None:
+            return self.GetData()[:0]
+
+        values = parse_chunk(text, self.width, self.columns, self.delimiter,
+                             self.comments, self.dtype)
+        if len(values):
+            self.Store(values)
+        return values
@@ -0,0 +1,344 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import re
+import numpy
+
+BLOCK = 2880
+CARD  = 80
+
+# Binary table column types and the (big-endian) numpy types they map to.
+# Bit arrays are kept as bytes and descriptors of variable length arrays
+# as pairs of integers.
+FORMATS = { 'L' : 'i1',  'X' : 'u1',  'B' : 'u1',  'I' : '>i2'
+          , 'J' : '>i4', 'K' : '>i8', 'A' : 'S',   'E' : '>f4'
+          , 'D' : '>f8', 'C' : '>c8', 'M' : '>c16'
+          , 'P' : '>i4', 'Q' : '>i8'
+          }
+
+# Columns used to index the rows, by default as in GBT SDFITS files.
+KEYS = { 'scan'         : 'SCAN'
+       , 'integration'  : 'INT'
+       , 'polarization' : 'PLNUM'
+       , 'feed'         : 'FDNUM'
+       , 'window'       : 'IFNUM'
+       }
+
+# The keys the rows are sorted by for lookups, most significant first.
+ORDER = ('scan', 'integration', 'polarization', 'feed', 'window')
+
+class FitsError(Exception):
+    "Raised for files that are not FITS files this reader understands."
+
+def parse_value(text):
+    """
+    Returns the value of a header card, given the text after C{"= "}.
+    """
+    text = text.strip()
+    if text.startswith("'"):
+        end = 1
+        while True:
+            end = text.find("'", end)
+            if end < 0:
+                raise FitsError("Unterminated string %s." % text)
+            if text[end + 1:end + 2] != "'":
+                break
+            end += 2
+        return text[1:end].replace("''", "'").rstrip()
+
+    text = text.split("/")[0].strip()
+    if text in ("T", "F"):
+        return text == "T"
+    if text == "":
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        return float(text.replace("D", "E"))
+
+def read_header(f):
+    """
+    Reads the header at the current position of C{f} and returns its
+    keywords as a dictionary and its cards, in order, as a list.  Returns
+    C{None, None} at the end of the file.
+    """
+    values, cards = {}, []
+    while True:
+        block = f.read(BLOCK)
+        if not block:
+            if cards:
+                raise FitsError("Header without END.")
+            return None, None
+        if len(block) != BLOCK:
+            raise FitsError("Truncated header block.")
+
+        for i in range(0, BLOCK, CARD):
+            card = block[i:i + CARD]
+            key = card[:8].strip()
+            if key == "END":
+                return values, cards
+            cards.append(card)
+            if card[8:10] == "= ":
+                values[key] = parse_value(card[10:])
+
+def get_data_size(header):
+    "Returns the size in bytes, without padding, of the data of an HDU."
+    axes = header.get('NAXIS', 0)
+    if axes == 0:
+        return 0
+    size = 1
+    for n in range(1, axes + 1):
+        size *= header['NAXIS%d' % n]
+    return abs(header['BITPIX']) // 8 * header.get('GCOUNT', 1) \
+           * (size + header.get('PCOUNT', 0))
+
+def get_column_dtype(tform):
+    """
+    Returns the numpy type, and the repeat count, of a binary table
+    column with format C{tform} (e.g. C{1J}, C{4096E} or C{32A}).
+    """
+    match = re.match(r"\s*(\d*)([LXBIJKAEDCMPQ])", tform)
+    if match is None:
+        raise FitsError("Unsupported column format %s." % tform)
+    repeat = match.group(1) and int(match.group(1)) or 1
+    code   = match.group(2)
+
+    if code == 'A':
+        return numpy.dtype('S%d' % repeat), 1
+    if code == 'X':
+        return numpy.dtype('u1'), (repeat + 7) // 8
+    if code in 'PQ':
+        return numpy.dtype(FORMATS[code]), 2 * repeat
+    return numpy.dtype(FORMATS[code]), repeat
+
+class FitsTable:
+    """
+    A FITS binary table, memory mapped rather than read.  Columns are
+    returned as views of the file, so only the rows used are ever read.
+    Rows are indexed by scan, integration, polarization, feed and
+    spectral window; the integration, if the table has no such column, is
+    the position of the row among those with the same other keys.  The
+    index holds the rows sorted by those keys, so a lookup bisects it
+    rather than scanning every row.
+
+    Values are returned as stored: big-endian, and without applying any
+    TSCAL or TZERO.
+    """
+
+    def __init__(self, path, extension=0, keys=None):
+        self.path = path
+        self.keys = dict(KEYS)
+        self.keys.update(keys or {})
+
+        self.header, self.cards, offset = self.FindTable(extension)
+        self.columns = self.GetColumnTypes()
+        self.table = numpy.memmap(path, numpy.dtype(self.columns), 'r',
+                                  offset, (self.header['NAXIS2'],))
+        self.index = None
+        self.order = None # row numbers sorted by the keys of ORDER
+        self.keyed = None # the keys of ORDER, in that order, for each row
+
+    def FindTable(self, extension):
+        """
+        Returns the header, cards and data offset of the binary table
+        C{extension}, given as its position among the binary tables of
+        the file or as its EXTNAME.
+        """
+        f = open(self.path, "rb")
+        try:
+            count = 0
+            while True:
+                header, cards = read_header(f)
+                if header is None:
+                    raise FitsError("%s has no binary table %s."
+                                    % (self.path, extension))
+                offset = f.tell()
+                size = get_data_size(header)
+                f.seek(-(-size // BLOCK) * BLOCK, 1)
+
+                if header.get('XTENSION') != 'BINTABLE':
+                    continue
+                if extension == count or extension == header.get('EXTNAME'):
+                    return header, cards, offset
+                count += 1
+        finally:
+            f.close()
+
+    def GetColumnTypes(self):
+        """
+        Returns the fields of a row, as a list of names, types and shapes
+        for a numpy structured type.
+        """
+        fields, width = [], 0
+        for n in range(1, self.header['TFIELDS'] + 1):
+            name = self.header.get('TTYPE%d' % n) or 'COL%d' % n
+            dtype, repeat = get_column_dtype(self.header['TFORM%d' % n])
+            if repeat == 1:
+                fields.append((name, dtype))
+            elif repeat > 1:
+                fields.append((name, dtype, (repeat,)))
+            width += dtype.itemsize * repeat
+
+        if width != self.header['NAXIS1']:
+            raise FitsError("Columns take %d bytes, rows have %d."
+                            % (width, self.header['NAXIS1']))
+        return fields
+
+    def __len__(self):
+        return len(self.table)
+
+    def GetHeader(self):
+        """
+        Returns the keywords of the table header as a dictionary.
+        """
+        return self.header
+
+    def GetColumnNames(self):
+        """
+        Returns the names of the columns.
+        """
+        return [field[0] for field in self.columns]
+
+    def GetColumn(self, name):
+        """
+        Returns column C{name} for all rows, as a view of the file.
+        """
+        return self.table[name]
+
+    def GetKey(self, key):
+        """
+        Returns the values of one of the index keys (C{scan},
+        C{integration}, C{polarization}, C{feed} or C{window}) for all
+        rows, or C{None} if the table does not have that column.
+        """
+        name = self.keys[key]
+        if name not in self.table.dtype.names:
+            return None
+        return numpy.asarray(self.table[name], dtype = numpy.int64)
+
+    def GetIndex(self):
+        """
+        Returns the index: a dictionary with the scan, integration,
+        polarization, feed and window of every row, in row order.  It is
+        built on first use, reading only the key columns, together with
+        the rows sorted by those keys.
+        """
+        if self.index is not None:
+            return self.index
+
+        rows  = len(self.table)
+        index = {}
+        for key in ('scan', 'polarization', 'feed', 'window', 'integration'):
+            values = self.GetKey(key)
+            if values is None:
+                values = numpy.zeros(rows, dtype = numpy.int64)
+                if key == 'integration':
+                    values = self.CountIntegrations(index)
+            index[key] = values
+
+        self.order = numpy.lexsort([numpy.arange(rows)] +
+                                   [index[key] for key in ORDER[::-1]])
+        self.keyed = [index[key][self.order] for key in ORDER]
+        self.index = index
+        return index
+
+    def CountIntegrations(self, index):
+        """
+        Numbers the rows with the same scan, polarization, feed and window
+        in the order they appear.
+        """
+        order = numpy.lexsort((numpy.arange(len(self.table)),
+                               index['window'], index['feed'],
+                               index['polarization'], index['scan']))
+        keys  = numpy.column_stack((index['scan'], index['polarization'],
+                                    index['feed'], index['window']))[order]
+        new   = numpy.r_[True, (keys[1:] != keys[:-1]).any(axis = 1)]
+        group = numpy.flatnonzero(new)
+        sizes = numpy.diff(numpy.r_[group, len(order)])
+
+        counts = numpy.arange(len(order)) - numpy.repeat(group, sizes)
+        integrations = numpy.empty(len(order), dtype = numpy.int64)
+        integrations[order] = counts
+        return integrations
+
+    def GetRows(self, scan=None, integration=None, polarization=None,
+                feed=None, window=None):
+        """
+        Returns the numbers, in order, of the rows matching all of the
+        given keys.  Each key may be a number or a list of numbers.
+        """
+        index  = self.GetIndex()
+        given  = { 'scan'         : scan
+                 , 'integration'  : integration
+                 , 'polarization' : polarization
+                 , 'feed'         : feed
+                 , 'window'       : window
+                 }
+
+        # The leading keys given narrow down ranges of the sorted rows.
+        ranges = [(0, len(self.order))]
+        level  = 0
+        while level < len(ORDER) and given[ORDER[level]] is not None:
+            values   = numpy.unique(given[ORDER[level]])
+            column   = self.keyed[level]
+            narrowed = []
+            for first, last in ranges:
+                lower = numpy.searchsorted(column[first:last], values, 'left')
+                upper = numpy.searchsorted(column[first:last], values, 'right')
+                narrowed += [(first + l, first + u)
+                             for l, u in zip(lower, upper) if u > l]
+            ranges = narrowed
+            level += 1
+        rows = numpy.concatenate([self.order[first:last]
+                                  for first, last in ranges] +
+                                 [numpy.zeros(0, self.order.dtype)])
+
+        # The other keys are checked on those rows only.
+        for key in ORDER[level:]:
+            wanted = given[key]
+            if wanted is None: continue
+            values = index[key][rows]
+            if numpy.ndim(wanted) == 0:
+                rows = rows[values == wanted]
+            else:
+                rows = rows[numpy.in1d(values, wanted)]
+        rows.sort()
+        return rows
+
+    def GetSpectra(self, scan=None, integration=None, polarization=None,
+                   feed=None, window=None, column='DATA'):
+        """
+        Returns C{column} of the rows matching the given keys, one row per
+        spectrum.  When the rows are consecutive in the file, as they
+        usually are for a scan, the result is a view of the file;
+        otherwise only the matching rows are read.
+        """
+        rows = self.GetRows(scan, integration, polarization, feed, window)
+        data = self.table[column]
+        if len(rows) == 0:
+            return data[:0]
+        if rows[-1] - rows[0] + 1 == len(rows):
+            return data[rows[0]:rows[-1] + 1]
+        if len(rows) > 1 and (numpy.diff(rows) == rows[1] - rows[0]).all():
+            return data[rows[0]:rows[-1] + 1:rows[1] - rows[0]]
+        return data[rows]
+
+    def GetScans(self):
+        """
+        Returns the scan numbers in the table, sorted.
+        """
+        return numpy.unique(self.GetIndex()['scan'])
@@ -0,0 +1,190 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+from   AsciiLoader import AsciiLoader
+import fnmatch
+import os
+import sys
+import threading
+import time
+import traceback
+
+try:
+    import pyinotify
+except ImportError:
+    pyinotify = None
+
+def load_text(path):
+    "Loads all the columns of a text data file."
+    return AsciiLoader(path).Load()
+
+class FolderWatcher:
+    """
+    Watches a directory for new or changed files matching C{pattern} and
+    loads them on a background thread.  The directory is listed every
+    C{interval} seconds, or as soon as inotify reports a change when
+    pyinotify is installed, and compared with a table of the sizes and
+    modification times seen before, so only new or changed files are
+    ever read.  A file is loaded once it has not changed between two
+    listings at least C{settle} seconds, by default C{interval}, apart,
+    so files still being written are left alone even when inotify
+    events bring listings close together.
+
+    Each file is loaded with C{load}, by default as columns of text, and
+    the path and data are passed to C{callback}.  Both run on the
+    background thread: a callback that draws must hand the data to the
+    GUI thread, e.g., with wx.CallAfter.
+    """
+
+    def __init__(self, directory, pattern='*', callback=None, load=None,
+                 interval=2.0, existing=False, inotify=True, settle=None):
+        self.directory = directory
+        self.pattern   = pattern
+        self.callback  = callback
+        self.load      = load or load_text
+        self.interval  = interval
+        self.settle    = settle     # seconds unchanged before loading
+        self.existing  = existing   # also load the files already there
+        self.inotify   = inotify and pyinotify is not None
+
+        self.seen      = {}         # path: (size, mtime) loaded
+        self.pending   = {}         # path: (size, mtime) at last listing
+        self.since     = {}         # path: time its (size, mtime) was seen
+        self.stopped   = threading.Event()
+        self.thread    = None
+        self.notifier  = None
+
+    def __repr__(self):
+        return "<FolderWatcher %s>" % os.path.join(self.directory,
+                                                   self.pattern)
+
+    def List(self):
+        """
+        Returns the size and modification time of every matching file.
+        """
+        files = {}
+        for name in fnmatch.filter(os.listdir(self.directory), self.pattern):
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue # removed since listed
+            if os.path.isfile(path):
+                files[path] = (stat.st_size, stat.st_mtime)
+        return files
+
+    def Scan(self):
+        """
+        Lists the directory and returns the files, sorted, that are new
+        or changed and have not changed since the last listing, nor for
+        the last C{settle} seconds.
+        """
+        files  = self.List()
+        now    = time.time()
+        settle = self.interval if self.settle is None else self.settle
+
+        since = {}
+        for path, stat in files.items():
+            if self.pending.get(path) == stat:
+                since[path] = self.since.get(path, now)
+            else:
+                since[path] = now
+        ready = [path for path, stat in files.items()
+                 if self.seen.get(path) != stat
+                    and self.pending.get(path) == stat
+                    and now - since[path] >= settle]
+        self.pending = files
+        self.since   = since
+        for path in ready:
+            self.seen[path] = files[path]
+        # Forget removed files, so they are loaded if they come back.
+        for path in self.seen.keys():
+            if path not in files:
+                del self.seen[path]
+        ready.sort()
+        return ready
+
+    def Start(self):
+        """
+        Starts watching.  Returns the watcher.
+        """
+        if not self.existing:
+            self.seen    = self.List()
+            self.pending = dict(self.seen)
+            self.since   = {}
+
+        if self.inotify:
+            manager = pyinotify.WatchManager()
+            manager.add_watch(self.directory, pyinotify.IN_CLOSE_WRITE |
+                              pyinotify.IN_MOVED_TO | pyinotify.IN_MODIFY)
+            # Events only wake up the listing; without a handler of its
+            # own, pyinotify would print every one of them.
+            self.notifier = pyinotify.Notifier(manager,
+                                               pyinotify.ProcessEvent(),
+                                               timeout = self.interval * 1000)
+
+        self.stopped.clear()
+        self.thread = threading.Thread(target = self.Run)
+        self.thread.setDaemon(True)
+        self.thread.start()
+        return self
+
+    def Stop(self):
+        """
+        Stops watching, after the file being loaded, if any.
+        """
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        if self.notifier is not None:
+            self.notifier.stop()
+            self.notifier = None
+
+    def IsWatching(self):
+        "Returns a boolean indicating if the directory is being watched."
+        return self.thread is not None and not self.stopped.isSet()
+
+    def Wait(self):
+        "Waits for the next listing: a change, or the interval."
+        if self.notifier is None:
+            self.stopped.wait(self.interval)
+        elif self.notifier.check_events():
+            self.notifier.read_events()
+            self.notifier.process_events()
+
+    def Run(self):
+        "Loads files as they settle, until stopped."
+        while not self.stopped.isSet():
+            self.Wait()
+            try:
+                ready = self.Scan()
+            except OSError:
+                ready = [] # e.g., the directory is being remounted
+            for path in ready:
+                if self.stopped.isSet(): break
+                self.Process(path)
+
+    def Process(self, path):
+        "Loads C{path} and passes the data on."
+        try:
+            data = self.load(path)
+            if self.callback is not None:
+                self.callback(path, data)
+        except Exception:
+            print >> sys.stderr, "Could not load %s:" % path
+            traceback.print_exc()
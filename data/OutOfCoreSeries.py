@@ -0,0 +1,316 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import json
+import os
+import struct
+import numpy
+
+MAGIC    = "DEAPPYR1"
+VERSION  = 1
+ALIGN    = 64
+MIN, MAX, MEAN, COUNT = range(4)
+
+def get_level_sizes(samples, block, fanout):
+    """
+    Returns the number of entries of each level of a pyramid over
+    C{samples} values, the first level holding one entry per C{block}
+    samples and each following one an entry per C{fanout} entries.
+    """
+    sizes = [max(1, -(-samples // block))]
+    while sizes[-1] > 1:
+        sizes.append(-(-sizes[-1] // fanout))
+    return sizes
+
+def reduce_blocks(values, size):
+    """
+    Returns the minimum, maximum, mean and count of the finite C{values}
+    in consecutive groups of C{size}, as rows of a 2D array.
+    """
+    groups = numpy.arange(0, len(values), size)
+    finite = numpy.isfinite(values)
+    counts = numpy.add.reduceat(finite.astype(numpy.float64), groups)
+    sums   = numpy.add.reduceat(numpy.where(finite, values, 0.0), groups)
+
+    rows = numpy.empty((len(groups), 4))
+    rows[:, MIN]   = numpy.fmin.reduceat(values, groups)
+    rows[:, MAX]   = numpy.fmax.reduceat(values, groups)
+    rows[:, MEAN]  = sums / numpy.maximum(counts, 1)
+    rows[:, COUNT] = counts
+    rows[counts == 0, MEAN] = numpy.nan
+    return rows
+
+def reduce_rows(rows, fanout):
+    """
+    Combines consecutive groups of C{fanout} pyramid entries into one.
+    """
+    groups = numpy.arange(0, len(rows), fanout)
+    counts = numpy.add.reduceat(rows[:, COUNT], groups)
+    sums   = numpy.add.reduceat(numpy.nan_to_num(rows[:, MEAN])
+                                * rows[:, COUNT], groups)
+
+    reduced = numpy.empty((len(groups), 4))
+    reduced[:, MIN]   = numpy.fmin.reduceat(rows[:, MIN], groups)
+    reduced[:, MAX]   = numpy.fmax.reduceat(rows[:, MAX], groups)
+    reduced[:, MEAN]  = sums / numpy.maximum(counts, 1)
+    reduced[:, COUNT] = counts
+    reduced[counts == 0, MEAN] = numpy.nan
+    return reduced
+
+class OutOfCoreSeries:
+    """
+    A uniformly sampled series stored in a raw binary file, possibly much
+    larger than memory.  The file is memory mapped, so only the pages that
+    are read are loaded.  A pyramid of per-block minimum, maximum, mean
+    and count is kept in a sidecar file next to it; it is built by one
+    streaming pass the first time the file is opened and reused as long
+    as the file is unchanged.  Any view is then drawn from the pyramid
+    level matching the screen resolution, and raw samples are only read
+    when zoomed in far enough for them to be few.
+    """
+
+    def __init__(self, path, dtype='<f8', offset=0, x0=0.0, dx=1.0,
+                 block=1024, fanout=16, index=None, chunk=1 << 22):
+        self.path   = path
+        self.dtype  = numpy.dtype(dtype)
+        self.offset = offset
+        self.x0     = x0
+        self.dx     = dx
+        self.block  = block
+        self.fanout = fanout
+        self.index  = index or path + ".pyr"
+        self.chunk  = chunk     # samples read per step of the build
+
+        size = os.path.getsize(path) - offset
+        self.samples = size // self.dtype.itemsize
+        if self.samples == 0:
+            raise ValueError("%s holds no samples." % path)
+
+        self.values = numpy.memmap(path, self.dtype, 'r', offset,
+                                   (self.samples,))
+        self.sizes  = get_level_sizes(self.samples, block, fanout)
+        self.levels = self.Load() or self.Build()
+
+    def __len__(self):
+        return self.samples
+
+    def GetIdentity(self):
+        """
+        Returns what the pyramid depends on: the size and modification
+        time of the file, and the layout of the samples and pyramid.
+        """
+        stat = os.stat(self.path)
+        return { 'version' : VERSION
+               , 'size'    : stat.st_size
+               , 'mtime'   : stat.st_mtime
+               , 'dtype'   : self.dtype.str
+               , 'offset'  : self.offset
+               , 'block'   : self.block
+               , 'fanout'  : self.fanout
+               }
+
+    def _split(self, pyramid):
+        "Returns the levels of C{pyramid} as a list of views."
+        levels, start = [], 0
+        for size in self.sizes:
+            levels.append(pyramid[start:start + size])
+            start += size
+        return levels
+
+    def Load(self):
+        """
+        Maps the pyramid from the sidecar file, if it exists and was built
+        for the file as it is.  Returns the levels, or C{None}.
+        """
+        try:
+            f = open(self.index, "rb")
+            try:
+                if f.read(len(MAGIC)) != MAGIC:
+                    return None
+                length, = struct.unpack("<Q", f.read(8))
+                header = json.loads(f.read(length))
+            finally:
+                f.close()
+        except (IOError, ValueError, struct.error):
+            return None
+
+        if header.get('identity') != self.GetIdentity():
+            return None
+
+        pyramid = numpy.memmap(self.index, '<f8', 'r', header['start'],
+                               (sum(self.sizes), 4))
+        return self._split(pyramid)
+
+    def Build(self, progress=None):
+        """
+        Computes the pyramid with one pass over the file and writes it to
+        the sidecar file.  C{progress}, if given, is called with the
+        fraction done.  Returns the levels.
+
+        The pyramid is built under a temporary name and renamed when
+        complete, so an interrupted build never leaves a sidecar that
+        C{Load} would accept.
+        """
+        header = json.dumps({ 'identity' : self.GetIdentity()
+                            , 'sizes'    : self.sizes
+                            , 'start'    : 0
+                            })
+        start = -(-(len(MAGIC) + 8 + len(header) + 32) // ALIGN) * ALIGN
+        header = json.dumps({ 'identity' : self.GetIdentity()
+                            , 'sizes'    : self.sizes
+                            , 'start'    : start
+                            })
+
+        # Without a writable sidecar, the pyramid is kept in memory.
+        shape = (sum(self.sizes), 4)
+        temporary = self.index + ".tmp"
+        try:
+            f = open(temporary, "wb")
+            try:
+                f.write(MAGIC)
+                f.write(struct.pack("<Q", len(header)))
+                f.write(header)
+                f.seek(start + shape[0] * shape[1] * 8 - 1)
+                f.write("\0")
+            finally:
+                f.close()
+            pyramid = numpy.memmap(temporary, '<f8', 'r+', start, shape)
+        except IOError:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            pyramid = numpy.empty(shape)
+        levels = self._split(pyramid)
+
+        try:
+            self.Reduce(levels, progress)
+        except:
+            if isinstance(pyramid, numpy.memmap):
+                del pyramid, levels
+                os.remove(temporary)
+            raise
+
+        if not isinstance(pyramid, numpy.memmap):
+            return levels
+        pyramid.flush()
+        del pyramid, levels
+        os.rename(temporary, self.index)
+        return self.Load()
+
+    def Reduce(self, levels, progress=None):
+        """
+        Fills the pyramid C{levels} from the samples.
+        """
+        # The first level streams over the samples; the others over the
+        # level below.  A chunk is always a whole number of groups.
+        step = max(1, self.chunk // self.block) * self.block
+        for first in range(0, self.samples, step):
+            values = numpy.asarray(self.values[first:first + step],
+                                   dtype = numpy.float64)
+            rows = reduce_blocks(values, self.block)
+            levels[0][first // self.block:
+                      first // self.block + len(rows)] = rows
+            if progress is not None:
+                progress(float(first + len(values)) / self.samples)
+
+        for level in range(1, len(levels)):
+            below = levels[level - 1]
+            step  = max(1, self.chunk // 4 // self.fanout) * self.fanout
+            for first in range(0, len(below), step):
+                rows = reduce_rows(numpy.asarray(below[first:first + step]),
+                                   self.fanout)
+                levels[level][first // self.fanout:
+                              first // self.fanout + len(rows)] = rows
+
+    def GetX(self, first, last):
+        """
+        Returns the X values of samples C{first} to C{last}.
+        """
+        return self.x0 + numpy.arange(first, last) * self.dx
+
+    def GetDataLimits(self):
+        """
+        Returns the minimum and maximum X, and the minimum and maximum Y,
+        of the series, read from the top of the pyramid.
+        """
+        top = self.levels[-1][0]
+        xmin, xmax = self.x0, self.x0 + (self.samples - 1) * self.dx
+        return min(xmin, xmax), max(xmin, xmax), top[MIN], top[MAX]
+
+    def span(self, xmin, xmax):
+        """
+        Returns the first and last (exclusive) sample within C{[xmin,
+        xmax]}, plus one sample on each side.
+        """
+        a, b = (xmin - self.x0) / self.dx, (xmax - self.x0) / self.dx
+        a, b = min(a, b), max(a, b)
+        first = int(max(0, numpy.floor(a) - 1))
+        last  = int(min(self.samples, numpy.ceil(b) + 2))
+        return first, max(first, last)
+
+    def read(self, xmin, xmax):
+        """
+        Returns the X and Y of the raw samples within C{[xmin, xmax]}.
+        Only the pages holding them are read from the file.
+        """
+        first, last = self.span(xmin, xmax)
+        y = numpy.asarray(self.values[first:last], dtype = numpy.float64)
+        return self.GetX(first, last), y
+
+    def envelope(self, xmin, xmax, bins, mean=False):
+        """
+        Returns X and Y arrays that trace the minimum and maximum of the
+        samples in C{[xmin, xmax]} over about C{bins} groups, two points
+        per group, or the mean of each group if C{mean} is set.  The
+        groups are read from the coarsest pyramid level that still has
+        C{bins} entries in the range; ranges of few samples are read from
+        the file and returned as they are.
+        """
+        first, last = self.span(xmin, xmax)
+        bins = max(1, int(bins))
+        if last - first <= 2 * bins:
+            return self.read(xmin, xmax)
+
+        if (last - first) // self.block < bins:
+            values = numpy.asarray(self.values[first:last],
+                                   dtype = numpy.float64)
+            size = max(1, (last - first) // bins)
+            rows = reduce_blocks(values, size)
+            starts = first + numpy.arange(len(rows)) * size
+        else:
+            level, size = 0, self.block
+            while level + 1 < len(self.levels) and \
+                  (last - first) // (size * self.fanout) >= bins:
+                level += 1
+                size  *= self.fanout
+            lo, hi = first // size, -(-last // size)
+            rows   = numpy.asarray(self.levels[level][lo:hi])
+            starts = numpy.arange(lo, hi) * size
+
+            # Up to fanout entries per bin are left; merge them.
+            group = len(rows) // bins
+            if group > 1:
+                rows   = reduce_rows(rows, group)
+                starts = starts[::group]
+
+        x = self.x0 + starts * self.dx
+        if mean:
+            return x, rows[:, MEAN]
+
+        y = numpy.empty(2 * len(rows))
+        y[0::2] = rows[:, MIN]
+        y[1::2] = rows[:, MAX]
+        return numpy.repeat(x, 2), y
@@ -0,0 +1,198 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import hashlib
+import json
+import os
+import tempfile
+import numpy
+
+def get_default_directory():
+    "Returns the directory used when none is given, in the home directory."
+    return os.path.join(os.path.expanduser("~"), ".deap", "cache")
+
+class ParseCache:
+    """
+    A directory of arrays parsed from data files, kept as C{.npy} files so
+    that loading the same file again maps the array instead of parsing
+    it.  Entries are keyed by the path, size and modification time of the
+    file and by the options it was parsed with, so a changed file, or the
+    same file read differently, is parsed again.  When the entries take
+    more than C{maxsize} bytes the least recently used are removed.
+
+    The cache is only an optimization: failing to read or write it never
+    fails a load.
+    """
+
+    def __init__(self, directory=None, maxsize=1 << 31):
+        self.directory = directory or get_default_directory()
+        self.maxsize   = maxsize
+        self.hits      = 0
+        self.misses    = 0
+
+    def GetKey(self, path, options):
+        """
+        Returns the key of C{path} as it is now, parsed with C{options}, a
+        dictionary of simple values.
+        """
+        stat = os.stat(path)
+        identity = json.dumps({ 'path'    : os.path.abspath(path)
+                              , 'size'    : stat.st_size
+                              , 'mtime'   : stat.st_mtime
+                              , 'options' : options
+                              }, sort_keys = True)
+        return hashlib.sha1(identity).hexdigest()
+
+    def GetPath(self, key):
+        "Returns the file holding the entry C{key}."
+        return os.path.join(self.directory, key + ".npy")
+
+    def get(self, key):
+        """
+        Returns the array stored for C{key}, memory mapped, or C{None}.
+        The array is mapped copy on write, so it can be changed in place
+        like a freshly parsed one, without changing the entry.
+        """
+        path = self.GetPath(key)
+        try:
+            array = numpy.load(path, mmap_mode = 'c')
+            os.utime(path, None) # mark as recently used
+        except (IOError, OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return array
+
+    def put(self, key, array, source=None):
+        """
+        Stores C{array} for C{key}, noting the C{source} file it came
+        from, and removes old entries if the cache is full.  Returns a
+        boolean indicating if the array was stored.
+        """
+        size = array.nbytes
+        if size > self.maxsize:
+            return False
+        temporary = None
+        try:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            # Write under another name first, so an entry is never seen
+            # half written.
+            handle, temporary = tempfile.mkstemp(".tmp", key, self.directory)
+            f = os.fdopen(handle, "wb")
+            try:
+                numpy.save(f, array)
+            finally:
+                f.close()
+            path = self.GetPath(key)
+            if os.path.exists(path):
+                os.remove(path)
+            os.rename(temporary, path)
+
+            f = open(os.path.join(self.directory, key + ".json"), "w")
+            try:
+                json.dump({ 'source' : source, 'shape' : array.shape
+                          , 'dtype'  : array.dtype.str }, f)
+            finally:
+                f.close()
+        except (IOError, OSError):
+            if temporary and os.path.exists(temporary):
+                os.remove(temporary)
+            return False
+
+        self.Evict(self.maxsize)
+        return True
+
+    def GetEntries(self):
+        """
+        Returns the entries as a list of dictionaries with the key, size,
+        time last used and source file of each, most recently used first.
+        """
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return entries
+
+        for name in names:
+            if not name.endswith(".npy"): continue
+            key = name[:-4]
+            try:
+                stat = os.stat(self.GetPath(key))
+            except OSError:
+                continue
+            try:
+                f = open(os.path.join(self.directory, key + ".json"))
+                try:
+                    source = json.load(f).get('source')
+                finally:
+                    f.close()
+            except (IOError, ValueError):
+                source = None
+            entries.append({ 'key'    : key
+                           , 'size'   : stat.st_size
+                           , 'used'   : stat.st_mtime
+                           , 'source' : source
+                           })
+        entries.sort(key = lambda entry: entry['used'], reverse = True)
+        return entries
+
+    def Remove(self, key):
+        "Removes the entry C{key}, if present."
+        for path in (self.GetPath(key),
+                     os.path.join(self.directory, key + ".json")):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def Evict(self, maxsize):
+        """
+        Removes the least recently used entries until the rest take at
+        most C{maxsize} bytes.  Returns the number of entries removed.
+        """
+        entries = self.GetEntries()
+        size    = sum([entry['size'] for entry in entries])
+        removed = 0
+        while entries and size > maxsize:
+            entry = entries.pop()
+            self.Remove(entry['key'])
+            size    -= entry['size']
+            removed += 1
+        return removed
+
+    def Purge(self):
+        """
+        Removes all entries.  Returns the number removed.
+        """
+        return self.Evict(0)
+
+    def GetStatistics(self):
+        """
+        Returns the directory, number of entries, size, maximum size,
+        hits, misses and hit rate of the cache.
+        """
+        entries = self.GetEntries()
+        lookups = self.hits + self.misses
+        return { 'directory' : self.directory
+               , 'entries'   : len(entries)
+               , 'size'      : sum([entry['size'] for entry in entries])
+               , 'maxsize'   : self.maxsize
+               , 'hits'      : self.hits
+               , 'misses'    : self.misses
+               , 'hitRate'   : lookups and float(self.hits) / lookups or 0.0
+               }
@@ -0,0 +1,30 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details. 
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+"""
+The data library holds the readers and containers for data sets that
+are too large, or arrive too quickly, to be handled as plain arrays.
+"""
+
+from AsciiLoader     import AsciiLoader
+from DataExporter    import DataExporter
+from FileFollower    import FileFollower
+from FitsTable       import FitsError
+from FitsTable       import FitsTable
+from FolderWatcher   import FolderWatcher
+from OutOfCoreSeries import OutOfCoreSeries
+from ParseCache      import ParseCache
@@ -17,10 +17,11 @@
 # 675 Mass Ave
 # Cambridge, MA 02139, USA.
 
-from   gui.framework      import Application
-from   gui                import DEAPFrame
-from   document           import Document
-from   interpreter.python import Interpreter
+from   gui.framework          import Application
+from   gui                    import DEAPFrame
+from   document               import Document
+from   document.ReportBuilder import start_workers
+from   interpreter.python     import Interpreter
 
 class DEAPApp(Application):
 
@@ -28,6 +29,7 @@ class DEAPApp(Application):
         Application.__init__(self, console, "")
 
     def OnInit(self):
+        Application.OnInit(self)
         self.document    = Document()
         self.interpreter = Interpreter(self.document)
 
@@ -38,10 +40,17 @@ class DEAPApp(Application):
 
         return 1
 
+    def OnExit(self):
+        # A clean exit leaves no journal to recover.
+        self.document.CloseJournal()
+        return 0
+
     def Open(self, file):
         self.main.OpenFile(file)
 
 def main(console, file):
+    # Report workers are forked now, before there are windows or threads.
+    start_workers()
     app = DEAPApp(console)
 
     if file is not None:
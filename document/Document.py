@@ -15,7 +15,10 @@
 # 675 Mass Ave
 # Cambridge, MA 02139, USA.
 
+from   Journal  import read_journal
+from   Snapshot import Snapshot
 import copy
+import os
 
 class Document:
     def __init__(self):
@@ -24,6 +27,7 @@ class Document:
         self.redo        = []
         self.plotter     = None
         self.commandLine = None
+        self.journal     = None
 
     def SetPlotter(self, plotter):
         "Sets the PlotView object associated with the document."
@@ -41,6 +45,14 @@ class Document:
         "Returns the command line object associated with the document."
         return self.commandLine
 
+    def SetJournal(self, journal):
+        "Sets the journal recording the commands of the session."
+        self.journal = journal
+
+    def GetJournal(self):
+        "Returns the journal recording the commands of the session."
+        return self.journal
+
     def CanUndo(self):
         "True iff we can reverse a previous command."
         return len(self.undo) > 0
@@ -51,6 +63,8 @@ class Document:
 
         undo = self.undo.pop()
         self.redo.append(undo)
+        if self.journal is not None:
+            self.journal.Undo()
 
         savedUndo = copy.copy(self.undo)
         savedRedo = copy.copy(self.redo)
@@ -71,6 +85,8 @@ class Document:
 
         self.redo = []
         self.undo.append(undo)
+        if self.journal is not None:
+            self.journal.Append(undo)
 
     def CanRedo(self):
         "True iff we can repeat a previous command."
@@ -82,6 +98,8 @@ class Document:
 
         redo = self.redo.pop()
         self.undo.append(redo)
+        if self.journal is not None:
+            self.journal.Redo()
 
         savedUndo = copy.copy(self.undo)
         savedRedo = copy.copy(self.redo)
@@ -116,10 +134,10 @@ class Document:
         if self.GetCommandLine():
             self.GetCommandLine().Hold(state)
 
-    def Export(self, file):
+    def Export(self, file, size=None, dpi=None):
         "Save the plotting canvas to a graphical file format."
         if self.GetPlotter():
-            self.GetPlotter().Export(file)
+            self.GetPlotter().Export(file, size, dpi)
 
     def Clear(self):
         """
@@ -142,3 +160,70 @@ class Document:
         """
         if self.GetPlotter():
             return self.GetPlotter().get_figure()
+
+    def SaveSnapshot(self, path, history):
+        """
+        Saves the figure, its zoom history and the command C{history},
+        oldest command first, as a session snapshot.  Returns the artists
+        that could not be saved.
+        """
+        if self.GetPlotter():
+            return Snapshot(path).Save(self.get_figure(),
+                                       self.GetPlotter().GetAxesLimits(),
+                                       history)
+        return []
+
+    def OpenSnapshot(self, path):
+        """
+        Restores a session snapshot: the figure is rebuilt from the file
+        and the command history is set, without running the commands.  A
+        snapshot missing some of the figure is opened by running its
+        commands instead.
+        """
+        if not self.GetPlotter(): return
+
+        snapshot = Snapshot(path)
+        if snapshot.GetSkipped():
+            history = snapshot.GetHistory()
+            self.get_figure().clear()
+            if self.GetCommandLine():
+                self.GetCommandLine().SetHistory(history)
+        else:
+            history = snapshot.Restore(self.get_figure(),
+                                       self.GetPlotter().GetAxesLimits())
+            if self.GetCommandLine():
+                self.GetCommandLine().SetHistory(history, False)
+        self.undo, self.redo = [], []
+        for command in history:
+            self.AddUndo(command)
+        # The journal is of the session opened, not of the one before.
+        self.CompactJournal()
+        self.draw()
+
+    def CompactJournal(self):
+        """
+        Rewrites the journal as the commands in effect, e.g., once the
+        session is saved.
+        """
+        if self.journal is not None:
+            self.journal.Compact(self.undo, self.redo)
+
+    def RecoverJournal(self, path):
+        """
+        Runs again the commands recorded by the journal at C{path}, left
+        by a session that crashed, and removes it.
+        """
+        undo, redo = read_journal(path)
+        if self.GetCommandLine():
+            self.GetCommandLine().SetHistory(undo)
+        self.undo, self.redo = undo, redo
+        self.CompactJournal()
+        os.remove(path)
+
+    def CloseJournal(self):
+        """
+        Closes and removes the journal, when the session ends cleanly.
+        """
+        if self.journal is not None:
+            self.journal.Close()
+            self.journal = None
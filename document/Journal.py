@@ -0,0 +1,208 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import glob
+import json
+import os
+import tempfile
+import threading
+
+def get_default_directory():
+    "Returns the directory journals are kept in, in the home directory."
+    return os.path.join(os.path.expanduser("~"), ".deap", "journals")
+
+def is_running(pid):
+    "Returns a boolean indicating if process C{pid} may still be running."
+    try:
+        os.kill(pid, 0)
+    except OSError, e:
+        return e.errno == 1 # EPERM: running, but as another user
+    except AttributeError:
+        return False        # no os.kill: assume it is not
+    return True
+
+def read_journal(path):
+    """
+    Returns the commands in effect, oldest first, and those undone that
+    could still be redone, as the journal at C{path} recorded them.  A
+    last record cut short by a crash is ignored.
+    """
+    undo, redo = [], []
+    f = open(path, "r")
+    try:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            if 'do' in record:
+                undo.append(record['do'])
+                redo = []
+            elif 'undo' in record and undo:
+                redo.append(undo.pop())
+            elif 'redo' in record and redo:
+                undo.append(redo.pop())
+    finally:
+        f.close()
+    return undo, redo
+
+def find_orphans(directory=None):
+    """
+    Returns the journals, newest first, left by sessions that did not
+    exit cleanly.
+    """
+    paths = glob.glob(os.path.join(directory or get_default_directory(),
+                                   "session-*.journal"))
+    orphans = []
+    for path in paths:
+        try:
+            pid = int(os.path.basename(path)[8:-8])
+        except ValueError:
+            continue
+        if pid != os.getpid() and not is_running(pid):
+            orphans.append(path)
+    orphans.sort(key = os.path.getmtime, reverse = True)
+    return orphans
+
+class Journal:
+    """
+    An append-only record of the commands of a session, written as each
+    command is accepted, so that a session can be recovered after a
+    crash.  Every record is one line of JSON: a command, an undo or a
+    redo.  Records are written to the file straight away and forced to
+    disk in batches, every C{interval} seconds, by a background thread,
+    so typing a command never waits for the disk.
+
+    Saving compacts the journal to the commands in effect.  A journal is
+    removed when the session is closed; one left behind belongs to a
+    session that crashed.
+    """
+
+    def __init__(self, directory=None, interval=1.0):
+        self.directory = directory or get_default_directory()
+        self.path      = os.path.join(self.directory,
+                                      "session-%d.journal" % os.getpid())
+        self.interval  = interval
+        self.lock      = threading.Lock()
+        self.dirty     = False
+        self.stopped   = threading.Event()
+
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        self.file = open(self.path, "a")
+
+        self.thread = threading.Thread(target = self.Sync)
+        self.thread.setDaemon(True)
+        self.thread.start()
+
+    def GetPath(self):
+        "Returns the path of the journal file."
+        return self.path
+
+    def Write(self, record):
+        "Appends C{record}, a dictionary, as one line."
+        self.lock.acquire()
+        try:
+            if self.file is None: return
+            self.file.write(json.dumps(record) + "\n")
+            self.file.flush()
+            self.dirty = True
+        finally:
+            self.lock.release()
+
+    def Append(self, command):
+        """
+        Records a command accepted by the command line.
+        """
+        self.Write({ 'do' : command })
+
+    def Undo(self):
+        "Records that the last command was undone."
+        self.Write({ 'undo' : True })
+
+    def Redo(self):
+        "Records that the last command undone was redone."
+        self.Write({ 'redo' : True })
+
+    def Flush(self):
+        """
+        Forces the records written so far to disk.
+        """
+        self.lock.acquire()
+        try:
+            if self.file is not None and self.dirty:
+                os.fsync(self.file.fileno())
+                self.dirty = False
+        finally:
+            self.lock.release()
+
+    def Sync(self):
+        "Flushes the journal every interval until it is closed."
+        while not self.stopped.isSet():
+            self.stopped.wait(self.interval)
+            self.Flush()
+
+    def Compact(self, undo, redo=()):
+        """
+        Rewrites the journal as the commands in effect, C{undo}, oldest
+        first, followed by those that can be redone, C{redo}, with the
+        next to be redone last.
+        """
+        records  = [{ 'do' : command } for command in undo]
+        records += [{ 'do' : command } for command in redo[::-1]]
+        records += [{ 'undo' : True }] * len(redo)
+
+        handle, temporary = tempfile.mkstemp(".tmp", "", self.directory)
+        f = os.fdopen(handle, "w")
+        try:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        finally:
+            f.close()
+
+        self.lock.acquire()
+        try:
+            if self.file is None:
+                os.remove(temporary)
+                return
+            self.file.close()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            os.rename(temporary, self.path)
+            self.file  = open(self.path, "a")
+            self.dirty = False
+        finally:
+            self.lock.release()
+
+    def Close(self, remove=True):
+        """
+        Stops the journal, removing the file unless C{remove} is False.
+        """
+        self.stopped.set()
+        self.thread.join()
+        self.Flush()
+        self.lock.acquire()
+        try:
+            if self.file is None: return
+            self.file.close()
+            self.file = None
+            if remove:
+                os.remove(self.path)
+        finally:
+            self.lock.release()
@@ -0,0 +1,178 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+from   collections import deque
+from   matplotlib.backends.backend_agg import FigureCanvasAgg
+from   matplotlib.backends.backend_pdf import PdfPages
+from   matplotlib.figure import Figure
+from   Snapshot import Snapshot, read_snapshot
+import multiprocessing
+import numpy
+import os
+import shutil
+import tempfile
+
+# The worker processes shared by the reports of a session.
+workers = None
+
+def start_workers(processes=None):
+    """
+    Starts the worker processes that reports are rendered by, one per CPU
+    unless C{processes} is given, if they are not running yet.  Returns
+    the pool.  The workers are forked from the process as it is when
+    this is called, so an application should call it before it starts
+    threads or opens windows.
+    """
+    global workers
+    if workers is None:
+        workers = multiprocessing.Pool(processes)
+    return workers
+
+def render_script(script, directory, dpi, namespace=None):
+    """
+    Runs the command C{script} in a worker process, with the pylab
+    functions drawing off screen, and draws the figure it leaves at
+    C{dpi} dots per inch.  The pixels, as RGBA bytes, are saved with
+    numpy in C{directory}.  Returns the path of the saved array.
+
+    C{namespace}, if given, is called in the worker and returns the
+    names the script is run with besides the pylab functions, as the
+    command line defines them.
+    """
+    import pylab
+    pylab.switch_backend('Agg')
+    pylab.close('all')
+
+    names = {}
+    if namespace is not None:
+        names.update(namespace())
+    names['__name__'] = '__report__'
+    exec "from pylab import *; import matplotlib" in names
+    execfile(script, names)
+
+    figure = pylab.gcf()
+    figure.set_dpi(dpi)
+    figure.canvas.draw()
+    width, height = figure.canvas.get_width_height()
+    pixels = numpy.frombuffer(figure.canvas.buffer_rgba(), numpy.uint8)
+
+    handle, path = tempfile.mkstemp(".npy", "page", directory)
+    os.close(handle)
+    numpy.save(path, pixels.reshape((height, width, 4)))
+    pylab.close('all')
+    return path
+
+class ReportBuilder:
+    """
+    Renders a sequence of pages into one multi-page PDF file.  Each page
+    is a command script, run with the pylab functions, or a figure saved
+    as a session snapshot (C{.deap}).
+
+    Scripts are run by the workers of C{start_workers}, if started, or
+    else in C{processes} worker processes, each drawing its
+    figure there, at C{dpi} dots per inch, while the pages before are
+    written; at most C{ahead} pages are in progress at any time.  A
+    figure is drawn where its script ran, as only there does it have
+    every artist the script made, and is written to the report as an
+    image.  Snapshots are restored and written as they are.  Pages are
+    written to the file one at a time, in order, and dropped once
+    written, so memory does not grow with the length of the report.
+    C{render}, called in the workers with a script, a directory, the dpi
+    and C{namespace}, returns the path of the pixels of its page, saved
+    with numpy.
+    """
+
+    def __init__(self, path, processes=None, ahead=None, render=render_script,
+                 dpi=150, namespace=None):
+        self.path      = path
+        self.processes = processes or multiprocessing.cpu_count()
+        self.ahead     = ahead or 2 * self.processes
+        self.render    = render
+        self.dpi       = dpi
+        self.namespace = namespace
+
+    def WritePage(self, pdf, page):
+        """
+        Draws C{page}, a snapshot or the pixels of a rendered script, as
+        the next page.
+        """
+        if page.endswith(".deap"):
+            header, arrays = read_snapshot(page)
+            figure = Figure(figsize = header['figure'].get('size'))
+            FigureCanvasAgg(figure)
+            Snapshot(page).Restore(figure)
+        else:
+            pixels = numpy.load(page)
+            height, width = pixels.shape[:2]
+            figure = Figure(figsize = (float(width) / self.dpi,
+                                       float(height) / self.dpi))
+            FigureCanvasAgg(figure)
+            axes = figure.add_axes([0, 0, 1, 1])
+            axes.set_axis_off()
+            axes.imshow(pixels, aspect = 'auto', interpolation = 'none')
+        pdf.savefig(figure)
+
+    def Build(self, pages, progress=None):
+        """
+        Writes C{pages}, a sequence of paths to command scripts or
+        snapshots.  C{progress}, if given, is called with the number of
+        pages written after each one.  Returns the number of pages.
+        """
+        directory = tempfile.mkdtemp(prefix = "report")
+        pool      = workers or multiprocessing.Pool(self.processes)
+        pdf       = PdfPages(self.path)
+        written   = 0
+        pending   = deque()
+        try:
+            pages = iter(pages)
+            while True:
+                # Keep the workers busy on the pages that follow.
+                for page in pages:
+                    result = None
+                    if not page.endswith(".deap"):
+                        result = pool.apply_async(self.render,
+                                                  (page, directory, self.dpi,
+                                                   self.namespace))
+                    pending.append((page, result))
+                    if len(pending) >= self.ahead:
+                        break
+                if not pending:
+                    break
+
+                page, result = pending.popleft()
+                if result is None:
+                    self.WritePage(pdf, page)
+                else:
+                    rendered = result.get()
+                    self.WritePage(pdf, rendered)
+                    os.remove(rendered)
+                written += 1
+                if progress is not None:
+                    progress(written)
+        finally:
+            if pool is workers:
+                # The shared workers are left running, once done with
+                # the pages given to them.
+                for page, result in pending:
+                    if result is not None:
+                        result.wait()
+            else:
+                pool.terminate()
+                pool.join()
+            pdf.close()
+            shutil.rmtree(directory, ignore_errors = True)
+        return written
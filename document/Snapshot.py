@@ -0,0 +1,637 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import json
+import os
+import struct
+import tempfile
+from   matplotlib             import cm
+from   matplotlib.collections import Collection
+from   matplotlib.collections import PathCollection
+from   matplotlib.patches     import Patch
+from   matplotlib.patches     import PathPatch
+from   matplotlib.path        import Path
+from   matplotlib.text        import Annotation
+from   matplotlib.ticker      import FixedFormatter
+from   matplotlib.ticker      import FixedLocator
+from   matplotlib.ticker      import FormatStrFormatter
+from   matplotlib.ticker      import FuncFormatter
+from   matplotlib.transforms  import IdentityTransform
+import numpy
+
+MAGIC   = "DEAPSES1"
+VERSION = 2
+ALIGN   = 64
+
+# Properties of lines, images, patches, collections and texts kept in a
+# snapshot, each read with get_<name> and restored as a keyword of plot,
+# imshow, PathPatch or text, or with set_<name>.
+LINE_PROPERTIES  = ('color', 'linestyle', 'linewidth', 'marker',
+                    'markersize', 'markerfacecolor', 'markeredgecolor',
+                    'label', 'alpha', 'visible', 'zorder')
+IMAGE_PROPERTIES = ('extent', 'interpolation', 'alpha', 'zorder')
+PATCH_PROPERTIES = ('facecolor', 'edgecolor', 'linewidth', 'linestyle',
+                    'fill', 'hatch', 'label', 'alpha', 'visible', 'zorder')
+COLLECTION_PROPERTIES = ('label', 'alpha', 'visible', 'zorder')
+TEXT_PROPERTIES  = ('color', 'fontsize', 'horizontalalignment',
+                    'verticalalignment', 'rotation', 'weight', 'style',
+                    'family', 'alpha', 'visible', 'zorder')
+
+def jsonable(value):
+    "Returns C{value} with tuples and numpy values as JSON can store them."
+    if isinstance(value, (tuple, list, numpy.ndarray)):
+        return [jsonable(item) for item in value]
+    if isinstance(value, numpy.generic):
+        return value.item()
+    return value
+
+def get_keywords(properties):
+    "Returns the saved C{properties} that are set, as keyword arguments."
+    return dict([(str(name), value) for name, value in properties.items()
+                 if value is not None])
+
+def get_properties(artist, names):
+    "Returns the properties C{names} of C{artist}, as JSON can store them."
+    properties = {}
+    for name in names:
+        properties[name] = jsonable(getattr(artist, 'get_' + name)())
+    return properties
+
+def get_offset_transform(collection):
+    "Returns the transform of the offsets of C{collection}."
+    if hasattr(collection, 'get_offset_transform'):
+        return collection.get_offset_transform()
+    return collection._transOffset
+
+def get_antialiased(collection):
+    "Returns the antialiasing of C{collection}; meshes keep their own."
+    antialiased = getattr(collection, '_antialiased', None)
+    if antialiased is None:
+        antialiased = getattr(collection, '_antialiaseds', True)
+    return antialiased
+
+def get_textcoords(annotation):
+    "Returns the coordinates the text of C{annotation} is placed in."
+    return getattr(annotation, 'anncoords',
+                   getattr(annotation, 'textcoords', None))
+
+def split_paths(vertices, codes, lengths):
+    "Returns the paths stored by C{Snapshot.StorePaths}."
+    paths, start = [], 0
+    for length in lengths:
+        paths.append(Path(numpy.asarray(vertices[start:start + length]),
+                          numpy.asarray(codes[start:start + length])))
+        start += length
+    return paths
+
+def write_snapshot(path, header, arrays):
+    """
+    Writes C{header}, a dictionary, and C{arrays} to C{path}.  Each array
+    starts on a multiple of 64 bytes and is stored raw, so it can be
+    memory mapped.  The file is written under another name and renamed,
+    so a snapshot being read, or mapped, is never overwritten in place.
+    """
+    layout, offset = [], 0
+    for array in arrays:
+        layout.append({ 'offset' : offset
+                      , 'dtype'  : array.dtype.str
+                      , 'shape'  : list(array.shape)
+                      })
+        offset += -(-array.nbytes // ALIGN) * ALIGN
+
+    header = dict(header, version = VERSION, arrays = layout, start = 0)
+    text   = json.dumps(header)
+    header['start'] = -(-(len(MAGIC) + 8 + len(text) + 32) // ALIGN) * ALIGN
+    text   = json.dumps(header)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temporary = tempfile.mkstemp(".tmp", "", directory)
+    f = os.fdopen(handle, "wb")
+    try:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(text)))
+        f.write(text)
+        for array, entry in zip(arrays, layout):
+            f.seek(header['start'] + entry['offset'])
+            numpy.ascontiguousarray(array).tofile(f)
+        f.seek(header['start'] + offset)
+        f.truncate()
+        f.close()
+        if os.path.exists(path):
+            os.remove(path)
+        os.rename(temporary, path)
+    except:
+        f.close()
+        os.remove(temporary)
+        raise
+
+def read_snapshot(path):
+    """
+    Returns the header of the snapshot at C{path} and its arrays, memory
+    mapped, so that nothing but the header is read until used.
+    """
+    f = open(path, "rb")
+    try:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError("%s is not a DEAP session." % path)
+        length, = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(length))
+    finally:
+        f.close()
+
+    arrays = []
+    for entry in header['arrays']:
+        shape = tuple(entry['shape'])
+        if numpy.prod(shape) == 0:
+            arrays.append(numpy.zeros(shape, entry['dtype']))
+            continue
+        arrays.append(numpy.memmap(path, entry['dtype'], 'r',
+                                   header['start'] + entry['offset'], shape))
+    return header, arrays
+
+class Snapshot:
+    """
+    A saved session: the structure of the figure, the properties of its
+    lines, images, patches, collections, texts and legends, the zoom
+    history of every subplot, the data arrays and the command history,
+    in one file.  Opening a snapshot rebuilds the figure from the file,
+    with the arrays mapped rather than read, instead of running every
+    command again.
+
+    Only what is drawn is kept: artists that compute their data, such as
+    density images, are saved as the data shown at the time.  Artists
+    that cannot be saved, e.g. text placed in coordinates of its own or
+    ticks formatted by a function, are listed in the snapshot; such a
+    session is opened by running its commands again.
+    """
+
+    def __init__(self, path):
+        self.path    = path
+        self.arrays  = []
+        self.skipped = []
+
+    def Store(self, array):
+        "Adds C{array} to those to be saved and returns its number."
+        array = numpy.ma.asarray(array)
+        if numpy.ma.is_masked(array) and array.dtype.kind == 'f':
+            array = array.filled(numpy.nan)
+        self.arrays.append(numpy.ma.getdata(array))
+        return len(self.arrays) - 1
+
+    def StorePaths(self, paths):
+        """
+        Stores the vertices and codes of C{paths} as three arrays and
+        returns their numbers.
+        """
+        vertices, codes, lengths = [numpy.zeros((0, 2))], [], []
+        for path in paths:
+            vertices.append(path.vertices)
+            if path.codes is not None:
+                codes.append(numpy.asarray(path.codes, numpy.uint8))
+            else:
+                line = numpy.empty(len(path.vertices), numpy.uint8)
+                line.fill(Path.LINETO)
+                line[:1] = Path.MOVETO
+                codes.append(line)
+            lengths.append(len(path.vertices))
+        codes.append(numpy.zeros(0, numpy.uint8))
+        return [self.Store(numpy.concatenate(vertices)),
+                self.Store(numpy.concatenate(codes)),
+                self.Store(numpy.array(lengths, numpy.int64))]
+
+    def Skip(self, axes, artist):
+        "Notes that C{artist} of C{axes} cannot be saved."
+        number = axes is not None and axes.figure.get_axes().index(axes)
+        self.skipped.append("%s in axes %s" % (type(artist).__name__, number))
+
+    def DescribeText(self, axes, text):
+        """
+        Returns a dictionary describing C{text}, or C{None} if it is
+        placed in coordinates that cannot be saved.
+        """
+        description = { 'text'       : text.get_text()
+                      , 'position'   : jsonable(text.get_position())
+                      , 'properties' : get_properties(text, TEXT_PROPERTIES)
+                      }
+        if isinstance(text, Annotation):
+            coords = (text.xycoords, get_textcoords(text))
+            try:
+                json.dumps([coords, text.arrowprops])
+            except TypeError:
+                return None
+            if not isinstance(coords[0], basestring) or \
+               not isinstance(coords[1], basestring):
+                return None
+            description['xy']         = jsonable(text.xy)
+            description['xycoords']   = coords[0]
+            description['textcoords'] = coords[1]
+            description['arrowprops'] = text.arrowprops
+            return description
+
+        transforms = [('figure', text.figure.transFigure)]
+        if axes is not None:
+            transforms += [('data', axes.transData), ('axes', axes.transAxes)]
+        for coords, transform in transforms:
+            if text.get_transform() is transform:
+                description['coords'] = coords
+                return description
+        return None
+
+    def DescribePatch(self, axes, patch):
+        """
+        Returns a dictionary describing C{patch} as a path in data
+        coordinates, or C{None} if it is not drawn in data coordinates.
+        """
+        if patch.get_data_transform() is not axes.transData:
+            return None
+        path = patch.get_path().transformed(patch.get_patch_transform())
+        return { 'path' : self.StorePaths([path])
+               , 'properties' : get_properties(patch, PATCH_PROPERTIES)
+               }
+
+    def DescribeCollection(self, axes, collection):
+        """
+        Returns a dictionary describing C{collection}, e.g. a scatter plot,
+        filled area, mesh or contour, as its paths, offsets and colors, or
+        C{None} if it is drawn in coordinates that cannot be saved.
+        """
+        transform = collection.get_transform()
+        if transform is axes.transData:
+            coords, offsets = 'data', None
+        elif get_offset_transform(collection) is axes.transData:
+            # Markers, e.g. of scatter plots, sized in points.
+            coords  = 'points'
+            offsets = self.Store(collection.get_offsets())
+        else:
+            return None
+
+        description = \
+            { 'coords'     : coords
+            , 'paths'      : self.StorePaths(collection.get_paths())
+            , 'offsets'    : offsets
+            , 'sizes'      : None
+            , 'facecolors' : self.Store(collection.get_facecolor())
+            , 'edgecolors' : self.Store(collection.get_edgecolor())
+            , 'linewidths' : jsonable(collection.get_linewidth())
+            , 'antialiased': jsonable(get_antialiased(collection))
+            , 'array'      : None
+            , 'properties' : get_properties(collection,
+                                            COLLECTION_PROPERTIES)
+            }
+        if coords == 'points' and hasattr(collection, 'get_sizes'):
+            description['sizes'] = self.Store(collection.get_sizes())
+        if collection.get_array() is not None:
+            description['array'] = self.Store(collection.get_array())
+            description['cmap']  = collection.get_cmap().name
+            description['clim']  = jsonable(collection.get_clim())
+        return description
+
+    def DescribeTicks(self, axes, axis):
+        """
+        Returns a dictionary of the ticks of C{axis} set by the user, i.e.
+        fixed locations, labels or format.
+        """
+        ticks     = {}
+        locator   = axis.get_major_locator()
+        formatter = axis.get_major_formatter()
+        if isinstance(locator, FixedLocator):
+            ticks['locations'] = jsonable(locator.locs)
+        if isinstance(formatter, FixedFormatter):
+            ticks['labels'] = list(formatter.seq)
+        elif isinstance(formatter, FormatStrFormatter):
+            ticks['format'] = formatter.fmt
+        elif isinstance(formatter, FuncFormatter):
+            self.Skip(axes, formatter)
+        return ticks
+
+    def DescribeAxis(self, axis):
+        """
+        Returns a dictionary of the visibility of C{axis} and the sides its
+        ticks and label are on, as set, e.g., by C{twinx}.
+        """
+        return { 'visible' : axis.get_visible()
+               , 'ticks'   : axis.get_ticks_position()
+               , 'label'   : axis.get_label_position()
+               }
+
+    def DescribeLegend(self, axes):
+        """
+        Returns a dictionary describing the legend of C{axes}, or C{None}.
+        The entries are kept as the kind and number of the artist they
+        stand for, when they are those matplotlib would choose.
+        """
+        legend = axes.get_legend()
+        if legend is None:
+            return None
+
+        title   = legend.get_title()
+        box     = getattr(legend, '_legend_title_box', title)
+        labels  = [text.get_text() for text in legend.get_texts()]
+        handles = None
+        found, names = axes.get_legend_handles_labels()
+        if names == labels:
+            handles = []
+            for handle in found:
+                # Bars stand for their container.
+                handle = getattr(handle, 'patches', [handle])[0]
+                for kind in ('lines', 'patches', 'collections'):
+                    if handle in getattr(axes, kind):
+                        handles.append((kind, getattr(axes, kind).index(handle)))
+                        break
+                else:
+                    handles = None
+                    break
+
+        return { 'labels'  : labels
+               , 'handles' : handles
+               , 'loc'     : legend._loc
+               , 'ncol'    : getattr(legend, '_ncol', 1)
+               , 'title'   : box.get_visible() and title.get_text() or ""
+               }
+
+    def DescribeAxes(self, axes, limits):
+        "Returns a dictionary describing C{axes}, storing its arrays."
+        position = axes.get_position()
+        description = \
+            { 'geometry' : hasattr(axes, 'get_geometry') and
+                           list(axes.get_geometry()) or None
+            , 'position' : jsonable(getattr(position, 'bounds', position))
+            , 'xlim'     : jsonable(axes.get_xlim())
+            , 'ylim'     : jsonable(axes.get_ylim())
+            , 'xscale'   : axes.get_xscale()
+            , 'yscale'   : axes.get_yscale()
+            , 'aspect'   : jsonable(axes.get_aspect())
+            , 'title'    : axes.title.get_text()
+            , 'xlabel'   : axes.get_xlabel()
+            , 'ylabel'   : axes.get_ylabel()
+            , 'hold'     : axes.ishold()
+            , 'grid'     : [getattr(axes.xaxis, '_gridOnMajor', False),
+                            getattr(axes.yaxis, '_gridOnMajor', False)]
+            , 'patch'    : axes.patch.get_visible()
+            , 'xaxis'    : self.DescribeAxis(axes.xaxis)
+            , 'yaxis'    : self.DescribeAxis(axes.yaxis)
+            , 'xticks'   : self.DescribeTicks(axes, axes.xaxis)
+            , 'yticks'   : self.DescribeTicks(axes, axes.yaxis)
+            , 'lines'    : []
+            , 'images'   : []
+            , 'patches'  : []
+            , 'collections' : []
+            , 'texts'    : []
+            , 'legend'   : self.DescribeLegend(axes)
+            , 'zoom'     : []
+            , 'redo'     : []
+            }
+
+        for line in axes.lines:
+            description['lines'].append(
+                { 'x' : self.Store(line.get_xdata())
+                , 'y' : self.Store(line.get_ydata())
+                , 'properties' : get_properties(line, LINE_PROPERTIES)
+                })
+
+        for image in axes.images:
+            if image.get_array() is None: continue
+            properties = get_properties(image, IMAGE_PROPERTIES)
+            properties.update({ 'origin' : image.origin
+                              , 'cmap'   : image.get_cmap().name
+                              , 'clim'   : jsonable(image.get_clim())
+                              })
+            description['images'].append(
+                { 'data' : self.Store(image.get_array())
+                , 'properties' : properties
+                })
+
+        for kind, artists, describe in \
+            (('patches', axes.patches, self.DescribePatch),
+             ('collections', axes.collections, self.DescribeCollection),
+             ('texts', axes.texts, self.DescribeText)):
+            for artist in artists:
+                saved = describe(axes, artist)
+                if saved is None:
+                    self.Skip(axes, artist)
+                else:
+                    description[kind].append(saved)
+        for artist in getattr(axes, 'artists', []) + \
+                      getattr(axes, 'tables', []):
+            self.Skip(axes, artist)
+
+        if limits is not None:
+            description['zoom'] = jsonable(limits._get_history(axes))
+        if hasattr(limits, '_get_redo_history'):
+            description['redo'] = jsonable(limits._get_redo_history(axes))
+        return description
+
+    def Save(self, figure, limits=None, history=()):
+        """
+        Saves C{figure}, the zoom history kept by C{limits}, if given, and
+        the command C{history}, oldest command first.  Returns the
+        artists that could not be saved, as a list of descriptions.
+        """
+        self.arrays, self.skipped = [], []
+        axes = figure.get_axes()
+        current = axes and figure.gca() in axes and axes.index(figure.gca())
+        texts = []
+        for text in figure.texts:
+            saved = self.DescribeText(None, text)
+            if saved is None:
+                self.Skip(None, text)
+            else:
+                texts.append(saved)
+
+        header = { 'figure' : { 'size'      : jsonable(figure.get_size_inches())
+                              , 'facecolor' : jsonable(figure.get_facecolor())
+                              , 'axes'      : [self.DescribeAxes(a, limits)
+                                               for a in axes]
+                              , 'texts'     : texts
+                              , 'current'   : current or 0
+                              }
+                 , 'history' : list(history)
+                 , 'skipped' : self.skipped
+                 }
+        write_snapshot(self.path, header, self.arrays)
+        self.arrays = []
+        return header['skipped']
+
+    def GetHistory(self):
+        """
+        Returns the command history saved, oldest command first, reading
+        only the header.
+        """
+        header, arrays = read_snapshot(self.path)
+        return header['history']
+
+    def GetSkipped(self):
+        """
+        Returns the artists that could not be saved, reading only the
+        header.  If there are any, the figure is only complete when
+        rebuilt by running the commands again.
+        """
+        header, arrays = read_snapshot(self.path)
+        return header.get('skipped', [])
+
+    def RestoreText(self, figure, axes, text):
+        "Adds the saved C{text} to C{axes}, or to C{figure}."
+        properties = get_keywords(text['properties'])
+        if 'xy' in text:
+            properties.update(xytext     = text['position'],
+                              xycoords   = text['xycoords'],
+                              textcoords = text['textcoords'],
+                              arrowprops = text['arrowprops'])
+            return axes.annotate(text['text'], text['xy'], **properties)
+
+        x, y = text['position']
+        if axes is None:
+            return figure.text(x, y, text['text'], **properties)
+        transform = { 'data' : axes.transData
+                    , 'axes' : axes.transAxes
+                    , 'figure' : figure.transFigure
+                    }[text['coords']]
+        return axes.text(x, y, text['text'], transform = transform,
+                         **properties)
+
+    def RestoreCollection(self, axes, saved, arrays):
+        "Adds the saved collection C{saved} to C{axes}."
+        paths = split_paths(*[arrays[n] for n in saved['paths']])
+        if saved['coords'] == 'points':
+            collection = PathCollection(paths,
+                                        offsets = arrays[saved['offsets']],
+                                        transOffset = axes.transData)
+            collection.set_transform(IdentityTransform())
+            if saved['sizes'] is not None:
+                collection.set_sizes(arrays[saved['sizes']])
+        else:
+            collection = PathCollection(paths)
+            collection.set_transform(axes.transData)
+
+        for name in ('facecolors', 'edgecolors'):
+            colors = arrays[saved[name]]
+            if len(colors) == 0:
+                colors = 'none'
+            getattr(collection, 'set_' + name[:-1])(colors)
+        collection.set_linewidth(saved['linewidths'])
+        collection.set_antialiased(saved.get('antialiased', True))
+        if saved['array'] is not None:
+            collection.set_array(numpy.asarray(arrays[saved['array']]))
+            collection.set_cmap(cm.get_cmap(saved['cmap']))
+            collection.set_clim(*saved['clim'])
+        for name, value in get_keywords(saved['properties']).items():
+            getattr(collection, 'set_' + name)(value)
+        axes.add_collection(collection, autolim = False)
+
+    def RestoreTicks(self, axes, axis, ticks):
+        "Sets the saved C{ticks} on C{axis}."
+        if 'locations' in ticks:
+            axis.set_ticks(ticks['locations'])
+        if 'labels' in ticks:
+            axis.set_major_formatter(FixedFormatter(ticks['labels']))
+        elif 'format' in ticks:
+            axis.set_major_formatter(FormatStrFormatter(ticks['format']))
+
+    def RestoreAxis(self, axis, saved):
+        "Sets the saved visibility and sides of C{axis}."
+        axis.set_visible(saved['visible'])
+        if saved['ticks'] != 'unknown':
+            axis.set_ticks_position(saved['ticks'])
+        axis.set_label_position(saved['label'])
+
+    def RestoreLegend(self, axes, legend):
+        "Adds the saved C{legend} to C{axes}."
+        if legend['handles'] is not None:
+            handles = [getattr(axes, kind)[n] for kind, n in legend['handles']]
+            restored = axes.legend(handles, legend['labels'],
+                                   loc = legend['loc'], ncol = legend['ncol'])
+        else:
+            restored = axes.legend(legend['labels'], loc = legend['loc'],
+                                   ncol = legend['ncol'])
+        if legend['title']:
+            restored.set_title(legend['title'])
+
+    def Restore(self, figure, limits=None):
+        """
+        Replaces the contents of C{figure} with the saved figure, and the
+        zoom history of its subplots in C{limits}, if given.  Returns the
+        command history, oldest command first.
+        """
+        header, arrays = read_snapshot(self.path)
+        figure.clear()
+        figure.set_facecolor(header['figure']['facecolor'])
+
+        restored = []
+        for description in header['figure']['axes']:
+            # A unique label keeps axes sharing a cell or a rectangle, such
+            # as twinned axes, from being merged into one.
+            label = "snapshot%d" % len(restored)
+            if description['geometry']:
+                axes = figure.add_subplot(*description['geometry'],
+                                          label = label)
+            else:
+                axes = figure.add_axes(description['position'], label = label)
+            axes.set_position(description['position'])
+            axes.hold(True)
+
+            for line in description['lines']:
+                properties = get_keywords(line['properties'])
+                axes.plot(arrays[line['x']], arrays[line['y']], **properties)
+            for image in description['images']:
+                properties = get_keywords(image['properties'])
+                vmin, vmax = properties.pop('clim')
+                properties['cmap'] = cm.get_cmap(properties['cmap'])
+                axes.imshow(arrays[image['data']], vmin = vmin, vmax = vmax,
+                            **properties)
+            for patch in description.get('patches', []):
+                path, = split_paths(*[arrays[n] for n in patch['path']])
+                axes.add_patch(PathPatch(path,
+                                         **get_keywords(patch['properties'])))
+            for collection in description.get('collections', []):
+                self.RestoreCollection(axes, collection, arrays)
+            for text in description.get('texts', []):
+                self.RestoreText(figure, axes, text)
+
+            axes.set_aspect(description['aspect'])
+            axes.set_xscale(description['xscale'])
+            axes.set_yscale(description['yscale'])
+            self.RestoreTicks(axes, axes.xaxis, description.get('xticks', {}))
+            self.RestoreTicks(axes, axes.yaxis, description.get('yticks', {}))
+            axes.set_xlim(description['xlim'])
+            axes.set_ylim(description['ylim'])
+            axes.set_title(description['title'])
+            axes.set_xlabel(description['xlabel'])
+            axes.set_ylabel(description['ylabel'])
+            xgrid, ygrid = description.get('grid', (False, False))
+            axes.xaxis.grid(xgrid)
+            axes.yaxis.grid(ygrid)
+            axes.patch.set_visible(description.get('patch', True))
+            for axis, name in ((axes.xaxis, 'xaxis'), (axes.yaxis, 'yaxis')):
+                if name in description:
+                    self.RestoreAxis(axis, description[name])
+            if description.get('legend'):
+                self.RestoreLegend(axes, description['legend'])
+            axes.hold(description['hold'])
+
+            if limits is not None:
+                limits._get_history(axes)[:] = \
+                    [tuple(map(tuple, entry)) for entry in description['zoom']]
+            if hasattr(limits, '_get_redo_history'):
+                limits._get_redo_history(axes)[:] = \
+                    [tuple(map(tuple, entry)) for entry in description['redo']]
+            restored.append(axes)
+
+        for text in header['figure'].get('texts', []):
+            self.RestoreText(figure, None, text)
+        if restored:
+            figure.sca(restored[header['figure']['current']])
+        return header['history']
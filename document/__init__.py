@@ -15,4 +15,7 @@
 # 675 Mass Ave
 # Cambridge, MA 02139, USA.
 
-from Document import Document
+from Document      import Document
+from Journal       import Journal
+from ReportBuilder import ReportBuilder
+from Snapshot      import Snapshot
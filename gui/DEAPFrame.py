@@ -15,10 +15,13 @@
 # 675 Mass Ave
 # Cambridge, MA 02139, USA.
 
-from AboutDialog import AboutDialog
-from DEAPPanel   import DEAPPanel
-from DEAPPyShell import DEAPPyShell
-from framework   import *
+from   AboutDialog      import AboutDialog
+from   DEAPPanel        import DEAPPanel
+from   DEAPPyShell      import DEAPPyShell
+from   document.Journal import find_orphans, read_journal
+from   document         import Journal
+from   framework        import *
+import os
 import wx
 
 class DEAPFrame(Frame):
@@ -31,6 +34,7 @@ class DEAPFrame(Frame):
         self.InitSplitter()
         self.ActivatePanel(self.plotPanel)
         self.SetStatusText("Welcome to DEAP!")
+        self.InitJournal()
 
     def InitSplitter(self):
         self.splitter    = wx.SplitterWindow(self, -1)
@@ -48,6 +52,38 @@ class DEAPFrame(Frame):
     def InitCommandLine(self, parent):
         return DEAPPyShell(parent, self.GetInterpreter())
 
+    def InitJournal(self):
+        """
+        Starts recording the session in a journal, and offers to recover
+        any session that did not exit cleanly.
+        """
+        orphans = find_orphans()
+        try:
+            self.GetDocument().SetJournal(Journal())
+        except (IOError, OSError):
+            return # the session is not recoverable, but still usable
+        if orphans:
+            wx.CallAfter(self.OfferRecovery, orphans)
+
+    def OfferRecovery(self, orphans):
+        """
+        Asks whether to recover each of the sessions journaled in
+        C{orphans} in turn, until one is recovered.  Those declined are
+        removed.
+        """
+        for path in orphans:
+            undo, redo = read_journal(path)
+            if undo:
+                answer = wx.MessageBox("DEAP did not exit cleanly.  "
+                                       "Recover the %d commands of that "
+                                       "session?" % len(undo),
+                                       "Recover Session",
+                                       wx.YES_NO | wx.ICON_QUESTION, self)
+                if answer == wx.YES:
+                    self.GetDocument().RecoverJournal(path)
+                    return
+            os.remove(path)
+
     def InitHelpMenu(self):
         helpMnu = Frame.InitHelpMenu(self)
 
@@ -67,6 +103,9 @@ class DEAPFrame(Frame):
     def GetInterpreter(self):
         return self.interpreter
 
+    def GetDocument(self):
+        return self.GetInterpreter().GetDocument()
+
     def SetHistory(self, history):
         self.commandLine.SetHistory(history)
 
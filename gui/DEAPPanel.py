@@ -49,14 +49,16 @@ import wx
     ID_TOOLS_INFO
   , ID_TOOLS_ZOOM
   , ID_TOOLS_PAN
+  , ID_TOOLS_STATS
   , ID_TOOLS_GRID
-] = [wx.NewId() for i in range(4)]
+] = [wx.NewId() for i in range(5)]
 
 [
     ID_VIEW_ZOOM
   , ID_VIEW_UNZOOM
   , ID_VIEW_ALL_PANELS
-] = [wx.NewId() for i in range(3)]
+  , ID_VIEW_FIT_Y
+] = [wx.NewId() for i in range(4)]
 
 [
     ID_HELP_MANUAL
@@ -125,24 +127,28 @@ class DEAPPanel(Panel):
         viewMnu.Insert(1, ID_VIEW_UNZOOM, "&Unzoom")
         viewMnu.InsertSeparator(2)
         viewMnu.InsertCheckItem(3, ID_VIEW_ALL_PANELS, "Display All Subplots")
-        viewMnu.InsertSeparator(4)
+        viewMnu.InsertCheckItem(4, ID_VIEW_FIT_Y, "&Fit Y to Visible Data")
+        viewMnu.InsertSeparator(5)
 
         wx.EVT_MENU(self.GetFrame(), ID_VIEW_ZOOM,       self.OnZoom)
         wx.EVT_MENU(self.GetFrame(), ID_VIEW_UNZOOM,     self.OnUnzoom)
         wx.EVT_MENU(self.GetFrame(), ID_VIEW_ALL_PANELS, self.OnViewAllPanels)
+        wx.EVT_MENU(self.GetFrame(), ID_VIEW_FIT_Y,      self.OnViewFitY)
 
     def ActivateToolsMenu(self):
         toolsMnu = self.GetMenu(self.GetMenuBar().GetMenuCount()+ID_TOOLS_MENU)
         toolsMnu.InsertCheckItem(0, ID_TOOLS_INFO, '&Info')
         toolsMnu.InsertCheckItem(1, ID_TOOLS_ZOOM, '&Zoom')
-        toolsMnu.InsertCheckItem(2, ID_TOOLS_PAN,  '&Pan')
-        toolsMnu.InsertCheckItem(3, ID_TOOLS_GRID, '&Grid')
-        toolsMnu.InsertSeparator(4)
+        toolsMnu.InsertCheckItem(2, ID_TOOLS_PAN,   '&Pan')
+        toolsMnu.InsertCheckItem(3, ID_TOOLS_STATS, '&Statistics')
+        toolsMnu.InsertCheckItem(4, ID_TOOLS_GRID,  '&Grid')
+        toolsMnu.InsertSeparator(5)
 
         wx.EVT_MENU(self.GetFrame(), ID_TOOLS_INFO, self.OnToolsInfo)
         wx.EVT_MENU(self.GetFrame(), ID_TOOLS_ZOOM, self.OnToolsZoom)
-        wx.EVT_MENU(self.GetFrame(), ID_TOOLS_PAN,  self.OnToolsPan)
-        wx.EVT_MENU(self.GetFrame(), ID_TOOLS_GRID, self.OnToolsGrid)
+        wx.EVT_MENU(self.GetFrame(), ID_TOOLS_PAN,   self.OnToolsPan)
+        wx.EVT_MENU(self.GetFrame(), ID_TOOLS_STATS, self.OnToolsStats)
+        wx.EVT_MENU(self.GetFrame(), ID_TOOLS_GRID,  self.OnToolsGrid)
 
         wx.EVT_MENU(self.GetFrame(), ID_TOOLS_PLOTEDIT, self.OnToolsEdit)
         wx.EVT_MENU(self.GetFrame(), ID_TOOLS_OPTIONS, self.OnOptions)
@@ -279,12 +285,14 @@ class DEAPPanel(Panel):
         self.GetMenuBar().Enable(ID_VIEW_ZOOM,   1)
         self.GetMenuBar().Enable(ID_VIEW_UNZOOM, self.GetPlotView().zoomed())
         self.GetMenuBar().Check(ID_VIEW_ALL_PANELS, not self.GetPlotView().AreSubplotsHidden())
+        self.GetMenuBar().Check(ID_VIEW_FIT_Y, self.GetPlotView().IsFitY())
 
     def UpdateToolsMenu(self):
         self.GetMenuBar().Check(ID_TOOLS_INFO, self.GetPlotView().IsInfoMode())
         self.GetMenuBar().Check(ID_TOOLS_ZOOM, self.GetPlotView().IsZoomMode())
-        self.GetMenuBar().Check(ID_TOOLS_PAN,  self.GetPlotView().IsPanMode())
-        self.GetMenuBar().Check(ID_TOOLS_GRID, self.GetPlotView().IsGridMode())
+        self.GetMenuBar().Check(ID_TOOLS_PAN,   self.GetPlotView().IsPanMode())
+        self.GetMenuBar().Check(ID_TOOLS_STATS, self.GetPlotView().IsStatsMode())
+        self.GetMenuBar().Check(ID_TOOLS_GRID,  self.GetPlotView().IsGridMode())
 
         self.GetMenuBar().Enable(ID_TOOLS_OPTIONS, 1)
 
@@ -331,7 +339,8 @@ class DEAPPanel(Panel):
         dialog = wx.FileDialog(self,
                               message = "Open Command Line History",
                               defaultFile = default,
-                              wildcard = "Python Files (*.py)|*.py|All Files|*",
+                              wildcard = "Python Files (*.py)|*.py|"
+                                         "DEAP Sessions (*.deap)|*.deap|All Files|*",
                               style=wx.OPEN)
         if wx.ID_OK <> dialog.ShowModal():
             return
@@ -339,6 +348,10 @@ class DEAPPanel(Panel):
         self.OpenFile(dialog.GetPath())
 
     def OpenFile(self, file):
+        if file.endswith(".deap"):
+            self.GetDocument().OpenSnapshot(file)
+            self.historyFile = file
+            return
         try:
             self.GetCommandLine().run("execfile('%s')" % file)
         except:
@@ -366,7 +379,8 @@ class DEAPPanel(Panel):
         dialog = wx.FileDialog(self,
                               message = "Save Command Line History",
                               defaultFile = default,
-                              wildcard = "Python Files (*.py)|*.py|All Files|*",
+                              wildcard = "Python Files (*.py)|*.py|"
+                                         "DEAP Sessions (*.deap)|*.deap|All Files|*",
                               style=wx.SAVE | wx.OVERWRITE_PROMPT)
         if wx.ID_OK <> dialog.ShowModal():
             filename = None
@@ -379,10 +393,22 @@ class DEAPPanel(Panel):
 
     def SaveFile(self):
         history = self.GetHistory()
+        if self.historyFile.endswith(".deap"):
+            skipped = self.GetDocument().SaveSnapshot(self.historyFile,
+                                                      history[::-1])
+            self.GetDocument().CompactJournal()
+            if skipped:
+                wx.MessageBox('Some of the plot could not be saved (%s).  '
+                              'The session will be opened by running its '
+                              'commands again.' % ', '.join(skipped),
+                              'Save Session', parent=self,
+                              style=wx.OK | wx.ICON_INFORMATION)
+            return
 
         f = open(self.historyFile, "w")
         f.writelines(history[::-1])
         f.close()
+        self.GetDocument().CompactJournal()
 
     def OnExport(self, event):
         """
@@ -448,6 +474,10 @@ class DEAPPanel(Panel):
     def OnViewAllPanels(self, event):
         self.GetPlotView().DisplayAllSubplots()
 
+    def OnViewFitY(self, event):
+        "Handler for a fit Y to visible data event."
+        self.GetPlotView().SetFitY()
+
     def OnZoom(self, event):
         "Handler for a zoom event."
         self.GetPlotView().ZoomIn()
@@ -477,6 +507,13 @@ class DEAPPanel(Panel):
         self.GetToolBar().ToggleTool(ID_TOOLBAR_PANTOOL,  True)
         self.GetPlotView().SetPanMode()
 
+    def OnToolsStats(self, event):
+        "Handler for a statistics tool selection event."
+        self.GetToolBar().ToggleTool(ID_TOOLBAR_INFOTOOL, False)
+        self.GetToolBar().ToggleTool(ID_TOOLBAR_ZOOMTOOL, False)
+        self.GetToolBar().ToggleTool(ID_TOOLBAR_PANTOOL,  False)
+        self.GetPlotView().SetStatsMode()
+
     def OnToolsGrid(self, event):
         "Handler for a grid tool selection event."
         self.GetToolBar().ToggleTool(ID_TOOLBAR_GRIDTOOL, True)
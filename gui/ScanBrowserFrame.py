@@ -0,0 +1,125 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+from   framework        import ScanPrefetcher
+from   matplotlib.lines import Line2D
+import numpy
+import wx
+
+COLORS = "bgrcmyk"
+
+def decode_spectra(spectra):
+    """
+    Returns C{spectra} as a 2D array of native floats, one row per
+    spectrum, so that drawing it does not convert it again.
+    """
+    return numpy.atleast_2d(numpy.asarray(spectra, dtype = numpy.float64))
+
+def build_lines(spectra):
+    """
+    Returns a line for each row of C{spectra} against the channel number.
+    """
+    x = numpy.arange(spectra.shape[1])
+    return [Line2D(x, row, color = COLORS[i % len(COLORS)])
+            for i, row in enumerate(spectra)]
+
+class ScanBrowserFrame(wx.Frame):
+    """
+    Steps through scans one at a time with Previous and Next buttons,
+    plotting each in the figure of the document.  While a scan is shown
+    the next few are loaded and decoded on a background thread, and the
+    scans loaded are kept up to a memory cap, so stepping to the next or
+    a recent scan does not wait for the file.  Only the arrays are kept;
+    the lines are built each time a scan is shown, as a line belongs to
+    the axes it was first added to.
+    """
+
+    def __init__(self, parent, document, keys, load, ahead=4,
+                 maxsize=256 << 20, title="Scan"):
+        wx.Frame.__init__(self, parent, -1, "Scan Browser")
+        self.document = document
+        self.title    = title
+        self.index    = 0
+        self.scans    = ScanPrefetcher(keys,
+                                       lambda key: decode_spectra(load(key)),
+                                       ahead, maxsize)
+        self.InitControls()
+        self.Bind(wx.EVT_CLOSE, self.OnClose)
+
+    def InitControls(self):
+        "Creates the buttons and the label of the scan shown."
+        panel = wx.Panel(self, -1)
+        self.prevBtn = wx.Button(panel, -1, "< Previous")
+        self.nextBtn = wx.Button(panel, -1, "Next >")
+        self.label   = wx.StaticText(panel, -1, "", size = (200, -1),
+                                     style = wx.ALIGN_CENTER)
+
+        self.Bind(wx.EVT_BUTTON, self.OnPrevious, self.prevBtn)
+        self.Bind(wx.EVT_BUTTON, self.OnNext,     self.nextBtn)
+
+        sizer = wx.BoxSizer(wx.HORIZONTAL)
+        sizer.AddMany([(self.prevBtn, 0, wx.ALL, 5),
+                       (self.label,   1, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 5),
+                       (self.nextBtn, 0, wx.ALL, 5)])
+        panel.SetSizer(sizer)
+        sizer.Fit(self)
+
+    def GetScans(self):
+        "Returns the prefetcher holding the scans."
+        return self.scans
+
+    def Show(self, show=True):
+        "Shows the frame and the current scan."
+        wx.Frame.Show(self, show)
+        if show and len(self.scans):
+            self.ShowScan(self.index)
+
+    def ShowScan(self, index, direction=1):
+        """
+        Replaces the figure with scan C{index}.
+        """
+        busy    = wx.BusyCursor()
+        spectra = self.scans.Get(index, direction)
+        del busy
+        self.index = index
+
+        figure = self.document.get_figure()
+        figure.clear()
+        axes = figure.add_subplot(111)
+        for line in build_lines(spectra):
+            axes.add_line(line)
+        axes.autoscale_view()
+        axes.set_title("%s %s" % (self.title, self.scans.GetKey(index)))
+        self.document.draw()
+
+        self.label.SetLabel("%s %s (%d of %d)" % (self.title,
+                            self.scans.GetKey(index), index + 1,
+                            len(self.scans)))
+        self.prevBtn.Enable(index > 0)
+        self.nextBtn.Enable(index + 1 < len(self.scans))
+
+    def OnPrevious(self, event):
+        if self.index > 0:
+            self.ShowScan(self.index - 1, -1)
+
+    def OnNext(self, event):
+        if self.index + 1 < len(self.scans):
+            self.ShowScan(self.index + 1)
+
+    def OnClose(self, event):
+        self.scans.Stop()
+        event.Skip()
@@ -19,3 +19,4 @@ from AboutDialog import AboutDialog
 from DEAPFrame   import DEAPFrame
 from DEAPPanel   import DEAPPanel
 from DEAPPyShell import DEAPPyShell
+from ScanBrowserFrame import ScanBrowserFrame
@@ -0,0 +1,184 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+from   matplotlib.image import AxesImage
+from   matplotlib.lines import Line2D
+import numpy
+
+# Ways of reducing the points that fall in one pixel.
+REDUCTIONS = ('count', 'mean', 'max')
+
+def aggregate_points(x, y, values, xlim, ylim, width, height, how='count'):
+    """
+    Bins the points C{x}, C{y} into a C{height} by C{width} grid over
+    C{xlim} by C{ylim} and returns, per pixel, the number of points or the
+    mean or maximum of their C{values}.  Pixels without points are masked.
+    """
+    if how not in REDUCTIONS:
+        raise ValueError("Unknown reduction %s, use one of %s."
+                         % (how, ", ".join(REDUCTIONS)))
+
+    x0, x1 = xlim
+    y0, y1 = ylim
+    col = numpy.floor((x - x0) * (width  / float(x1 - x0))).astype(int)
+    row = numpy.floor((y - y0) * (height / float(y1 - y0))).astype(int)
+    inside = (col >= 0) & (col < width) & (row >= 0) & (row < height)
+    if values is not None:
+        inside &= numpy.isfinite(values)
+        values  = values[inside]
+    pixel = row[inside] * width + col[inside]
+
+    size   = width * height
+    counts = numpy.bincount(pixel, minlength = size)
+    empty  = (counts == 0).reshape(height, width)
+    if how == 'count':
+        grid = counts.astype(numpy.float64)
+    elif how == 'mean':
+        sums = numpy.bincount(pixel, weights = values, minlength = size)
+        grid = sums / numpy.maximum(counts, 1)
+    else:
+        grid  = numpy.zeros(size)
+        order = numpy.argsort(pixel, kind = 'mergesort')
+        if len(order):
+            pixel  = pixel[order]
+            starts = numpy.flatnonzero(numpy.r_[True, pixel[1:] != pixel[:-1]])
+            grid[pixel[starts]] = numpy.maximum.reduceat(values[order], starts)
+
+    return numpy.ma.masked_array(grid.reshape(height, width), mask = empty)
+
+class AggregateImage(AxesImage):
+    """
+    Shows a scatter plot of very many points as an image with one pixel
+    per screen pixel, holding the number of points there or the mean or
+    maximum of a value given for each point.  Only the visible region is
+    aggregated, again whenever the view changes.  When zoomed in so far
+    that fewer than C{threshold} points are visible, the points are drawn
+    as markers instead.
+    """
+
+    def __init__(self, axes, x, y, values=None, how='count',
+                 threshold=100000, marker='.', **kwds):
+        if how not in REDUCTIONS:
+            raise ValueError("Unknown reduction %s, use one of %s."
+                             % (how, ", ".join(REDUCTIONS)))
+        if how != 'count' and values is None:
+            raise ValueError("The %s reduction needs values." % how)
+
+        kwds.setdefault('origin', 'lower')
+        kwds.setdefault('interpolation', 'nearest')
+        AxesImage.__init__(self, axes, **kwds)
+
+        x = numpy.asarray(x, dtype = numpy.float64)
+        y = numpy.asarray(y, dtype = numpy.float64)
+        finite = numpy.isfinite(x) & numpy.isfinite(y)
+
+        # Sorting by X once lets the visible points be found by bisection.
+        order = numpy.argsort(x[finite], kind = 'mergesort')
+        self.x = x[finite][order]
+        self.y = y[finite][order]
+        self.values = None
+        if values is not None:
+            self.values = numpy.asarray(values, dtype = numpy.float64)
+            self.values = self.values[finite][order]
+
+        self.how       = how
+        self.threshold = threshold
+        self.key       = None
+        self.handoff   = False
+        self.markers   = Line2D([], [], linestyle = 'None', marker = marker)
+
+        if len(self.x):
+            self.limits = (self.x[0], self.x[-1], self.y.min(), self.y.max())
+        else:
+            self.limits = (0.0, 1.0, 0.0, 1.0)
+
+        self.set_data(numpy.zeros((1, 1)))
+        self._extent = self.limits
+
+    def GetDataLimits(self):
+        """
+        Returns the minimum and maximum X, and the minimum and maximum Y,
+        of the points.
+        """
+        return self.limits
+
+    def IsShowingMarkers(self):
+        """
+        Returns a boolean indicating if the visible points are few enough
+        to be drawn as markers.
+        """
+        return self.handoff
+
+    def GetVisible(self):
+        """
+        Returns the X and Y of the points in the view, and their values.
+        """
+        xmin, xmax = sorted(self.axes.get_xlim())
+        ymin, ymax = sorted(self.axes.get_ylim())
+        lo = numpy.searchsorted(self.x, xmin, side = 'left')
+        hi = numpy.searchsorted(self.x, xmax, side = 'right')
+
+        y = self.y[lo:hi]
+        inside = (y >= ymin) & (y <= ymax)
+        values = self.values
+        if values is not None:
+            values = values[lo:hi][inside]
+        return self.x[lo:hi][inside], y[inside], values
+
+    def Update(self):
+        """
+        Aggregates the visible points for the current view, or hands them
+        to the markers, unless that has been done already.
+        """
+        xlim   = tuple(self.axes.get_xlim())
+        ylim   = tuple(self.axes.get_ylim())
+        width  = max(1, int(self.axes.bbox.width))
+        height = max(1, int(self.axes.bbox.height))
+
+        key = (xlim, ylim, width, height)
+        if key == self.key:
+            return
+        self.key = key
+
+        x, y, values = self.GetVisible()
+        self.handoff = len(x) < self.threshold
+        if self.handoff:
+            self.markers.set_data(x, y)
+            return
+
+        grid = aggregate_points(x, y, values, sorted(xlim), sorted(ylim),
+                                width, height, self.how)
+        if ylim[0] > ylim[1]:
+            grid = grid[::-1]
+        if xlim[0] > xlim[1]:
+            grid = grid[:, ::-1]
+
+        self.set_data(grid)
+        self._extent = (min(xlim), max(xlim), min(ylim), max(ylim))
+        self.autoscale()
+
+    def draw(self, renderer, *args, **kwds):
+        self.Update()
+        if not self.handoff:
+            AxesImage.draw(self, renderer, *args, **kwds)
+            return
+
+        self.markers.set_figure(self.figure)
+        self.markers.set_transform(self.axes.transData)
+        self.markers.set_clip_box(self.axes.bbox)
+        self.markers.axes = self.axes
+        self.markers.draw(renderer)
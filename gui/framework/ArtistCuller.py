@@ -0,0 +1,208 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+from   matplotlib.image   import AxesImage
+from   matplotlib.lines   import Line2D
+from   matplotlib.patches import Patch
+from   matplotlib.text    import Annotation
+from   matplotlib.text    import Text
+import weakref
+import numpy
+
+class ArtistCuller:
+    """
+    Skips artists that cannot show up in the current view.  The data space
+    bounding box of every line, patch and image is cached together with a
+    token identifying the data it was computed from, so it is recomputed
+    only when that data changes.  Before a draw, the boxes of each axes
+    are transformed to the canvas in one go, and the artists whose box
+    misses the region they can appear in (the axes for clipped artists,
+    the figure otherwise) are hidden until the draw is over.  Text is
+    tested at its anchor, allowing for the size of the string.
+    """
+
+    def __init__(self, margin=4):
+        self.enabled = True
+        self.margin  = margin   # pixels of slack around every artist
+        self.bounds  = weakref.WeakKeyDictionary()
+
+    def SetEnabled(self, state):
+        """
+        Enable or disable culling.
+        """
+        self.enabled = state
+
+    def IsEnabled(self):
+        """
+        Returns a boolean indicating if culling is enabled.
+        """
+        return self.enabled
+
+    def Invalidate(self, artist=None):
+        """
+        Discards the cached bounds of C{artist}, or of all artists.  Bounds
+        follow C{set_data} and friends automatically; use this after
+        changing data arrays in place.
+        """
+        if artist is None:
+            self.bounds.clear()
+        elif artist in self.bounds:
+            del self.bounds[artist]
+
+    def GetBounds(self, axes, artist):
+        """
+        Returns the data space bounding box of C{artist} as a 4-tuple of
+        minimum X, minimum Y, maximum X and maximum Y, or C{None} if the
+        artist is not drawn in the data coordinates of C{axes} or has no
+        finite extent.
+        """
+        # Artists that read their data for the view (e.g., out-of-core
+        # lines) hold only what was last in view; ask for their full extent.
+        limits = getattr(artist, "GetDataLimits", None)
+        if limits is not None:
+            if artist.get_transform() is not axes.transData: return None
+            xmin, xmax, ymin, ymax = limits()
+            return self._extent((xmin, xmax), (ymin, ymax))
+
+        if isinstance(artist, Annotation):
+            # Only annotations placed entirely in data coordinates have a
+            # known extent; the box spans the text and the annotated point.
+            # Newer matplotlib calls textcoords anncoords.
+            textcoords = getattr(artist, 'anncoords',
+                                 getattr(artist, 'textcoords', None))
+            if artist.xycoords != 'data' or textcoords != 'data':
+                return None
+            return self._extent(*zip(artist.get_position(), artist.xy))
+
+        if isinstance(artist, Text):
+            if artist.get_transform() is not axes.transData: return None
+            x, y = artist.get_position()
+            return x, y, x, y
+
+        if isinstance(artist, Line2D):
+            if artist.get_transform() is not axes.transData: return None
+            x, y = artist.get_xdata(orig=True), artist.get_ydata(orig=True)
+            token = (id(x), id(y))
+        elif isinstance(artist, Patch):
+            if artist.get_data_transform() is not axes.transData: return None
+            path = artist.get_path()
+            transform = artist.get_patch_transform()
+            token = (id(path), tuple(transform.get_matrix().ravel()))
+        elif isinstance(artist, AxesImage):
+            if artist.get_transform() is not axes.transData: return None
+            token = (id(artist.get_array()), tuple(artist.get_extent()))
+        else:
+            return None
+
+        cached = self.bounds.get(artist)
+        if cached is not None and cached[0] == token:
+            return cached[1]
+
+        if isinstance(artist, Line2D):
+            box = self._extent(x, y)
+        elif isinstance(artist, Patch):
+            box = tuple(path.get_extents(transform).extents)
+        else:
+            x0, x1, y0, y1 = artist.get_extent()
+            box = self._extent((x0, x1), (y0, y1))
+
+        if box is not None and not numpy.all(numpy.isfinite(box)):
+            box = None
+        self.bounds[artist] = (token, box)
+        return box
+
+    def _extent(self, x, y):
+        x = numpy.asarray(x, dtype = numpy.float64)
+        y = numpy.asarray(y, dtype = numpy.float64)
+        x = x[numpy.isfinite(x)]
+        y = y[numpy.isfinite(y)]
+        if len(x) == 0 or len(y) == 0:
+            return None
+        return x.min(), y.min(), x.max(), y.max()
+
+    def _margin(self, artist, dpi):
+        "Returns the reach, in pixels, of C{artist} beyond its bounds."
+        if isinstance(artist, Text):
+            width = max([len(s) for s in artist.get_text().split("\n")] + [1])
+            return self.margin + artist.get_size() * dpi / 72.0 * width
+        if isinstance(artist, Line2D):
+            return self.margin + (artist.get_markersize()
+                                + artist.get_linewidth()) * dpi / 72.0
+        return self.margin
+
+    def Cull(self, figure):
+        """
+        Hides the visible artists of C{figure} that lie outside the view
+        and returns them, to be passed to C{Restore} after drawing.
+        """
+        hidden = []
+        if not self.enabled: return hidden
+
+        dpi = figure.dpi
+        figureBox = figure.bbox.extents
+        for axes in figure.get_axes():
+            if not axes.get_visible(): continue
+
+            artists, boxes, margins, regions = [], [], [], []
+            axesBox = axes.bbox.extents
+            for artist in axes.lines + axes.patches + axes.texts + axes.images:
+                if not artist.get_visible(): continue
+
+                box = self.GetBounds(axes, artist)
+                if box is None: continue
+
+                artists.append(artist)
+                boxes.append(box)
+                margins.append(self._margin(artist, dpi))
+                if artist.get_clip_on() and \
+                   (artist.get_clip_box()  is not None or
+                    artist.get_clip_path() is not None):
+                    regions.append(axesBox)
+                else:
+                    regions.append(figureBox)
+
+            if not artists: continue
+
+            boxes   = numpy.array(boxes, dtype = numpy.float64)
+            margins = numpy.array(margins)
+            regions = numpy.array(regions)
+            corners = axes.transData.transform(
+                      numpy.vstack((boxes[:, :2], boxes[:, 2:])))
+            lower, upper = corners[:len(artists)], corners[len(artists):]
+
+            # Axes can be inverted, so order the corners again on canvas.
+            x0 = numpy.minimum(lower[:, 0], upper[:, 0]) - margins
+            x1 = numpy.maximum(lower[:, 0], upper[:, 0]) + margins
+            y0 = numpy.minimum(lower[:, 1], upper[:, 1]) - margins
+            y1 = numpy.maximum(lower[:, 1], upper[:, 1]) + margins
+
+            # Comparisons with NaN (e.g., log of negative bounds) are false,
+            # so such artists are always drawn.
+            outside = (x1 < regions[:, 0]) | (x0 > regions[:, 2]) \
+                    | (y1 < regions[:, 1]) | (y0 > regions[:, 3])
+            for i in numpy.flatnonzero(outside):
+                artists[i].set_visible(False)
+                hidden.append(artists[i])
+
+        return hidden
+
+    def Restore(self, hidden):
+        """
+        Shows again the artists hidden by C{Cull}.
+        """
+        for artist in hidden:
+            artist.set_visible(True)
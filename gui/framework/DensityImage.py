@@ -0,0 +1,169 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+from   matplotlib.image import AxesImage
+import numpy
+
+def rasterize_traces(x, traces, xlim, ylim, width, height, chunk=256):
+    """
+    Returns a C{height} by C{width} array counting, for every pixel of the
+    region C{xlim} by C{ylim}, how many of C{traces} (a 2D array with one
+    trace per row, sampled at the monotonic C{x}) pass through it, with
+    the traces drawn as connected lines.
+
+    The traces are interpolated at the column boundaries, so that every
+    piece of a trace lies within one column; a trace then covers the rows
+    between its lowest and highest point in each column, found with one
+    reduction over the samples of all columns.  These
+    runs are accumulated with a difference array and summed up the
+    columns.  Traces are processed C{chunk} at a time to bound memory.
+    """
+    x      = numpy.asarray(x, dtype = numpy.float64)
+    traces = numpy.atleast_2d(traces)
+    counts = numpy.zeros((width, height + 1), dtype = numpy.int64)
+
+    if x[0] > x[-1]:
+        x, traces = x[::-1], traces[:, ::-1]
+
+    x0, x1 = min(xlim), max(xlim)
+    y0, y1 = ylim
+    if len(x) < 2 or x1 <= max(x0, x[0]) or x0 >= x[-1] or y0 == y1:
+        return counts[:, :height].T
+
+    # Column boundaries within the data, and the samples between them.
+    edges = numpy.linspace(x0, x1, width + 1)
+    first = numpy.searchsorted(edges, x[0])
+    last  = numpy.searchsorted(edges, x[-1], side = 'right')
+    edges = edges[first:last]
+    if len(edges) < 2:
+        return counts[:, :height].T
+    lo = numpy.searchsorted(x, edges[0],  side = 'right')
+    hi = numpy.searchsorted(x, edges[-1], side = 'left')
+    columns = len(edges) - 1
+
+    # Interpolation weights of the boundaries, shared by all traces.
+    right  = numpy.clip(numpy.searchsorted(x, edges), 1, len(x) - 1)
+    weight = (edges - x[right - 1]) / (x[right] - x[right - 1])
+
+    # The samples are sorted, so those of each column are contiguous.
+    inColumn = numpy.searchsorted(edges, x[lo:hi], side = 'right') - 1
+    starts   = numpy.searchsorted(inColumn, numpy.arange(columns + 1))
+    empty    = starts[:-1] == starts[1:]
+    starts   = numpy.clip(starts[:-1], 0, max(0, hi - lo - 1))
+    column   = first + numpy.arange(columns)
+
+    scale = height / float(y1 - y0)
+    for begin in range(0, len(traces), chunk):
+        block = numpy.asarray(traces[begin:begin + chunk],
+                              dtype = numpy.float64)
+        atEdges = block[:, right - 1] * (1.0 - weight) + block[:, right] * weight
+        lower = numpy.fmin(atEdges[:, :-1], atEdges[:, 1:])
+        upper = numpy.fmax(atEdges[:, :-1], atEdges[:, 1:])
+
+        # Each column spans its boundaries and the samples between them.
+        if hi > lo:
+            inner = block[:, lo:hi]
+            least = numpy.fmin.reduceat(inner, starts, axis = 1)
+            most  = numpy.fmax.reduceat(inner, starts, axis = 1)
+            least[:, empty] = numpy.nan
+            most[:, empty]  = numpy.nan
+            lower = numpy.fmin(lower, least)
+            upper = numpy.fmax(upper, most)
+
+        lower = (lower - y0) * scale
+        upper = (upper - y0) * scale
+        drawn = numpy.isfinite(lower)
+        drawn[drawn] = (upper[drawn] >= 0) & (lower[drawn] < height)
+        lower = numpy.clip(numpy.floor(lower[drawn]), 0, height - 1)
+        upper = numpy.clip(numpy.floor(upper[drawn]), 0, height - 1)
+        cols  = numpy.repeat(column[numpy.newaxis], len(block), axis = 0)
+        cols  = cols[drawn]
+
+        base = cols * (height + 1)
+        size = width * (height + 1)
+        counts += numpy.bincount((base + lower).astype(int),
+                                 minlength = size).reshape(counts.shape)
+        counts -= numpy.bincount((base + upper + 1).astype(int),
+                                 minlength = size).reshape(counts.shape)
+
+    return numpy.cumsum(counts, axis = 1)[:, :height].T
+
+class DensityImage(AxesImage):
+    """
+    Shows many overlapping traces (e.g., every integration of a scan) as
+    an image of how many traces pass through each pixel.  The raster is
+    computed at screen resolution for the visible range, and again only
+    when the view or the size of the axes changes.
+    """
+
+    def __init__(self, axes, traces, x=None, log=False, **kwds):
+        kwds.setdefault('origin', 'lower')
+        kwds.setdefault('interpolation', 'nearest')
+        AxesImage.__init__(self, axes, **kwds)
+
+        self.traces = numpy.atleast_2d(traces)
+        if x is None:
+            x = numpy.arange(self.traces.shape[1])
+        self.x   = numpy.asarray(x, dtype = numpy.float64)
+        self.log = log
+        self.key = None
+
+        finite = self.traces[numpy.isfinite(self.traces)]
+        if len(finite) == 0:
+            finite = numpy.array([0.0, 1.0])
+        self.limits = (self.x.min(), self.x.max(), finite.min(), finite.max())
+
+        self.set_data(numpy.zeros((1, 1)))
+        self._extent = self.limits
+
+    def GetDataLimits(self):
+        """
+        Returns the minimum and maximum X, and the minimum and maximum Y,
+        of the traces.
+        """
+        return self.limits
+
+    def Update(self):
+        """
+        Recomputes the raster for the current view, unless it is current.
+        """
+        xlim  = tuple(self.axes.get_xlim())
+        ylim  = tuple(self.axes.get_ylim())
+        width = max(1, int(self.axes.bbox.width))
+        height = max(1, int(self.axes.bbox.height))
+
+        key = (xlim, ylim, width, height)
+        if key == self.key:
+            return
+        self.key = key
+
+        raster = rasterize_traces(self.x, self.traces, xlim, sorted(ylim),
+                                  width, height)
+        if ylim[0] > ylim[1]:
+            raster = raster[::-1]
+        if xlim[0] > xlim[1]:
+            raster = raster[:, ::-1]
+        if self.log:
+            raster = numpy.log10(1 + raster)
+
+        self.set_data(raster.astype(numpy.float32))
+        self._extent = (min(xlim), max(xlim), min(ylim), max(ylim))
+        self.autoscale()
+
+    def draw(self, renderer, *args, **kwds):
+        self.Update()
+        AxesImage.draw(self, renderer, *args, **kwds)
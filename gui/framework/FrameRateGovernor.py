@@ -0,0 +1,201 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import time
+
+# Quality levels, from full quality down.  Each level names the envelope
+# resolution (groups per axes pixel, None for full resolution) and
+# whether antialiasing and markers are drawn.
+LEVELS = [
+    { 'resolution' : None, 'antialiased' : True,  'markers' : True  }
+  , { 'resolution' : None, 'antialiased' : False, 'markers' : True  }
+  , { 'resolution' : 1.0,  'antialiased' : False, 'markers' : True  }
+  , { 'resolution' : 0.5,  'antialiased' : False, 'markers' : False }
+  , { 'resolution' : 0.25, 'antialiased' : False, 'markers' : False }
+]
+
+class FrameRateGovernor:
+    """
+    Holds the frames of the pan tool to a target frame rate by trading
+    quality for speed.  The duration of recent frames is averaged and,
+    while an interaction is in progress, the quality level is lowered
+    when frames are too slow and raised again when they are comfortably
+    fast.  Full quality is restored when the interaction ends.
+
+    Only panning, which redraws the figure on every mouse move, is
+    governed: a zoom draws a single frame at full quality, and the
+    crosshairs are painted over the last frame without redrawing it.
+    """
+
+    def __init__(self, view, targetFps=30.0, window=4, raiseRatio=0.5):
+        self.view        = view
+        self.enabled     = True
+        self.targetFps   = 30.0       # frames per second to hold
+        self.window      = window     # frames averaged per decision
+        self.raiseRatio  = raiseRatio # fraction of the frame time budget
+                                      # under which quality is raised
+        self.level       = 0
+        self.interacting = False
+        self.degraded    = False
+        self.frameTimes  = []
+        self.SetSettings(targetFps = targetFps)
+
+    def GetSettings(self):
+        """
+        Returns the governor settings as a dictionary, with the frame time
+        thresholds (s) used to lower and raise quality.
+        """
+        return { 'enabled'    : self.enabled
+               , 'targetFps'  : self.targetFps
+               , 'window'     : self.window
+               , 'raiseRatio' : self.raiseRatio
+               , 'lowerAbove' : self.GetBudget()
+               , 'raiseBelow' : self.GetBudget() * self.raiseRatio
+               , 'level'      : self.level
+               , 'levels'     : LEVELS
+               }
+
+    def SetSettings(self, enabled=None, targetFps=None, window=None,
+                    raiseRatio=None):
+        """
+        Changes the given governor settings.
+        """
+        if targetFps is not None and float(targetFps) <= 0:
+            raise ValueError("The target frame rate must be positive, not %s."
+                             % targetFps)
+        if enabled is not None:
+            self.enabled = enabled
+        if targetFps is not None:
+            self.targetFps = float(targetFps)
+        if window is not None:
+            self.window = max(1, int(window))
+        if raiseRatio is not None:
+            self.raiseRatio = float(raiseRatio)
+
+    def LoadSettings(self, application):
+        """
+        Reads the settings from the C{[Governor]} section of the
+        application's configuration file, if there is one.  The defaults
+        are kept if the configuration has not been read.
+        """
+        values = getattr(application, "configValues", None)
+        if getattr(values, "config", None) is None or \
+           not values.HasSection("Governor"):
+            return
+
+        # A rate that is not positive is ignored, as invalid values are.
+        targetFps = values.GetOptionWithValidation("Governor", "targetFps",
+                                                   self.targetFps)
+        if targetFps <= 0:
+            targetFps = self.targetFps
+        self.SetSettings(
+            values.GetOption("Governor", "enabled", self.enabled) == "True"
+          , targetFps
+          , values.GetOptionWithValidation("Governor", "window", self.window)
+          , values.GetOptionWithValidation("Governor", "raiseRatio",
+                                           self.raiseRatio))
+
+    def GetBudget(self):
+        """
+        Returns the time allowed for one frame, in seconds.
+        """
+        return 1.0 / self.targetFps
+
+    def IsInteracting(self):
+        """
+        Returns a boolean indicating if an interaction is in progress.
+        """
+        return self.interacting
+
+    def BeginInteraction(self):
+        """
+        Marks the start of an interaction.  Quality starts at the level
+        reached by the previous interaction.
+        """
+        self.interacting = self.enabled
+        self.frameTimes  = []
+
+    def EndInteraction(self):
+        """
+        Marks the end of an interaction.  Returns a boolean indicating if
+        any frame was drawn below full quality, i.e. if the figure should
+        be redrawn.
+        """
+        degraded = self.degraded
+        self.interacting = False
+        self.degraded    = False
+        return degraded
+
+    def Draw(self, draw):
+        """
+        Calls C{draw} at the current quality level, times the frame and
+        adjusts the level for the next one.
+        """
+        level = LEVELS[self.level]
+        self.degraded = self.degraded or self.level > 0
+
+        saved = self.Degrade(level)
+        start = time.time()
+        try:
+            if level['resolution'] is None:
+                draw()
+            else:
+                self.view.GetProgressiveRenderer().DrawCoarse(
+                    draw, level['resolution'])
+        finally:
+            self.Restore(saved)
+
+        self.Adjust(time.time() - start)
+
+    def Adjust(self, elapsed):
+        """
+        Records the duration of a frame and changes the quality level once
+        enough frames have been seen.
+        """
+        self.frameTimes.append(elapsed)
+        if len(self.frameTimes) < self.window:
+            return
+
+        average = sum(self.frameTimes) / len(self.frameTimes)
+        self.frameTimes = []
+        if average > self.GetBudget():
+            self.level = min(len(LEVELS) - 1, self.level + 1)
+        elif average < self.GetBudget() * self.raiseRatio:
+            self.level = max(0, self.level - 1)
+
+    def Degrade(self, level):
+        """
+        Turns off antialiasing and markers as required by C{level}.
+        Returns what is needed to restore the artists afterwards.
+        """
+        saved = []
+        if level['antialiased'] and level['markers']:
+            return saved
+
+        for axes in self.view.get_figure().get_axes():
+            for line in axes.lines:
+                saved.append((line, line.get_antialiased(), line.get_marker()))
+                if not level['antialiased']:
+                    line.set_antialiased(False)
+                if not level['markers']:
+                    line.set_marker('None')
+        return saved
+
+    def Restore(self, saved):
+        for line, antialiased, marker in saved:
+            line.set_antialiased(antialiased)
+            line.set_marker(marker)
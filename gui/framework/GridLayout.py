@@ -0,0 +1,241 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+from   LRUCache import LRUCache
+import math
+import weakref
+
+def get_geometry(axes):
+    """
+    Returns the number of rows and columns of the grid C{axes} was created
+    in, and its zero based cell number, or C{None} if it is not a subplot.
+    """
+    if not hasattr(axes, "get_geometry"):
+        return None
+    rows, cols, num = axes.get_geometry()
+    return rows, cols, num - 1
+
+class GridLayout:
+    """
+    Computes the positions of the panels of a subplot grid.  The positions
+    of a whole grid are computed at once and kept for each combination of
+    rows, columns, figure size, subplot parameters and label extents, so
+    switching between the grid and a single focused panel, or redrawing
+    a figure of many panels, does not lay anything out again.
+
+    In tight mode, the margins and the space between panels are sized to
+    the tick labels, axis labels and titles instead of the fixed fractions
+    of C{Figure.subplots_adjust}.
+
+    Subplots the user has moved with C{set_position} are left where they
+    are: only axes still at a position the layout, or the subplot
+    parameters, put them in are placed again.
+    """
+
+    def __init__(self, pad=4, maxsize=64):
+        self.tight   = False
+        self.pad     = pad      # pixels around labels in tight mode
+        self.extents = None     # label extents used by the last layout
+        self.cache   = LRUCache(maxsize)
+        self.saved   = weakref.WeakKeyDictionary() # positions before Focus
+        self.placed  = weakref.WeakKeyDictionary() # positions set here
+
+    def SetTight(self, state):
+        """
+        Enable or disable sizing the gaps to the labels.
+        """
+        self.tight = state
+
+    def IsTight(self):
+        """
+        Returns a boolean indicating if gaps are sized to the labels.
+        """
+        return self.tight
+
+    def MeasureLabels(self, figure, renderer):
+        """
+        Returns the room, in pixels, that the labels of the subplots of
+        C{figure} need to the left of, below and above a panel.  Values
+        are rounded up so that small changes do not cause a new layout.
+        """
+        left = bottom = top = 0
+        for axes in figure.get_axes():
+            if not axes.get_visible() or get_geometry(axes) is None:
+                continue
+
+            width  = self._largest(axes.get_yticklabels(), renderer, 0)
+            width += self._largest([axes.yaxis.label], renderer, 0)
+            height  = self._largest(axes.get_xticklabels(), renderer, 1)
+            height += self._largest([axes.xaxis.label], renderer, 1)
+            title   = self._largest([axes.title], renderer, 1)
+
+            left, bottom, top = max(left, width), max(bottom, height), \
+                                max(top, title)
+
+        step = 2 * self.pad
+        return tuple([int(math.ceil(value / step) + 1) * step
+                      for value in (left, bottom, top)])
+
+    def _largest(self, texts, renderer, dimension):
+        "Returns the largest width or height of the non-empty C{texts}."
+        largest = 0
+        for text in texts:
+            if not text.get_visible() or not text.get_text():
+                continue
+            extent = text.get_window_extent(renderer)
+            largest = max(largest, (extent.width, extent.height)[dimension])
+        return largest
+
+    def GetPositions(self, figure, rows, cols, extents=None):
+        """
+        Returns the positions, as lists of left, bottom, width and height
+        in figure coordinates, of the cells of a grid of C{rows} by C{cols}
+        panels on C{figure}, numbered across and then down.  If the label
+        C{extents} returned by C{MeasureLabels} are given, they set the
+        gaps; otherwise the figure's subplot parameters do.
+        """
+        width, height = figure.bbox.width, figure.bbox.height
+        params = figure.subplotpars
+        key = (rows, cols, int(width), int(height), extents,
+               params.left, params.right, params.bottom, params.top,
+               params.wspace, params.hspace)
+
+        positions = self.cache.get(key)
+        if positions is not None:
+            return positions
+
+        if extents is None:
+            left, right = params.left, params.right
+            bottom, top = params.bottom, params.top
+            panelWidth  = (right - left) / (cols + params.wspace * (cols - 1))
+            panelHeight = (top - bottom) / (rows + params.hspace * (rows - 1))
+            gapWidth    = params.wspace * panelWidth
+            gapHeight   = params.hspace * panelHeight
+        else:
+            labelWidth, labelHeight, titleHeight = extents
+            left,  right = labelWidth / width, 1.0 - 2.0 * self.pad / width
+            bottom, top  = labelHeight / height, 1.0 - titleHeight / height
+            gapWidth     = labelWidth / width
+            gapHeight    = (labelHeight + titleHeight) / height
+            panelWidth   = (right - left - gapWidth * (cols - 1)) / cols
+            panelHeight  = (top - bottom - gapHeight * (rows - 1)) / rows
+
+        positions = []
+        for row in range(rows):
+            for col in range(cols):
+                positions.append([left + col * (panelWidth + gapWidth),
+                                  top - (row + 1) * panelHeight
+                                      - row * gapHeight,
+                                  panelWidth, panelHeight])
+
+        self.cache.put(key, positions)
+        return positions
+
+    def GetCellPosition(self, axes, extents=None):
+        """
+        Returns the position of C{axes} in its grid, or its original
+        position if it is not a subplot.
+        """
+        geometry = get_geometry(axes)
+        if geometry is None:
+            return axes._originalPosition
+
+        rows, cols, num = geometry
+        return self.GetPositions(axes.figure, rows, cols, extents)[num]
+
+    def GetFocusPosition(self, figure, extents=None):
+        """
+        Returns the position of a panel shown on its own on C{figure}.
+        """
+        return self.GetPositions(figure, 1, 1, extents)[0]
+
+    def Focus(self, figure, focus):
+        """
+        Shows the axes C{focus} on its own, filling the figure.  Its
+        position is kept, to be restored by C{Unfocus}.
+        """
+        for axes in figure.get_axes():
+            if axes is focus:
+                if axes not in self.saved:
+                    self.saved[axes] = (list(axes.get_position().bounds),
+                                        self.IsPlaced(axes))
+                self._place(axes, self.GetFocusPosition(figure, self.extents))
+            axes.set_visible(axes is focus)
+
+    def Unfocus(self, figure, focus=None):
+        """
+        Puts the axes C{focus} back where it was before C{Focus}, or in its
+        cell, and shows all axes again.
+        """
+        for axes in figure.get_axes():
+            if axes is focus:
+                position, placed = self.saved.pop(axes, (None, True))
+                if position is None:
+                    position = self.GetCellPosition(axes, self.extents)
+                self._place(axes, position)
+                if not placed:
+                    self.placed.pop(axes, None)
+            axes.set_visible(True)
+
+    def Apply(self, figure, renderer=None, focus=None):
+        """
+        Places every subplot of C{figure}, or only the axes C{focus} if a
+        panel is focused.  In tight mode the labels are measured with
+        C{renderer} first.  Subplots moved by the user stay where they
+        are.  Returns a boolean indicating if any axes moved.
+        """
+        if self.tight and renderer is not None:
+            self.extents = self.MeasureLabels(figure, renderer)
+        elif not self.tight:
+            self.extents = None
+
+        moved = False
+        for axes in figure.get_axes():
+            if focus is not None:
+                if axes is not focus: continue
+                position = self.GetFocusPosition(figure, self.extents)
+            elif get_geometry(axes) is None or not self.IsPlaced(axes):
+                continue
+            else:
+                position = self.GetCellPosition(axes, self.extents)
+            moved = self._place(axes, position) or moved
+        return moved
+
+    def IsPlaced(self, axes):
+        """
+        Returns a boolean indicating if C{axes} is where this layout last
+        placed it, or in its cell of the grid given by the subplot
+        parameters, rather than somewhere the user moved it to.
+        """
+        positions = [self.placed.get(axes)]
+        if get_geometry(axes) is not None:
+            positions.append(self.GetCellPosition(axes))
+
+        bounds = axes.get_position().bounds
+        for position in positions:
+            if position is not None and \
+               max([abs(a - b) for a, b in zip(bounds, position)]) < 1e-9:
+                return True
+        return False
+
+    def _place(self, axes, position):
+        "Moves C{axes} to C{position} unless it is already there."
+        if list(axes.get_position().bounds) == position:
+            return False
+        axes.set_position(position)
+        self.placed[axes] = list(axes.get_position().bounds)
+        return True
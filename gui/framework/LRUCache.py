@@ -0,0 +1,119 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+from   collections import OrderedDict
+import threading
+
+class LRUCache:
+    """
+    A mapping of bounded size that evicts the least recently used entries
+    first.  By default every entry counts as one towards C{maxsize}; a
+    C{weigh} function can give entries a size instead (e.g., their number
+    of bytes).  Lookups are counted so that hit rates can be reported.
+    The cache can be shared between threads.
+    """
+
+    def __init__(self, maxsize, weigh=None):
+        self.maxsize = maxsize
+        self.weigh   = weigh or (lambda value: 1)
+        self.entries = OrderedDict()
+        self.size    = 0
+        self.hits    = 0
+        self.misses  = 0
+        self.lock    = threading.RLock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key, default=None):
+        """
+        Returns the value cached for C{key}, or C{default}, and counts the
+        lookup as a hit or a miss.
+        """
+        self.lock.acquire()
+        try:
+            if key not in self.entries:
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            value, weight = self.entries.pop(key)
+            self.entries[key] = (value, weight)
+            return value
+        finally:
+            self.lock.release()
+
+    def put(self, key, value):
+        """
+        Caches C{value} under C{key}, evicting old entries as needed.  A
+        value weighing more than the whole cache is not kept.
+        """
+        weight = self.weigh(value)
+
+        self.lock.acquire()
+        try:
+            self.discard(key)
+            if weight > self.maxsize:
+                return
+
+            self.entries[key] = (value, weight)
+            self.size += weight
+            while self.size > self.maxsize:
+                oldest, (old, oldWeight) = self.entries.popitem(last=False)
+                self.size -= oldWeight
+        finally:
+            self.lock.release()
+
+    def discard(self, key):
+        """
+        Removes C{key} from the cache, if present.
+        """
+        self.lock.acquire()
+        try:
+            if key in self.entries:
+                value, weight = self.entries.pop(key)
+                self.size -= weight
+        finally:
+            self.lock.release()
+
+    def clear(self):
+        """
+        Empties the cache.  The hit and miss counts are kept.
+        """
+        self.lock.acquire()
+        try:
+            self.entries.clear()
+            self.size = 0
+        finally:
+            self.lock.release()
+
+    def GetStatistics(self):
+        """
+        Returns a dictionary with the number of entries, their total size,
+        the maximum size, the hit and miss counts and the hit rate.
+        """
+        lookups = self.hits + self.misses
+        return { 'entries' : len(self.entries)
+               , 'size'    : self.size
+               , 'maxsize' : self.maxsize
+               , 'hits'    : self.hits
+               , 'misses'  : self.misses
+               , 'hitRate' : lookups and float(self.hits) / lookups or 0.0
+               }
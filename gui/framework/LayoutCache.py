@@ -0,0 +1,245 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+from   LRUCache import LRUCache
+import numpy
+
+# Attributes that tickers update while they work, rather than settings.
+STATE = ('axis', 'locs', 'offset', 'orderOfMagnitude', 'format')
+
+# Tickers that are trivial, or whose output depends on more than the view
+# interval and size of their axis, e.g., on the state of a function, are
+# left alone.
+UNCACHED = ('FixedLocator', 'NullLocator', 'IndexLocator',
+            'FixedFormatter', 'NullFormatter', 'FuncFormatter')
+
+def get_config(ticker):
+    """
+    Returns a hashable description of the settings of a locator or
+    formatter, so that tickers configured alike, on any axes, share cache
+    entries.
+    """
+    items = []
+    for name, value in sorted(vars(ticker).items()):
+        if name in STATE: continue
+        if isinstance(value, numpy.ndarray):
+            value = (value.dtype.str, value.shape, value.tostring())
+        else:
+            try:
+                hash(value)
+            except TypeError:
+                value = repr(value)
+        items.append((name, value))
+    return (ticker.__class__, tuple(items))
+
+def get_interval(axis):
+    "Returns the part of the state of C{axis} that tick positions follow."
+    scale = axis.get_scale()
+    key = (scale, tuple(axis.get_view_interval()))
+    if scale == 'log':
+        key += (axis.get_minpos(),)
+    return key
+
+def get_space(axis):
+    """
+    Returns the part of the state of C{axis} that the number of ticks
+    follows: the size of its axes in pixels, the resolution and the size
+    of the tick labels.
+    """
+    axes  = axis.axes
+    ticks = axis.majorTicks
+    size  = len(ticks) and ticks[0].label1.get_size() or None
+    return (axes.bbox.width, axes.bbox.height, axes.figure.dpi, size)
+
+def is_cacheable(ticker):
+    return ticker.__class__.__module__ == 'matplotlib.ticker' and \
+           ticker.__class__.__name__ not in UNCACHED
+
+class CachedLocator:
+    """
+    Stands in for a tick locator during a draw, answering from the cache
+    when a locator with the same settings has placed ticks for the same
+    view interval, on an axes of the same size, before.
+    """
+
+    def __init__(self, locator, axis, cache):
+        self.locator = locator
+        self.axis    = axis
+        self.cache   = cache
+        self.config  = get_config(locator)
+
+    def __call__(self):
+        key  = (self.config, get_interval(self.axis), get_space(self.axis))
+        locs = self.cache.get(key)
+        if locs is None:
+            locs = self.locator()
+            self.cache.put(key, locs)
+        return locs
+
+    def __getattr__(self, name):
+        return getattr(self.locator, name)
+
+class CachedFormatter:
+    """
+    Stands in for a tick formatter during a draw.  The label strings and
+    offset text of a set of tick locations are cached together, and the
+    real formatter is only brought up to date when something is missing.
+    """
+
+    def __init__(self, formatter, axis, cache):
+        self.formatter = formatter
+        self.axis      = axis
+        self.cache     = cache
+        self.config    = get_config(formatter)
+        self.locs      = []
+        self.entry     = {}
+        self.current   = False
+
+    def set_locs(self, locs):
+        key = (self.config, get_interval(self.axis), tuple(locs))
+        self.locs    = locs
+        self.current = False
+        self.entry   = self.cache.get(key)
+        if self.entry is None:
+            self.entry = {}
+            self.cache.put(key, self.entry)
+
+    def _update(self):
+        if not self.current:
+            self.formatter.set_locs(self.locs)
+            self.current = True
+
+    def __call__(self, x, pos=None):
+        key = (x, pos)
+        if key not in self.entry:
+            self._update()
+            self.entry[key] = self.formatter(x, pos)
+        return self.entry[key]
+
+    def get_offset(self):
+        if 'offset' not in self.entry:
+            self._update()
+            self.entry['offset'] = self.formatter.get_offset()
+        return self.entry['offset']
+
+    def __getattr__(self, name):
+        return getattr(self.formatter, name)
+
+class LayoutCache:
+    """
+    Remembers tick locations, tick label strings and text extents across
+    redraws.  Locators and formatters are keyed by their settings, the
+    axis scale and view interval, and locators also by the size of the
+    axes, the resolution and the tick label size; text extents by the
+    string, font and resolution.  Nothing is keyed by axes, so a grid of
+    panels with the same limits and size computes its ticks once.  All three caches are bounded
+    and count their hits and misses.
+    """
+
+    def __init__(self, ticks=1024, labels=1024, extents=8192):
+        self.enabled = True
+        self.ticks   = LRUCache(ticks)
+        self.labels  = LRUCache(labels)
+        self.extents = LRUCache(extents)
+
+    def SetEnabled(self, state):
+        """
+        Enable or disable the caches.
+        """
+        self.enabled = state
+
+    def IsEnabled(self):
+        """
+        Returns a boolean indicating if the caches are used.
+        """
+        return self.enabled
+
+    def Clear(self):
+        """
+        Empties all the caches.
+        """
+        self.ticks.clear()
+        self.labels.clear()
+        self.extents.clear()
+
+    def GetStatistics(self):
+        """
+        Returns the size and hit rate of each cache, as a dictionary.
+        """
+        return { 'ticks'   : self.ticks.GetStatistics()
+               , 'labels'  : self.labels.GetStatistics()
+               , 'extents' : self.extents.GetStatistics()
+               }
+
+    def Install(self, figure, renderer=None):
+        """
+        Puts caching stand-ins in place of the tick locators and formatters
+        of every axis of C{figure}, and caches the text measurements of
+        C{renderer}.  Returns what is needed to undo the former; pass it
+        to C{Uninstall} after drawing.
+        """
+        installed = []
+        if not self.enabled: return installed
+
+        if renderer is not None:
+            self.InstallRenderer(renderer)
+
+        for axes in figure.get_axes():
+            for axis in (axes.xaxis, axes.yaxis):
+                for ticker in (axis.major, axis.minor):
+                    locator, formatter = ticker.locator, ticker.formatter
+                    if is_cacheable(locator):
+                        ticker.locator = CachedLocator(locator, axis,
+                                                       self.ticks)
+                    if is_cacheable(formatter):
+                        ticker.formatter = CachedFormatter(formatter, axis,
+                                                           self.labels)
+                    installed.append((ticker, locator, formatter))
+        return installed
+
+    def Uninstall(self, installed):
+        """
+        Puts back the locators and formatters replaced by C{Install}.
+        """
+        for ticker, locator, formatter in installed:
+            ticker.locator, ticker.formatter = locator, formatter
+
+    def InstallRenderer(self, renderer):
+        """
+        Makes C{renderer} look up text extents in the cache.  The renderer
+        keeps using the cache until it is discarded.
+        """
+        if getattr(renderer, "layoutCache", None) is self:
+            return
+
+        measure = renderer.get_text_width_height_descent
+        def get_text_width_height_descent(s, prop, ismath=False):
+            if not self.enabled:
+                return measure(s, prop, ismath)
+
+            key = (s, ismath, renderer.dpi,
+                   tuple(prop.get_family()), prop.get_style(),
+                   prop.get_variant(), prop.get_weight(), prop.get_stretch(),
+                   prop.get_size_in_points(), prop.get_file())
+            extent = self.extents.get(key)
+            if extent is None:
+                extent = measure(s, prop, ismath)
+                self.extents.put(key, extent)
+            return extent
+
+        renderer.get_text_width_height_descent = get_text_width_height_descent
+        renderer.layoutCache = self
@@ -0,0 +1,382 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+from   RangeMinMax import RangeMinMax
+import math
+import weakref
+import numpy
+
+# Indexes are built lazily, once per line, and dropped with the line.
+_indexes = weakref.WeakKeyDictionary()
+
+def get_line_index(line):
+    """
+    Returns the C{LineIndex} for the matplotlib C{line}.  A new index is
+    built the first time a line is seen and whenever its data has been
+    replaced with C{set_data}, C{set_xdata} or C{set_ydata}.
+    """
+    xdata = line.get_xdata(orig=True)
+    ydata = line.get_ydata(orig=True)
+
+    index = _indexes.get(line)
+    if index is None or not index.IsCurrent(xdata, ydata):
+        index = LineIndex(xdata, ydata)
+        _indexes[line] = index
+    return index
+
+def invalidate_line_index(line):
+    """
+    Discards the index of C{line}.  Use this after modifying the data
+    arrays of a line in place, which C{get_line_index} cannot detect.
+    """
+    if line in _indexes:
+        del _indexes[line]
+
+def fit_y(axes, margin=0.05):
+    """
+    Sets the Y limits of C{axes} to the range of its visible line data
+    within its current X limits, padded by C{margin} of that range on
+    each side.  Every line has a range-min/max index, so this costs
+    O(log n) per line however much data is visible.  The limits are left
+    alone if no line has finite data in view.
+    """
+    xmin, xmax = axes.get_xlim()
+    log = axes.get_yscale() == 'log'
+    ymin = ymax = None
+    for line in axes.lines:
+        if not line.get_visible(): continue
+
+        lower, upper = get_line_index(line).yrange(xmin, xmax)
+        if log and not upper > 0: continue
+        if not (numpy.isfinite(lower) and numpy.isfinite(upper)):
+            continue
+
+        ymin = lower if ymin is None else min(ymin, lower)
+        ymax = upper if ymax is None else max(ymax, upper)
+
+    if ymin is None: return
+
+    if log:
+        if ymin <= 0:
+            ymin = ymax * 1e-3
+        pad = (ymax / ymin) ** margin
+        ymin, ymax = ymin / pad, ymax * pad
+    else:
+        pad = (ymax - ymin) * margin or abs(ymax) * margin or 1.0
+        ymin, ymax = ymin - pad, ymax + pad
+
+    axes.set_ylim(ymin, ymax)
+
+class LineIndex:
+    """
+    Search structures over the samples of a single line.  Series whose
+    X values are monotonically increasing are searched by bisection;
+    anything else (e.g., scatter plots) is searched through a uniform
+    grid hash.  Range queries over X work on the samples sorted by X,
+    through prefix sums and a C{RangeMinMax} pyramid.  All structures
+    are built on first use.
+    """
+
+    def __init__(self, xdata, ydata):
+        self.xsource = xdata
+        self.ysource = ydata
+
+        self.x = numpy.asarray(xdata, dtype = numpy.float64).ravel()
+        self.y = numpy.asarray(ydata, dtype = numpy.float64).ravel()
+
+        n = min(len(self.x), len(self.y))
+        self.x = self.x[:n]
+        self.y = self.y[:n]
+
+        # Comparisons with NaN are false, so NaNs force the grid search.
+        self.monotonic = bool(numpy.all(self.x[1:] >= self.x[:-1])
+                          and numpy.all(numpy.isfinite(self.x[:1])))
+        self.grid      = None
+        self.sorted    = None
+        self.sums      = None
+        self.extrema   = None
+
+    def __len__(self):
+        return len(self.x)
+
+    def IsCurrent(self, xdata, ydata):
+        """
+        Returns a boolean indicating if this index was built from the
+        given data sequences.
+        """
+        return xdata is self.xsource and ydata is self.ysource
+
+    def IsMonotonic(self):
+        """
+        Returns a boolean indicating if the X values never decrease.
+        """
+        return self.monotonic
+
+    def nearest(self, xdata, ydata, xscale = 1.0, yscale = 1.0):
+        """
+        Returns the index of the sample nearest to C{(xdata, ydata)}, or
+        C{None} if the line has no finite samples.  C{xscale} and
+        C{yscale} convert data units into pixels, so that for scatter
+        plots the distance is measured the way the user sees it.
+        Monotonic series return the sample closest in X, i.e. the sample
+        under the cursor.
+        """
+        if len(self) == 0:
+            return None
+
+        if self.monotonic:
+            return self._nearest_sorted(xdata)
+
+        if self.grid is None:
+            self.grid = _GridHash(self.x, self.y)
+        return self.grid.nearest(xdata, ydata, abs(xscale), abs(yscale))
+
+    def _nearest_sorted(self, xdata):
+        i = int(numpy.searchsorted(self.x, xdata))
+        if i <= 0:
+            return 0
+        if i >= len(self.x):
+            return len(self.x) - 1
+        if xdata - self.x[i - 1] <= self.x[i] - xdata:
+            return i - 1
+        return i
+
+    def _get_sorted(self):
+        "Returns the X and Y values ordered by X, NaN X values last."
+        if self.sorted is None:
+            if self.monotonic:
+                self.sorted = (self.x, self.y)
+            else:
+                order = numpy.argsort(self.x, kind = 'mergesort')
+                self.sorted = (self.x[order], self.y[order])
+        return self.sorted
+
+    def _get_sums(self):
+        """
+        Returns the prefix sums of the finite Y values, of their squares
+        and, if some are not finite, of their count.
+        """
+        if self.sums is None:
+            x, y = self._get_sorted()
+            finite = numpy.isfinite(y)
+            if finite.all():
+                values, counts = y, None
+            else:
+                values = numpy.where(finite, y, 0.0)
+                counts = numpy.concatenate(([0], numpy.cumsum(finite)))
+            self.sums = (numpy.concatenate(([0.0], numpy.cumsum(values))),
+                         numpy.concatenate(([0.0], numpy.cumsum(values**2))),
+                         counts)
+        return self.sums
+
+    def _get_extrema(self):
+        if self.extrema is None:
+            self.extrema = RangeMinMax(self._get_sorted()[1])
+        return self.extrema
+
+    def span(self, xmin, xmax):
+        """
+        Returns the half-open range C{(lo, hi)} of positions, in X order,
+        of the samples with C{xmin <= x <= xmax}.
+        """
+        x = self._get_sorted()[0]
+        return (int(numpy.searchsorted(x, xmin, 'left')),
+                int(numpy.searchsorted(x, xmax, 'right')))
+
+    def yrange(self, xmin, xmax):
+        """
+        Returns the minimum and maximum of the Y values whose X value lies
+        in C{[xmin, xmax]} in O(log n), or a 2-tuple of NaNs if there are
+        none.
+        """
+        lo, hi = self.span(min(xmin, xmax), max(xmin, xmax))
+        return self._get_extrema().query(lo, hi)
+
+    def envelope(self, xmin, xmax, bins):
+        """
+        Returns X and Y arrays that trace the minimum and maximum of the
+        samples in C{[xmin, xmax]} over about C{bins} consecutive groups,
+        two points per group, so that a series of any length can be drawn
+        at screen resolution.  The groups are read from the coarsest
+        C{RangeMinMax} level that is still finer than a group, so the
+        cost depends on C{bins} rather than on the number of samples.
+        Ranges with few samples are returned as they are.  Only sorted
+        series are reduced; other lines are evenly strided, in their
+        original order, over all of their samples.
+        """
+        x, y = self._get_sorted()
+        lo, hi = self.span(min(xmin, xmax), max(xmin, xmax))
+        lo, hi = max(0, lo - 1), min(len(x), hi + 1)
+        bins = max(1, int(bins))
+        if hi - lo <= 2 * bins:
+            return x[lo:hi], y[lo:hi]
+
+        if not self.monotonic:
+            stride = max(1, len(x) // (2 * bins))
+            return self.x[::stride], self.y[::stride]
+
+        extrema = self._get_extrema()
+        step  = (hi - lo) // bins
+        level = 0
+        while level + 1 < extrema.levels() and \
+              extrema.fanout ** (level + 1) <= step:
+            level += 1
+        size = extrema.fanout ** level
+
+        mins, maxs = extrema.level(level)
+        first, last = lo // size, -(-hi // size)
+        groups = numpy.arange(0, last - first, max(1, (last - first) // bins))
+
+        xs = x[numpy.minimum((first + groups) * size, len(x) - 1)]
+        ys = numpy.empty(2 * len(groups))
+        ys[0::2] = numpy.fmin.reduceat(mins[first:last], groups)
+        ys[1::2] = numpy.fmax.reduceat(maxs[first:last], groups)
+        return numpy.repeat(xs, 2), ys
+
+    def select(self, xmin, xmax):
+        """
+        Returns the X and Y values of the samples whose X value lies in
+        C{[xmin, xmax]}, in their original order.  For series sorted by X
+        these are views of the data, not copies.
+        """
+        xmin, xmax = min(xmin, xmax), max(xmin, xmax)
+        if self.monotonic:
+            lo, hi = self.span(xmin, xmax)
+            return self.x[lo:hi], self.y[lo:hi]
+        inside = (self.x >= xmin) & (self.x <= xmax)
+        return self.x[inside], self.y[inside]
+
+    def statistics(self, xmin, xmax):
+        """
+        Returns a dictionary with the C{count}, C{sum}, C{mean}, C{rms},
+        C{min} and C{max} of the finite Y values whose X value lies in
+        C{[xmin, xmax]}.  Each query costs O(log n), whatever the size
+        of the range.  Empty ranges report NaN for everything but the
+        count and sum.
+        """
+        lo, hi = self.span(min(xmin, xmax), max(xmin, xmax))
+        hi = max(lo, hi)
+
+        sums, squares, counts = self._get_sums()
+        if counts is None:
+            count = hi - lo
+        else:
+            count = int(counts[hi] - counts[lo])
+        total = sums[hi] - sums[lo]
+
+        stats = { 'count' : count
+                , 'sum'   : total
+                , 'mean'  : numpy.nan
+                , 'rms'   : numpy.nan
+                , 'min'   : numpy.nan
+                , 'max'   : numpy.nan
+                }
+        if count > 0:
+            stats['mean'] = total / count
+            stats['rms']  = math.sqrt(max(0.0, squares[hi] - squares[lo]) / count)
+            stats['min'], stats['max'] = self._get_extrema().query(lo, hi)
+        return stats
+
+class _GridHash:
+    """
+    Buckets finite samples into a uniform grid over their bounding box.
+    Points are sorted by cell so that each cell is a contiguous slice of
+    C{order}, delimited by C{starts}.
+    """
+
+    POINTS_PER_CELL = 8
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+        finite = numpy.flatnonzero(numpy.isfinite(x) & numpy.isfinite(y))
+        self.size = len(finite)
+        if self.size == 0:
+            return
+
+        fx = x[finite]
+        fy = y[finite]
+        self.xmin, self.xmax = fx.min(), fx.max()
+        self.ymin, self.ymax = fy.min(), fy.max()
+
+        self.cells = max(1, int(math.sqrt(self.size / self.POINTS_PER_CELL)))
+        self.cellw = (self.xmax - self.xmin) / self.cells or 1.0
+        self.cellh = (self.ymax - self.ymin) / self.cells or 1.0
+
+        keys  = self._cell(fx, self.xmin, self.cellw) * self.cells \
+              + self._cell(fy, self.ymin, self.cellh)
+        order = numpy.argsort(keys)
+
+        self.order  = finite[order]
+        self.starts = numpy.searchsorted(keys[order],
+                                         numpy.arange(self.cells**2 + 1))
+
+    def _cell(self, values, origin, width):
+        cells = numpy.floor((values - origin) / width).astype(numpy.int64)
+        return numpy.clip(cells, 0, self.cells - 1)
+
+    def _members(self, i, j):
+        k = i * self.cells + j
+        return self.order[self.starts[k]:self.starts[k + 1]]
+
+    def nearest(self, xdata, ydata, xscale, yscale):
+        """
+        Searches rings of cells around the cell containing the query
+        point until no unsearched cell can hold a closer sample.
+        """
+        if self.size == 0:
+            return None
+
+        ci = int(self._cell(numpy.array([xdata]), self.xmin, self.cellw)[0])
+        cj = int(self._cell(numpy.array([ydata]), self.ymin, self.cellh)[0])
+        step = min(self.cellw * xscale, self.cellh * yscale)
+
+        best, bestDistance = None, None
+        for ring in range(self.cells):
+            members = [self._members(i, j)
+                       for i, j in self._ring(ci, cj, ring)]
+            members = [m for m in members if len(m)]
+            if members:
+                candidates = numpy.concatenate(members)
+                distance = ((self.x[candidates] - xdata) * xscale)**2 \
+                         + ((self.y[candidates] - ydata) * yscale)**2
+                k = int(distance.argmin())
+                if bestDistance is None or distance[k] < bestDistance:
+                    best, bestDistance = int(candidates[k]), distance[k]
+
+            # Every cell in the next ring is at least ring cells away.
+            if bestDistance is not None and bestDistance <= (ring * step)**2:
+                break
+
+        return best
+
+    def _ring(self, ci, cj, ring):
+        "Yields the in-range cells at Chebyshev distance C{ring}."
+        if ring == 0:
+            yield ci, cj
+            return
+
+        lo, hi = 0, self.cells - 1
+        for i in range(max(lo, ci - ring), min(hi, ci + ring) + 1):
+            for j in (cj - ring, cj + ring):
+                if lo <= j <= hi:
+                    yield i, j
+        for j in range(max(lo, cj - ring + 1), min(hi, cj + ring - 1) + 1):
+            for i in (ci - ring, ci + ring):
+                if lo <= i <= hi:
+                    yield i, j
@@ -0,0 +1,65 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+from   matplotlib.lines import Line2D
+
+class OutOfCoreLine(Line2D):
+    """
+    Draws an C{OutOfCoreSeries}.  Before every draw in which the view or
+    the width of the axes changed, the line takes the envelope of the
+    visible range from the series, so only the pyramid entries, or the
+    raw samples, in view are ever read.
+    """
+
+    def __init__(self, series, resolution=1.0, **kwds):
+        # Start with a coarse outline of the whole series, which also
+        # gives the axes its data limits.
+        xmin, xmax, ymin, ymax = series.GetDataLimits()
+        Line2D.__init__(self, *series.envelope(xmin, xmax, 1024), **kwds)
+        self.series     = series
+        self.resolution = resolution # envelope groups per axes pixel
+        self.key        = None
+
+    def GetSeries(self):
+        """
+        Returns the series drawn.
+        """
+        return self.series
+
+    def GetDataLimits(self):
+        """
+        Returns the minimum and maximum X, and the minimum and maximum Y,
+        of the whole series.
+        """
+        return self.series.GetDataLimits()
+
+    def Update(self):
+        """
+        Reads the visible range from the series, unless it is current.
+        """
+        xmin, xmax = self.axes.get_xlim()
+        bins = max(1, int(self.axes.bbox.width * self.resolution))
+
+        key = (xmin, xmax, bins)
+        if key == self.key:
+            return
+        self.key = key
+        self.set_data(*self.series.envelope(xmin, xmax, bins))
+
+    def draw(self, renderer, *args, **kwds):
+        self.Update()
+        Line2D.draw(self, renderer, *args, **kwds)
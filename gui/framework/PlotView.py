@@ -22,6 +22,16 @@ from   wxmpl   import FigurePrinter
 from   wxmpl   import FigurePrintout
 from   wxmpl   import LocationPainter
 from   wxmpl   import POSTSCRIPT_PRINTING_COMMAND
+from   LineIndex import get_line_index
+from   LineIndex import fit_y
+from   ArtistCuller        import ArtistCuller
+from   FrameRateGovernor   import FrameRateGovernor
+from   GridLayout          import GridLayout
+from   LayoutCache         import LayoutCache
+from   ProgressiveRenderer import ProgressiveRenderer
+from   ResizeCoalescer     import ResizeCoalescer
+from   TiledExporter       import TiledExporter
+import numpy
 import weakref
 import wx
 import wxmpl
@@ -83,6 +93,16 @@ def get_selected_data(axes, x1, y1, x2, y2):
                            transforms.Bbox([(xmin, ymin), (xmax, ymax)])
                            , axes.transData))
 
+def get_line_label(axes, line):
+    """
+    Returns the label of C{line}, or a name based on its position within
+    C{axes} if the line was not given a label.
+    """
+    label = line.get_label()
+    if label.startswith("_"):
+        label = "line %d" % axes.lines.index(line)
+    return label
+
 class MyAxesLimits(AxesLimits):
     """
     Extended base class to include rezooming capabilities.
@@ -197,7 +217,9 @@ class PanTool:
             movex = (self.getX() - x) / xtick / self.panfactor
             axes.xaxis.pan(movex)
             self.panx += movex
-        if not is_log_y(axes):
+        if self.view.director.IsFitY():
+            self.view.director.FitY(axes)
+        elif not is_log_y(axes):
             ytick = axes.get_yaxis()._get_tick(major=False)._size
             movey = (self.getY() - y) / ytick / self.panfactor
             axes.yaxis.pan(movey)
@@ -206,7 +228,7 @@ class PanTool:
         self.setX(x)
         self.setY(y)
 
-        FigureCanvasWxAgg.draw(self.getView())
+        self.getView().RenderFigure()
 
     def panAll(self, x, y, axesList):
         """
@@ -226,7 +248,9 @@ class PanTool:
                 if i==0:    # we want to keep all plots on a common x-axis
                     xmin, xmax = axes.viewLim.intervalx
                 axes.set_xlim(xmin, xmax)
-            if not is_log_y(axes):
+            if self.view.director.IsFitY():
+                self.view.director.FitY(axes)
+            elif not is_log_y(axes):
                 ytick = axes.get_yaxis()._get_tick(major=False)._size
                 movey = (self.getY() - y) / ytick / self.panfactor
                 axes.yaxis.pan(movey)
@@ -237,7 +261,7 @@ class PanTool:
         self.setX(x)
         self.setY(y)
 
-        FigureCanvasWxAgg.draw(self.getView())
+        self.getView().RenderFigure()
 
     def end_pan(self, x, y, axes):
         """
@@ -254,8 +278,10 @@ class PanTool:
         if not is_log_y(axes):
             axes.yaxis.pan(-self.pany)
             self.pany = 0
+        if self.view.director.IsFitY():
+            self.view.director.FitY(axes)
 
-        FigureCanvasWxAgg.draw(self.getView())
+        self.getView().RenderFigure()
 
     def end_pan_all(self, x, y, axesList):
         """
@@ -275,13 +301,15 @@ class PanTool:
 
             if not is_log_y(axes):
                 axes.yaxis.pan(-self.pany)
+            if self.view.director.IsFitY():
+                self.view.director.FitY(axes)
 
             i += 1
 
         self.panx = 0
         self.pany = 0
 
-        FigureCanvasWxAgg.draw(self.getView())
+        self.getView().RenderFigure()
 
 class MyPlotPanelDirector(PlotPanelDirector):
     """
@@ -295,6 +323,8 @@ class MyPlotPanelDirector(PlotPanelDirector):
         self.infoMode       = not zoom
         self.zoomMode       = zoom
         self.panMode        = False
+        self.statsMode      = False
+        self.fitY           = False
         self.gridMode       = False
         self.activeSubplot  = None
         self.selectedAxes   = None
@@ -330,6 +360,9 @@ class MyPlotPanelDirector(PlotPanelDirector):
         self.panTool.setX(x)
         self.panTool.setY(y)
 
+        if self.IsPanMode():
+            view.GetGovernor().BeginInteraction()
+
         if self.selectionEnabled and not self.is_polar(axes):
             view.cursor.setCross()
             view.crosshairs.clear()
@@ -372,6 +405,10 @@ class MyPlotPanelDirector(PlotPanelDirector):
 
         view = self.getView()
 
+        # Restore full quality if the frame rate governor lowered it.
+        if view.GetGovernor().EndInteraction():
+            view.RenderFigure()
+
         if self.selectedAxes is None:
             axes, xdata, ydata = self.find_axes(view, x, y)
         else:
@@ -383,7 +420,7 @@ class MyPlotPanelDirector(PlotPanelDirector):
         self.end_y         = y
 
         if self.IsInfoMode() and axes is not None:
-            self.SelectAxes(axes)
+            self.SelectAxes(axes, x, y)
 
         x0, y0 = self.leftButtonPoint
         self.leftButtonPoint = None
@@ -404,10 +441,17 @@ class MyPlotPanelDirector(PlotPanelDirector):
             xdata, ydata = axes.transData.inverted().transform((x,y))
             if self.zoomEnabled:
                 for ax in self.find_all_axes(view, x, y):
+                    multiples = getattr(ax, "smallMultiples", None)
+                    if multiples is not None:
+                        if multiples.Zoom(x0, y0, x, y):
+                            view.RenderFigure()
+                        continue
                     xrange, yrange = get_selected_data(ax, x0, y0, x, y)
                     if xrange is not None and yrange is not None:
                         if self.limits.set(ax, xrange, yrange):
-                            FigureCanvasWxAgg.draw(view)
+                            if self.IsFitY():
+                                self.FitY(ax)
+                            view.RenderFigure()
             else:
                 self.getView().notify_selection(axes, x0, y0, x, y)
 
@@ -423,17 +467,31 @@ class MyPlotPanelDirector(PlotPanelDirector):
         if len(self.find_all_axes(self.view, x, y)) > 1:
             self.UpdateLocationStr(x, y)
 
-    def SelectAxes(self, axes):
+    def selectionMouseMotion(self, evt, x, y, axes, xdata, ydata):
         """
-        Make selected subplot the only one shown.
+        Extends the base class to update the selection statistics while
+        the rubber band is dragged.
         """
-        for a in self.getView().GetAxes():
-            if a == axes:
-                a.set_position([0.125, 0.1, 0.8, 0.8]) # TBF: magic numbers
-                self.selectedAxes = a
-            else:
-                a.set_visible(False)
-        FigureCanvasWxAgg.draw(self.getView())
+        PlotPanelDirector.selectionMouseMotion(self, evt, x, y, axes
+                                                    , xdata, ydata)
+        if self.IsStatsMode() and axes is not None:
+            x0, y0 = self.leftButtonPoint
+            self.getView().UpdateStatistics(axes, x0, y0, x, y)
+
+    def SelectAxes(self, axes, x=None, y=None):
+        """
+        Make selected subplot the only one shown.  For small multiples, the
+        panel at C{x}, C{y} is also shown on its own.
+        """
+        view = self.getView()
+        multiples = getattr(axes, "smallMultiples", None)
+        if multiples is not None and x is not None:
+            found = multiples.PanelAt(x, y)
+            if found is not None:
+                multiples.Focus(found[0])
+        view.GetGridLayout().Focus(view.get_figure(), axes)
+        self.selectedAxes = axes
+        view.RenderFigure()
 
     def rightButtonUp(self, evt, x, y):
         """
@@ -452,6 +510,10 @@ class MyPlotPanelDirector(PlotPanelDirector):
         if self.zoomEnabled and self.rightClickUnzoom:
             xmin = xmax = None
             for axes in self.find_all_axes(view, x, y): # unzoom all axes
+                multiples = getattr(axes, "smallMultiples", None)
+                if multiples is not None:
+                    multiples.Unzoom()
+                    continue
                 self.limits.restore(axes)
                 if not self.limits.can_unzoom(axes):
                     if xmin is None or xmax is None: # make sure x-axis matches
@@ -463,7 +525,7 @@ class MyPlotPanelDirector(PlotPanelDirector):
 
         if self.IsInfoMode() and axes is not None:
             self.DisplayAllSubplots()
-            FigureCanvasWxAgg.draw(view)
+            view.RenderFigure()
 
         if self.IsPanMode() and axes is not None:
             self.panTool.end_pan_all(x, y, self.find_all_axes(view, x, y))
@@ -527,18 +589,23 @@ class MyPlotPanelDirector(PlotPanelDirector):
         retval = True
         for a in self.getView().GetAxes():
             retval &= a.get_visible()
+            multiples = getattr(a, "smallMultiples", None)
+            if multiples is not None:
+                retval &= multiples.GetFocus() is None
         return not retval
         
     def DisplayAllSubplots(self): 
         """
         Displays all subplots.  This is used to "unselect" a subplot.
         """
-        for a in self.getView().GetAxes():
-            if a == self.getActiveSubplot():
-                a.set_position(a._originalPosition)
-                self.selectedAxes = None
-            a.set_visible(True)
-        self.getView().draw()
+        view = self.getView()
+        for axes in view.GetAxes():
+            multiples = getattr(axes, "smallMultiples", None)
+            if multiples is not None and multiples.GetFocus() is not None:
+                multiples.Unfocus()
+        view.GetGridLayout().Unfocus(view.get_figure(), self.getActiveSubplot())
+        self.selectedAxes = None
+        view.draw()
 
     def SetInfoMode(self):
         """
@@ -554,9 +621,10 @@ class MyPlotPanelDirector(PlotPanelDirector):
 
         self.panTool.setEnabled(False)
 
-        self.infoMode = True
-        self.zoomMode = False
-        self.panMode  = False
+        self.infoMode  = True
+        self.zoomMode  = False
+        self.panMode   = False
+        self.statsMode = False
 
     def SetZoomMode(self):
         """
@@ -571,9 +639,10 @@ class MyPlotPanelDirector(PlotPanelDirector):
 
         self.panTool.setEnabled(False)
 
-        self.zoomMode = True
-        self.infoMode = False
-        self.panMode  = False
+        self.zoomMode  = True
+        self.infoMode  = False
+        self.panMode   = False
+        self.statsMode = False
 
     def SetPanMode(self):
         """
@@ -589,9 +658,29 @@ class MyPlotPanelDirector(PlotPanelDirector):
 
         self.panTool.setEnabled(True)
 
-        self.infoMode = False
-        self.zoomMode = False
-        self.panMode  = True
+        self.infoMode  = False
+        self.zoomMode  = False
+        self.panMode   = True
+        self.statsMode = False
+
+    def SetStatsMode(self):
+        """
+        In statistics mode, the user can drag out a range of one subplot to
+        get statistics on the data of every line in that range.
+        """
+        view = self.getView()
+        view.set_zoom(False)
+        view.set_selection(True)
+        view.set_crosshairs(True)
+        view.cursor.setEnabled(True)
+        view.cursor.setCross()
+
+        self.panTool.setEnabled(False)
+
+        self.infoMode  = False
+        self.zoomMode  = False
+        self.panMode   = False
+        self.statsMode = True
 
     def SetGridMode(self, setting=None):
         """
@@ -633,12 +722,43 @@ class MyPlotPanelDirector(PlotPanelDirector):
         """
         return self.panMode
 
+    def IsStatsMode(self):
+        """
+        Returns a boolean indicating if the statistics tool is selected.
+        """
+        return self.statsMode
+
     def IsGridMode(self):
         """
         Returns a boolean indicating if the grid is on.
         """
         return self.gridMode
 
+    def SetFitY(self, setting=None):
+        """
+        Turns fitting the Y axis to the visible X range on or off after
+        zooming and panning, or toggles it if no setting is given.
+        """
+        if setting is None:
+            self.fitY = not self.fitY
+        else:
+            self.fitY = setting
+
+    def IsFitY(self):
+        """
+        Returns a boolean indicating if the Y axis is fitted to the visible
+        X range after zooming and panning.
+        """
+        return self.fitY
+
+    def FitY(self, axes, margin=0.05):
+        """
+        Sets the Y limits of C{axes} to the range of the line data within
+        its current X limits, padded by C{margin} of that range on each
+        side.
+        """
+        fit_y(axes, margin)
+
     def ZoomIn(self):
         """
         Window to rezoom functionality.
@@ -672,6 +792,21 @@ class PlotView(PlotPanel):
         self.director = MyPlotPanelDirector(self, zoom, selection) 
         self.director.SetInfoMode()
 
+        # The last range selected with the statistics tool.
+        self.selection  = None
+        self.statistics = []
+
+        self.culler      = ArtistCuller()
+        self.layoutCache = LayoutCache()
+        self.gridLayout  = GridLayout()
+        self.progressive = ProgressiveRenderer(self)
+        self.governor    = FrameRateGovernor(self)
+        self.governor.LoadSettings(wx.GetApp())
+
+        # Live resizing shows the last frame stretched, and renders once
+        # the size has settled for 200 milliseconds.
+        self.resizer = ResizeCoalescer(self, 200)
+
         self.InitPrinter()
 
         # Need to set this member variable so that this figure can be used
@@ -711,6 +846,12 @@ class PlotView(PlotPanel):
         """
         return self.director.IsPanMode()
 
+    def IsStatsMode(self):
+        """
+        Returns a boolean indicating if the statistics tool is selected.
+        """
+        return self.director.IsStatsMode()
+
     def IsGridMode(self):
         """
         Returns a boolean indicating if the grid is on.
@@ -735,18 +876,260 @@ class PlotView(PlotPanel):
         """
         self.director.SetPanMode()
 
+    def SetStatsMode(self):
+        """
+        Enables the statistics tool.
+        """
+        self.director.SetStatsMode()
+
     def SetGridMode(self):
         """
         Toggles the grid.
         """
         self.director.SetGridMode()
 
+    def SetFitY(self, setting=None):
+        """
+        Turns fitting the Y axis to the visible X range on or off, or
+        toggles it if no setting is given.
+        """
+        self.director.SetFitY(setting)
+
+    def IsFitY(self):
+        """
+        Returns a boolean indicating if the Y axis is fitted to the visible
+        X range after zooming and panning.
+        """
+        return self.director.IsFitY()
+
     def GetAxes(self):
         """
         Returns a list of all the subplots contained in the figure object.
         """
         return self.get_figure().get_axes()
 
+    def draw(self, **kwds):
+        """
+        Override base class functionality to render figures with very many
+        points progressively.
+        """
+        draw = lambda: self.progressive.Draw(
+            lambda: self.CullAndDraw(PlotPanel.draw, **kwds),
+            lambda: self.CullAndDraw(PlotPanel.draw))
+        draw()
+
+        # Tick labels are only known once drawn, so a tight layout is
+        # checked afterwards and the figure drawn again if panels moved.
+        if self.gridLayout.IsTight() and self.ApplyLayout():
+            draw()
+
+    def RenderFigure(self):
+        """
+        Renders the figure even while a mouse button is down, as the
+        interactive tools require, without redrawing the decorations.
+        During an interaction the frame rate governor sets the quality.
+        """
+        draw = lambda: self.CullAndDraw(FigureCanvasWxAgg.draw)
+        if self.governor.IsInteracting():
+            self.progressive.Abandon()
+            self.governor.Draw(draw)
+        else:
+            self.progressive.Draw(draw)
+
+    def CullAndDraw(self, draw, **kwds):
+        """
+        Calls the unbound drawing method C{draw} on this view with the
+        artists that lie outside the view hidden, and with ticks and text
+        laid out from the layout cache.
+        """
+        figure = self.get_figure()
+        hidden = self.culler.Cull(figure)
+        installed = self.layoutCache.Install(figure, self.get_renderer())
+        try:
+            draw(self, **kwds)
+        finally:
+            self.layoutCache.Uninstall(installed)
+            self.culler.Restore(hidden)
+
+    def GetAxesLimits(self):
+        """
+        Returns the object holding the zoom history of every subplot.
+        """
+        return self.director.limits
+
+    def GetCuller(self):
+        """
+        Returns the object that skips artists outside the view.
+        """
+        return self.culler
+
+    def GetLayoutCache(self):
+        """
+        Returns the cache of tick locations, tick labels and text extents.
+        """
+        return self.layoutCache
+
+    def GetGridLayout(self):
+        """
+        Returns the object that positions the panels of subplot grids.
+        """
+        return self.gridLayout
+
+    def SetTightLayout(self, state):
+        """
+        Enable or disable sizing the gaps between subplots to their labels.
+        Subplots moved with C{set_position} keep their positions.
+        """
+        self.gridLayout.SetTight(state)
+        if not state:
+            self.ApplyLayout()
+
+    def ApplyLayout(self):
+        """
+        Places the subplots according to the grid layout.  Returns a
+        boolean indicating if any of them moved.
+        """
+        return self.gridLayout.Apply(self.get_figure(), self.get_renderer(),
+                                     self.director.selectedAxes)
+
+    def GetGovernor(self):
+        """
+        Returns the frame rate governor used by the interactive tools.
+        """
+        return self.governor
+
+    def _onSize(self, evt):
+        """
+        Override base class functionality to avoid rendering the figure at
+        every intermediate size while the window or splitter is dragged.
+        """
+        size = tuple(self.GetClientSize())
+        if not self.resizer.SetSize(size):
+            return
+
+        previous = getattr(self, "bitmap", None)
+        stretch  = previous is not None and previous.Ok() and \
+                   self._isDrawn and min(size) > 1
+
+        # Updates the figure size and starts a new, blank, bitmap.
+        FigureCanvasWxAgg._onSize(self, evt)
+        if not stretch:
+            return
+
+        self.progressive.Abandon()
+        image = previous.ConvertToImage().Scale(size[0], size[1])
+        self.bitmap   = wx.BitmapFromImage(image)
+        self._isDrawn = True
+        self.resizer.Defer()
+
+    def GetProgressiveRenderer(self):
+        """
+        Returns the object controlling coarse-to-fine rendering.
+        """
+        return self.progressive
+
+    def notify_point(self, axes, x, y):
+        """
+        Override base class functionality to show the data sample nearest
+        to the point clicked in the location readout.
+        """
+        PlotPanel.notify_point(self, axes, x, y)
+
+        sample = self.FindNearestSample(axes, x, y)
+        if sample is not None:
+            line, index, xdata, ydata = sample
+            self.location.set("x=%s, y=%s\n%s [%d]" % (
+                              axes.format_xdata(xdata).replace("\n", " ")
+                            , axes.format_ydata(ydata).replace("\n", " ")
+                            , get_line_label(axes, line), index))
+
+    def notify_selection(self, axes, x1, y1, x2, y2):
+        """
+        Override base class functionality to report the statistics of the
+        selected range when the statistics tool is selected.
+        """
+        PlotPanel.notify_selection(self, axes, x1, y1, x2, y2)
+        if self.IsStatsMode():
+            self.UpdateStatistics(axes, x1, y1, x2, y2)
+
+    def UpdateStatistics(self, axes, x1, y1, x2, y2):
+        """
+        Computes the statistics of every line of C{axes} over the X range
+        of the canvas area from C{(x1, y1)} to C{(x2, y2)} and shows them
+        in the location readout.
+        """
+        xrange, yrange = get_selected_data(axes, x1, y1, x2, y2)
+        if xrange is None: return
+
+        self.selection  = (axes, xrange[0], xrange[1])
+        self.statistics = self.GetStatistics(axes, xrange[0], xrange[1])
+
+        lines = []
+        for label, stats in self.statistics:
+            lines.append("%s: n=%d mean=%.6g rms=%.6g min=%.6g max=%.6g sum=%.6g"
+                         % (label, stats['count'], stats['mean'], stats['rms']
+                          , stats['min'], stats['max'], stats['sum']))
+        self.location.set("\n".join(lines))
+
+    def GetStatistics(self, axes, xmin, xmax):
+        """
+        Returns a list of 2-tuples of line label and statistics dictionary
+        (see C{LineIndex.statistics}) for every line of C{axes}, over the
+        samples with X values between C{xmin} and C{xmax}.
+        """
+        return [(get_line_label(axes, line)
+               , get_line_index(line).statistics(xmin, xmax))
+                for line in axes.lines]
+
+    def GetLineData(self, axes, xmin, xmax):
+        """
+        Returns a list of 3-tuples of line label, X values and Y values for
+        every line of C{axes}, with the samples whose X values are between
+        C{xmin} and C{xmax}.  For lines sorted by X these are views of the
+        data rather than copies.
+        """
+        return [(get_line_label(axes, line),) +
+                get_line_index(line).select(xmin, xmax)
+                for line in axes.lines]
+
+    def GetSelection(self):
+        """
+        Returns the last range selected with the statistics tool as a
+        3-tuple of axes, minimum X and maximum X, or C{None}.
+        """
+        return self.selection
+
+    def FindNearestSample(self, axes, x, y):
+        """
+        Returns the sample of C{axes} nearest to the canvas point C{(x, y)}
+        as a 4-tuple of line, sample index, X value and Y value.  Returns
+        C{None} if the axes has no visible line data.
+        """
+        if axes is None or len(axes.lines) == 0: return None
+
+        xdata, ydata = get_data(axes, x, y)
+        xmin, xmax = axes.viewLim.intervalx
+        ymin, ymax = axes.viewLim.intervaly
+        xscale = axes.bbox.width  / ((xmax - xmin) or 1.0)
+        yscale = axes.bbox.height / ((ymax - ymin) or 1.0)
+
+        best = None
+        for line in axes.lines:
+            if not line.get_visible(): continue
+
+            lineIndex = get_line_index(line)
+            i = lineIndex.nearest(xdata, ydata, xscale, yscale)
+            if i is None: continue
+
+            sx, sy = lineIndex.x[i], lineIndex.y[i]
+            px, py = axes.transData.transform((sx, sy))
+            distance = (px - x)**2 + (py - y)**2
+            if best is None or distance < best[0]:
+                best = (distance, line, i, sx, sy)
+
+        if best is None: return None
+        return best[1:]
+
     def Clear(self):
         """
         Clears the figure object and redraws.
@@ -754,12 +1137,17 @@ class PlotView(PlotPanel):
         self.get_figure().clear()
         self.draw()
 
-    def Export(self, filename):
+    def Export(self, filename, size=None, dpi=None):
         """
-        Saves the contents of the canvas to a file.
+        Saves the contents of the canvas to a file.  Given a C{size} in
+        pixels, the figure is instead drawn at that size into a PNG file,
+        tile by tile, so even very large images take little memory.
         """
         try:
-            self.print_figure(filename)
+            if size is not None:
+                TiledExporter(self.get_figure(), size, dpi).Write(filename)
+            else:
+                self.print_figure(filename)
         except IOError, e:
             if e.strerror:
                 err = e.strerror
@@ -0,0 +1,119 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import os
+import struct
+import zlib
+import numpy
+
+SIGNATURE = "\x89PNG\r\n\x1a\n"
+
+def write_chunk(f, kind, data):
+    "Writes a PNG chunk of type C{kind} holding C{data}."
+    f.write(struct.pack(">I", len(data)))
+    f.write(kind)
+    f.write(data)
+    f.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(kind)) & 0xffffffff))
+
+class PngWriter:
+    """
+    Writes an 8 bit RGBA PNG image a few rows at a time, so an image of
+    any size is written without ever being held whole.  Rows are
+    compressed as they come and written out in chunks of about C{chunk}
+    bytes.  The file is written under a temporary name and renamed once
+    all C{height} rows have been written.
+    """
+
+    def __init__(self, path, width, height, level=6, chunk=1 << 20):
+        self.path   = path
+        self.width  = width
+        self.height = height
+        self.chunk  = chunk
+        self.rows   = 0
+        self.data   = []
+        self.size   = 0
+        self.compressor = zlib.compressobj(level)
+
+        self.f = open(path + ".tmp", "wb")
+        self.f.write(SIGNATURE)
+        write_chunk(self.f, "IHDR", struct.pack(">IIBBBBB", width, height,
+                                                8, 6, 0, 0, 0))
+
+    def GetRows(self):
+        """
+        Returns the number of rows written so far.
+        """
+        return self.rows
+
+    def Flush(self, final=False):
+        "Writes out the compressed data held."
+        if self.size >= self.chunk or final and self.size:
+            write_chunk(self.f, "IDAT", "".join(self.data))
+            self.data, self.size = [], 0
+
+    def Compress(self, data):
+        "Adds C{data} to the compressed stream."
+        data = self.compressor.compress(data)
+        if data:
+            self.data.append(data)
+            self.size += len(data)
+        self.Flush()
+
+    def Write(self, rows):
+        """
+        Appends C{rows}, an array of shape (rows, width, 4) of bytes, to
+        the image, top row first.
+        """
+        rows = numpy.asarray(rows, dtype = numpy.uint8)
+        if rows.ndim != 3 or rows.shape[1:] != (self.width, 4):
+            raise ValueError("Rows must have shape (n, %d, 4), not %s."
+                             % (self.width, rows.shape))
+        if self.rows + len(rows) > self.height:
+            raise ValueError("The image has only %d rows." % self.height)
+
+        # Every row starts with its filter type, none.
+        lines = numpy.zeros((len(rows), 1 + self.width * 4), numpy.uint8)
+        lines[:, 1:] = rows.reshape(len(rows), -1)
+        self.Compress(lines.tostring())
+        self.rows += len(rows)
+
+    def Close(self):
+        """
+        Ends the image and moves it into place.  Fails, leaving no file,
+        unless all the rows have been written.
+        """
+        try:
+            if self.rows != self.height:
+                raise ValueError("Only %d of %d rows were written."
+                                 % (self.rows, self.height))
+            self.data.append(self.compressor.flush())
+            self.size += len(self.data[-1])
+            self.Flush(True)
+            write_chunk(self.f, "IEND", "")
+            self.f.close()
+            os.rename(self.path + ".tmp", self.path)
+        except:
+            self.Abort()
+            raise
+
+    def Abort(self):
+        """
+        Closes and removes the unfinished image.
+        """
+        self.f.close()
+        if os.path.exists(self.path + ".tmp"):
+            os.remove(self.path + ".tmp")
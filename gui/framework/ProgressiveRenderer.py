@@ -0,0 +1,168 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+from   LineIndex        import get_line_index
+from   matplotlib.lines import Line2D
+import time
+import wx
+
+class ProgressiveRenderer:
+    """
+    Renders figures with very many points in two passes.  The first pass
+    draws every large line as a min/max envelope at roughly screen
+    resolution and is shown right away; the full resolution pass follows
+    once the application is idle.  Any new draw request abandons a
+    pending refinement, so a view that keeps changing (e.g., while
+    panning) never pays for full resolution frames.
+
+    matplotlib figures cannot be drawn from another thread while the GUI
+    uses them, so refinement runs from the event loop rather than a
+    worker thread.
+    """
+
+    def __init__(self, view, threshold=1000000, budget=0.1, delay=250):
+        self.view       = view
+        self.threshold  = threshold # points before coarse passes are used
+        self.budget     = budget    # target duration of a coarse pass (s)
+        self.delay      = delay     # idle time before refining (ms)
+        self.resolution = 1.0       # envelope groups per axes pixel
+        self.enabled    = True
+        self.generation = 0
+        self.timer      = None
+
+    def SetEnabled(self, state):
+        """
+        Enable or disable coarse passes.
+        """
+        self.enabled = state
+
+    def IsEnabled(self):
+        """
+        Returns a boolean indicating if coarse passes are enabled.
+        """
+        return self.enabled
+
+    def IsRefining(self):
+        """
+        Returns a boolean indicating if a full resolution pass is pending.
+        """
+        return self.timer is not None
+
+    def CountPoints(self):
+        """
+        Returns the number of samples in all visible lines of the figure.
+        """
+        count = 0
+        for axes in self.view.get_figure().get_axes():
+            if not axes.get_visible(): continue
+            for line in axes.lines:
+                if line.get_visible():
+                    count += len(line.get_xdata(orig=True))
+        return count
+
+    def Draw(self, draw, refine=None):
+        """
+        Renders the figure by calling C{draw}, either directly or as a
+        coarse pass followed by a deferred full resolution call to
+        C{refine}, which defaults to C{draw}.
+        """
+        self.Abandon()
+        if refine is None:
+            refine = draw
+
+        if not self.enabled or self.CountPoints() < self.threshold:
+            draw()
+            return
+
+        start = time.time()
+        self.DrawCoarse(draw)
+        self.Adapt(time.time() - start)
+
+        self.timer = wx.CallLater(self.delay, self.Refine, refine,
+                                  self.generation)
+
+    def Abandon(self):
+        """
+        Cancels any pending full resolution pass.
+        """
+        self.generation += 1
+        if self.timer is not None:
+            self.timer.Stop()
+            self.timer = None
+
+    def Adapt(self, elapsed):
+        """
+        Adjusts the envelope resolution so that coarse passes stay within
+        the latency budget.
+        """
+        if elapsed > self.budget:
+            self.resolution = max(0.125, self.resolution / 2)
+        elif elapsed < self.budget / 2:
+            self.resolution = min(1.0, self.resolution * 2)
+
+    def DrawCoarse(self, draw, resolution=None):
+        """
+        Calls C{draw} with every line longer than a few points per pixel
+        temporarily replaced by a stand-in holding its envelope.  The
+        original lines, and the data cached inside them, are untouched.
+        """
+        if resolution is None:
+            resolution = self.resolution
+
+        replaced = []
+        for axes in self.view.get_figure().get_axes():
+            if not axes.get_visible(): continue
+
+            bins = max(1, int(axes.bbox.width * resolution))
+            xmin, xmax = axes.get_xlim()
+            for line in axes.lines[:]:
+                if not line.get_visible() or \
+                   len(line.get_xdata(orig=True)) <= 4 * bins:
+                    continue
+
+                x, y = get_line_index(line).envelope(xmin, xmax, bins)
+                standIn = Line2D(x, y)
+                standIn.update_from(line)
+                standIn.set_figure(line.figure)
+                standIn.axes = axes
+
+                line.set_visible(False)
+                axes.lines.append(standIn)
+                replaced.append((axes, line, standIn))
+
+        try:
+            draw()
+        finally:
+            for axes, line, standIn in replaced:
+                axes.lines.remove(standIn)
+                line.set_visible(True)
+
+    def Refine(self, draw, generation):
+        """
+        Performs the full resolution pass requested by C{Draw}, unless the
+        view has changed since.  The pass waits while user events are
+        pending.
+        """
+        if generation != self.generation:
+            return
+
+        if wx.GetApp().Pending():
+            self.timer.Restart(self.delay)
+            return
+
+        self.timer = None
+        draw()
@@ -0,0 +1,95 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import numpy
+
+class RangeMinMax:
+    """
+    Answers minimum/maximum queries over arbitrary index ranges of a
+    sequence in O(log n).  The values are reduced into a pyramid in which
+    every level holds the minima and maxima of C{fanout} consecutive
+    entries of the level below, so a query only touches the partial
+    blocks at either end of the range on each level.  The pyramid costs
+    about 2/(fanout - 1) times the size of the data.  NaNs are ignored.
+    """
+
+    FANOUT = 16
+
+    def __init__(self, values, fanout = FANOUT):
+        self.fanout = fanout
+
+        values = numpy.asarray(values, dtype = numpy.float64).ravel()
+        self.mins = [values]
+        self.maxs = [values]
+        while len(self.mins[-1]) > fanout:
+            self.mins.append(self._reduce(self.mins[-1], numpy.fmin))
+            self.maxs.append(self._reduce(self.maxs[-1], numpy.fmax))
+
+    def __len__(self):
+        return len(self.mins[0])
+
+    def _reduce(self, values, ufunc):
+        pad = -len(values) % self.fanout
+        if pad:
+            values = numpy.concatenate((values, numpy.repeat(numpy.nan, pad)))
+        return ufunc.reduce(values.reshape(-1, self.fanout), axis = 1)
+
+    def levels(self):
+        """
+        Returns the number of levels in the pyramid, the data included.
+        """
+        return len(self.mins)
+
+    def level(self, n):
+        """
+        Returns the minima and maxima arrays of level C{n}; entry C{i}
+        covers the values C{[i * fanout**n, (i + 1) * fanout**n)}.
+        """
+        return self.mins[n], self.maxs[n]
+
+    def query(self, lo, hi):
+        """
+        Returns the minimum and maximum of C{values[lo:hi]} as a 2-tuple.
+        If the range holds no finite values, both are NaN.
+        """
+        lo = max(0, lo)
+        hi = min(len(self), hi)
+
+        found = []
+        level = 0
+        f = self.fanout
+        while lo < hi:
+            if level == len(self.mins) - 1:
+                found.append((lo, hi, level))
+                break
+
+            # Peel off the partial blocks at either end of the range.
+            alignedLo = min(hi, -(-lo // f) * f)
+            alignedHi = max(alignedLo, hi // f * f)
+            if lo < alignedLo:
+                found.append((lo, alignedLo, level))
+            if alignedHi < hi:
+                found.append((alignedHi, hi, level))
+
+            lo, hi = alignedLo // f, alignedHi // f
+            level += 1
+
+        lower = upper = numpy.nan
+        for start, stop, level in found:
+            lower = numpy.fmin(lower, numpy.fmin.reduce(self.mins[level][start:stop]))
+            upper = numpy.fmax(upper, numpy.fmax.reduce(self.maxs[level][start:stop]))
+        return lower, upper
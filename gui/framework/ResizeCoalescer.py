@@ -0,0 +1,65 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+import wx
+
+class ResizeCoalescer:
+    """
+    Coalesces the size events of a view that is being resized, e.g., while
+    a window or splitter is dragged, into a single full redraw.  The
+    redraw is made once the size has not changed for C{delay}
+    milliseconds; until then the view is expected to show its last frame
+    stretched.
+    """
+
+    def __init__(self, view, delay=200):
+        self.view  = view
+        self.delay = delay
+        self.size  = None
+        self.timer = None
+
+    def SetSize(self, size):
+        """
+        Records the new size of the view.  Returns a boolean indicating if
+        it differs from the last size recorded.
+        """
+        size = tuple(size)
+        if size == self.size:
+            return False
+        self.size = size
+        return True
+
+    def Defer(self):
+        """
+        Schedules the full redraw, postponing it if it is already pending.
+        """
+        if self.timer is None:
+            self.timer = wx.CallLater(self.delay, self.OnResized)
+        else:
+            self.timer.Restart(self.delay)
+
+    def IsPending(self):
+        """
+        Returns a boolean indicating if a full redraw is pending.
+        """
+        return self.timer is not None
+
+    def OnResized(self):
+        """
+        Renders the view at full quality once resizing is over.
+        """
+        self.timer = None
+        self.view.draw()
@@ -0,0 +1,155 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+from   LRUCache import LRUCache
+import threading
+import numpy
+
+def get_nbytes(value, seen=None):
+    """
+    Returns the bytes held by the arrays in C{value}: an array, or a
+    list, tuple or dictionary of those.  Views count as the array they
+    look into, and every array is counted once, however often it is
+    shared.
+    """
+    if seen is None:
+        seen = set()
+    if isinstance(value, numpy.ndarray):
+        while isinstance(value.base, numpy.ndarray):
+            value = value.base
+        if id(value) in seen:
+            return 0
+        seen.add(id(value))
+        return value.nbytes
+    if isinstance(value, dict):
+        value = value.values()
+    if isinstance(value, (list, tuple)):
+        return sum([get_nbytes(item, seen) for item in value])
+    return 0
+
+class ScanPrefetcher:
+    """
+    Steps through a list of scans, keeping the ones loaded in an LRU
+    cache of at most C{maxsize} bytes and loading the next C{ahead} scans
+    on a background thread, in the direction of travel, while the
+    current one is being looked at.  Stepping to a scan already loaded is
+    then immediate.
+
+    C{load(key)} returns the arrays to be kept for a scan, e.g., its
+    decoded spectra, and must be safe to call from another thread.
+    Artists, which belong to one axes, are best built from them when the
+    scan is shown.  If a background load fails, the scan is loaded
+    again when asked for, so the error is raised to the caller.
+    """
+
+    def __init__(self, keys, load, ahead=4, maxsize=256 << 20, weigh=None):
+        self.keys      = list(keys)
+        self.load      = load
+        self.ahead     = ahead
+        self.cache     = LRUCache(maxsize, weigh or get_nbytes)
+        self.condition = threading.Condition()
+        self.wanted    = []     # scans to load, nearest first
+        self.loading   = None   # scan being loaded in the background
+        self.stopped   = False
+
+        self.thread = threading.Thread(target = self.Run)
+        self.thread.setDaemon(True)
+        self.thread.start()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def GetKey(self, index):
+        "Returns the key of scan C{index}."
+        return self.keys[index]
+
+    def GetCache(self):
+        "Returns the cache of scans loaded."
+        return self.cache
+
+    def Get(self, index, direction=1):
+        """
+        Returns scan C{index}, from the cache or loaded now, and starts
+        loading the scans after it, or before it if C{direction} is -1.
+        """
+        self.condition.acquire()
+        try:
+            # A scan being loaded in the background is waited for.
+            while self.loading == index:
+                self.condition.wait()
+            self.wanted = []
+        finally:
+            self.condition.release()
+
+        missing = object()
+        value = self.cache.get(index, missing)
+        if value is missing:
+            value = self.load(self.keys[index])
+            self.cache.put(index, value)
+
+        self.Prefetch(index, direction)
+        return value
+
+    def Prefetch(self, index, direction=1):
+        """
+        Asks for the C{ahead} scans after C{index}, in C{direction}, to
+        be loaded in the background, replacing any asked for before.
+        """
+        wanted = [index + direction * step for step in range(1, self.ahead + 1)]
+        self.condition.acquire()
+        try:
+            self.wanted = [i for i in wanted if 0 <= i < len(self.keys)]
+            self.condition.notify_all()
+        finally:
+            self.condition.release()
+
+    def Run(self):
+        "Loads the scans asked for, until stopped."
+        while True:
+            self.condition.acquire()
+            try:
+                while not self.wanted and not self.stopped:
+                    self.condition.wait()
+                if self.stopped:
+                    return
+                index = self.wanted.pop(0)
+                if index in self.cache:
+                    continue
+                self.loading = index
+            finally:
+                self.condition.release()
+
+            try:
+                value = self.load(self.keys[index])
+                self.cache.put(index, value)
+            except Exception:
+                pass
+
+            self.condition.acquire()
+            self.loading = None
+            self.condition.notify_all()
+            self.condition.release()
+
+    def Stop(self):
+        """
+        Stops loading in the background.
+        """
+        self.condition.acquire()
+        self.stopped = True
+        self.condition.notify_all()
+        self.condition.release()
+        self.thread.join()
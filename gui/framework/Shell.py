@@ -28,10 +28,14 @@ class Shell(py.shell.Shell):
         "Returns a list of command executed.  The newest command is first."
         return self.history
 
-    def SetHistory(self, history):
-        "Sets the command line history. Newest commands first."
+    def SetHistory(self, history, execute=True):
+        """
+        Sets the command line history, oldest commands first, and runs the
+        commands unless C{execute} is False.
+        """
         self.history = history[::-1]
-        self.ExecuteCommands(history)
+        if execute:
+            self.ExecuteCommands(history)
 
     def ExecuteCommands(self, commands):
         """
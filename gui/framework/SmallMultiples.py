@@ -0,0 +1,377 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+from   matplotlib.collections import LineCollection
+import math
+import numpy
+
+# Colors given to successive layers, as matplotlib does for lines.
+COLORS = ['b', 'g', 'r', 'c', 'm', 'y', 'k']
+
+def nice_ticks(vmin, vmax, count=5):
+    """
+    Returns about C{count} round tick locations between C{vmin} and
+    C{vmax}.
+    """
+    if not vmax > vmin:
+        return numpy.array([vmin])
+
+    raw  = (vmax - vmin) / float(count)
+    unit = 10.0 ** math.floor(math.log10(raw))
+    for multiple in (1.0, 2.0, 2.5, 5.0, 10.0):
+        step = multiple * unit
+        if step >= raw: break
+
+    first = math.ceil(vmin / step) * step
+    return numpy.arange(first, vmax + step * 1e-9, step)
+
+def get_panels(data):
+    """
+    Returns C{data}, given as a 3D array of panels, layers and samples, a
+    2D array of panels and samples, or a list of series (or of lists of
+    series), as a list of panels that are lists of 1D arrays.
+    """
+    if isinstance(data, numpy.ndarray):
+        if data.ndim == 2:
+            data = data[:, numpy.newaxis, :]
+        elif data.ndim != 3:
+            raise ValueError("Small multiples need a 2D or 3D array.")
+        return [list(panel) for panel in data]
+
+    panels = []
+    for panel in data:
+        # A panel of one series holds numbers; of several, sequences.
+        if len(panel) == 0 or numpy.ndim(panel[0]) == 0:
+            panel = [panel]
+        panels.append([numpy.asarray(layer, dtype = numpy.float64)
+                       for layer in panel])
+    return panels
+
+def get_limits(arrays):
+    "Returns the finite extent of C{arrays}, widened if it is empty."
+    lower, upper = numpy.inf, -numpy.inf
+    for a in arrays:
+        a = a[numpy.isfinite(a)]
+        if len(a):
+            lower, upper = min(lower, a.min()), max(upper, a.max())
+    if lower > upper:
+        return 0.0, 1.0
+    if lower == upper:
+        return lower - 0.5, upper + 0.5
+    return lower, upper
+
+class SmallMultiples:
+    """
+    Draws many panels that share one style (e.g., one per beam and
+    polarization) on a single host axes.  Every layer is one line
+    collection holding a segment per panel, and the frames, tick marks
+    and labels are shared, so the cost of a figure of 64 panels is close
+    to that of one axes with 64 lines.
+
+    The host axes is laid out in grid units, one unit per panel, with the
+    rows running down.  Panels share their data limits; C{PanelAt} maps
+    canvas positions back to a panel and its data coordinates for the
+    interactive tools.
+    """
+
+    def __init__(self, figure, data, x=None, cols=None, titles=None,
+                 sharey=True, gap=0.1, rect=None, **properties):
+        if rect is None:
+            params = figure.subplotpars
+            rect = [params.left, params.bottom,
+                    params.right - params.left, params.top - params.bottom]
+
+        # A unique label keeps matplotlib from handing back the host axes
+        # of other small multiples with the same rectangle.
+        self.axes = figure.add_axes(rect, label = "multiples%d" % id(self))
+        self.axes.set_axis_off()
+        self.axes.smallMultiples = self
+        self.axes.format_coord = self.FormatCoord
+
+        self.gap        = gap
+        self.sharey     = sharey
+        self.titles     = titles
+        self.properties = properties
+        self.focus      = None
+        self.history    = []
+        self.layers     = []
+        self.texts      = []
+
+        self.frames = LineCollection([], colors = 'k', linewidths = 1.0)
+        self.ticks  = LineCollection([], colors = 'k', linewidths = 0.5)
+        self.axes.add_collection(self.frames, autolim = False)
+        self.axes.add_collection(self.ticks,  autolim = False)
+
+        self.SetData(data, x, cols)
+
+    def GetAxes(self):
+        """
+        Returns the host axes.
+        """
+        return self.axes
+
+    def GetPanelCount(self):
+        """
+        Returns the number of panels.
+        """
+        return len(self.panels)
+
+    def SetData(self, data, x=None, cols=None):
+        """
+        Replaces the data shown, and resets the limits to fit it.  C{x} can
+        be omitted (sample numbers are used), one array shared by all
+        panels, or one array per panel.
+        """
+        self.panels = get_panels(data)
+        count = len(self.panels)
+        if count == 0:
+            raise ValueError("Small multiples need at least one panel.")
+
+        if x is None:
+            x = numpy.arange(max([len(l) for p in self.panels for l in p]))
+        if numpy.ndim(x) == 1:
+            self.x = [numpy.asarray(x, dtype = numpy.float64)] * count
+        else:
+            self.x = [numpy.asarray(p, dtype = numpy.float64) for p in x]
+
+        self.cols = cols or int(math.ceil(math.sqrt(count)))
+        self.rows = int(math.ceil(count / float(self.cols)))
+
+        depth = max([len(panel) for panel in self.panels])
+        while len(self.layers) < depth:
+            layer = LineCollection([], colors = COLORS[len(self.layers)
+                                                       % len(COLORS)])
+            layer.update(self.properties)
+            self.axes.add_collection(layer, autolim = False)
+            self.layers.append(layer)
+
+        self.history = []
+        self.limits  = self.GetDataLimits()
+        self.Update()
+
+    def GetDataLimits(self):
+        """
+        Returns the X and Y limits that fit all the data, with the Y limits
+        given per panel if they are not shared.
+        """
+        xlim = get_limits(self.x)
+        if self.sharey:
+            ylim = get_limits([l for p in self.panels for l in p])
+        else:
+            ylim = [get_limits(p) for p in self.panels]
+        return xlim, ylim
+
+    def GetLimits(self, panel=0):
+        """
+        Returns the X and Y limits of C{panel}.
+        """
+        xlim, ylim = self.limits
+        if not self.sharey:
+            ylim = ylim[panel]
+        return xlim, ylim
+
+    def SetLimits(self, xlim=None, ylim=None):
+        """
+        Changes the X and Y limits of all panels, remembering the previous
+        ones for C{Unzoom}.
+        """
+        self.history.append(self.limits)
+        oldx, oldy = self.limits
+        if ylim is not None and not self.sharey:
+            ylim = [ylim] * len(self.panels)
+        self.limits = (xlim or oldx, ylim or oldy)
+        self.Update()
+
+    def Unzoom(self):
+        """
+        Restores the previous limits.  Returns a boolean indicating if
+        there were any.
+        """
+        if not self.history:
+            return False
+        self.limits = self.history.pop()
+        self.Update()
+        return True
+
+    def Focus(self, panel):
+        """
+        Shows C{panel} on its own, filling the host axes.
+        """
+        self.focus = panel
+        self.Update()
+
+    def Unfocus(self):
+        """
+        Shows all panels again.
+        """
+        self.focus = None
+        self.Update()
+
+    def GetFocus(self):
+        """
+        Returns the panel shown on its own, or C{None}.
+        """
+        return self.focus
+
+    def _visible(self):
+        "Returns the visible panels and the shape of the grid they fill."
+        if self.focus is not None:
+            return [self.focus], 1, 1
+        return range(len(self.panels)), self.rows, self.cols
+
+    def _cell(self, slot, cols):
+        "Returns the inner box, in grid units, of grid slot C{slot}."
+        row, col = divmod(slot, cols)
+        return (col + self.gap, row + self.gap,
+                col + 1 - self.gap, row + 1 - self.gap)
+
+    def _to_grid(self, box, xlim, ylim, x, y):
+        "Maps data coordinates to grid units within the cell C{box}."
+        left, top, right, bottom = box
+        gx = left + (x - xlim[0]) / (xlim[1] - xlim[0]) * (right - left)
+        gy = bottom - (y - ylim[0]) / (ylim[1] - ylim[0]) * (bottom - top)
+        return gx, gy
+
+    def Update(self):
+        """
+        Recomputes the segments of every layer, and the frames, ticks and
+        labels, for the current limits and focus.
+        """
+        visible, rows, cols = self._visible()
+        self.axes.set_xlim(0, cols)
+        self.axes.set_ylim(rows, 0)
+
+        segments = [[] for layer in self.layers]
+        frames, ticks = [], []
+        for text in self.texts:
+            self.axes.texts.remove(text)
+        self.texts = []
+
+        for slot, panel in enumerate(visible):
+            box = self._cell(slot, cols)
+            xlim, ylim = self.GetLimits(panel)
+            x = self.x[panel]
+
+            for i, y in enumerate(self.panels[panel]):
+                n = min(len(x), len(y))
+                gx, gy = self._to_grid(box, xlim, ylim, x[:n], y[:n])
+                outside = (x[:n] < xlim[0]) | (x[:n] > xlim[1]) | \
+                          (y[:n] < ylim[0]) | (y[:n] > ylim[1]) | \
+                          ~numpy.isfinite(y[:n])
+                points = numpy.ma.masked_array(numpy.column_stack((gx, gy)))
+                points[outside] = numpy.ma.masked
+                segments[i].append(points)
+
+            left, top, right, bottom = box
+            frames.append([(left, top), (right, top), (right, bottom),
+                           (left, bottom), (left, top)])
+
+            row, col = divmod(slot, cols)
+            size = 0.03
+            for value in nice_ticks(*xlim):
+                gx, gy = self._to_grid(box, xlim, ylim, value, ylim[0])
+                ticks.append([(gx, bottom), (gx, bottom - size)])
+                if row == rows - 1 or slot + cols >= len(visible):
+                    self._label(gx, bottom + size, "%g" % value,
+                                'center', 'top')
+            for value in nice_ticks(*ylim):
+                gx, gy = self._to_grid(box, xlim, ylim, xlim[0], value)
+                ticks.append([(left, gy), (left + size, gy)])
+                if col == 0 or not self.sharey:
+                    self._label(left - size, gy, "%g" % value,
+                                'right', 'center')
+
+            if self.titles is not None:
+                self._label((left + right) / 2, top - size,
+                            str(self.titles[panel]), 'center', 'bottom')
+
+        for layer, lines in zip(self.layers, segments):
+            layer.set_segments(lines)
+        self.frames.set_segments(frames)
+        self.ticks.set_segments(ticks)
+
+    def _label(self, x, y, s, horizontal, vertical):
+        self.texts.append(self.axes.text(x, y, s, fontsize = 'small',
+                                         horizontalalignment = horizontal,
+                                         verticalalignment = vertical,
+                                         clip_on = False))
+
+    def PanelAt(self, x, y):
+        """
+        Returns the panel under the canvas position C{x}, C{y} and the data
+        coordinates of that position within it, or C{None} if the position
+        is not inside a panel.
+        """
+        gx, gy = self.axes.transData.inverted().transform((x, y))
+        return self.PanelAtGrid(gx, gy)
+
+    def PanelAtGrid(self, gx, gy):
+        """
+        Like C{PanelAt}, for a position in grid units.
+        """
+        visible, rows, cols = self._visible()
+        if not (0 <= gx < cols and 0 <= gy < rows):
+            return None
+
+        slot = int(gy) * cols + int(gx)
+        if slot >= len(visible):
+            return None
+
+        left, top, right, bottom = self._cell(slot, cols)
+        if not (left <= gx <= right and top <= gy <= bottom):
+            return None
+
+        panel = visible[slot]
+        xlim, ylim = self.GetLimits(panel)
+        xdata = xlim[0] + (gx - left) / (right - left) * (xlim[1] - xlim[0])
+        ydata = ylim[0] + (bottom - gy) / (bottom - top) * (ylim[1] - ylim[0])
+        return panel, xdata, ydata
+
+    def Zoom(self, x0, y0, x1, y1):
+        """
+        Zooms all panels to the data range of the rectangle between two
+        canvas positions, using the panel under the first.  Returns a
+        boolean indicating if the limits changed.
+        """
+        start = self.PanelAt(x0, y0)
+        if start is None:
+            return False
+
+        panel = start[0]
+        visible, rows, cols = self._visible()
+        left, top, right, bottom = self._cell(visible.index(panel), cols)
+        gx, gy = self.axes.transData.inverted().transform((x1, y1))
+        gx, gy = min(max(gx, left), right), min(max(gy, top), bottom)
+        end = self.PanelAtGrid(gx, gy)
+
+        xrange = sorted((start[1], end[1]))
+        yrange = sorted((start[2], end[2]))
+        if xrange[0] == xrange[1] or yrange[0] == yrange[1]:
+            return False
+        self.SetLimits(tuple(xrange), tuple(yrange))
+        return True
+
+    def FormatCoord(self, gx, gy):
+        """
+        Describes a position in grid units for the location display.
+        """
+        found = self.PanelAtGrid(gx, gy)
+        if found is None:
+            return ""
+        panel, x, y = found
+        name = self.titles is None and str(panel) or str(self.titles[panel])
+        return "panel %s: x=%g, y=%g" % (name, x, y)
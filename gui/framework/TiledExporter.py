@@ -0,0 +1,108 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+from   matplotlib.backends.backend_agg import RendererAgg
+from   matplotlib.transforms import Bbox
+from   PngWriter import PngWriter
+import numpy
+
+def get_buffer(renderer):
+    "Returns the RGBA pixels of C{renderer}, top row first."
+    try:
+        pixels = renderer.buffer_rgba()
+    except TypeError:
+        pixels = renderer.buffer_rgba(0, 0)
+    return numpy.frombuffer(pixels, numpy.uint8).reshape(
+                            int(renderer.height), int(renderer.width), 4)
+
+class TiledExporter:
+    """
+    Saves a figure as a PNG image of any size with bounded memory.  The
+    figure is drawn at the full size of the image, but into tiles of at
+    most C{tile} pixels a side, by shifting the figure under a small Agg
+    renderer.  Only the box the figure is mapped to is shifted, not the
+    scale from inches and points to pixels, so every tile lays out text,
+    ticks and offsets exactly as one drawing of the whole image would.
+    A band of tiles is assembled at a time and streamed to a
+    C{PngWriter}, so at most one band, of about C{memory} bytes, is held
+    however large the image.
+    """
+
+    def __init__(self, figure, size, dpi=None, tile=4096, memory=64 << 20):
+        width, height = self.size = [int(n) for n in size]
+        self.figure = figure
+        self.dpi    = dpi or width / figure.get_size_inches()[0]
+        self.tile   = tile
+        self.band   = max(1, min(tile, memory // (4 * width), height))
+
+    def GetTiles(self, top, rows):
+        """
+        Returns the left edge and width of the tiles across a band, and
+        the bottom of the band in display coordinates.
+        """
+        width, height = self.size
+        return ([(left, min(self.tile, width - left))
+                 for left in range(0, width, self.tile)],
+                height - top - rows)
+
+    def Draw(self, left, bottom, width, rows):
+        """
+        Draws the part of the figure C{width} by C{rows} pixels from
+        C{left}, C{bottom}, and returns its pixels.
+        """
+        # As savefig does for a tight bounding box, the box the figure is
+        # mapped to is moved, by whole pixels, and nothing else.
+        transform = self.figure.transFigure
+        transform._boxout = Bbox.from_bounds(-left, -bottom, *self.size)
+        transform.invalidate()
+        renderer = RendererAgg(width, rows, self.dpi)
+        self.figure.draw(renderer)
+        return get_buffer(renderer)
+
+    def Write(self, path, progress=None):
+        """
+        Writes the image to C{path}.  C{progress}, if given, is called
+        with the fraction done after every band.
+        """
+        width, height = self.size
+        figure = self.figure
+        inches, dpi = figure.get_size_inches().copy(), figure.dpi
+        boxout = figure.transFigure._boxout
+
+        writer = PngWriter(path, width, height)
+        try:
+            figure.set_size_inches(width / self.dpi, height / self.dpi)
+            figure.dpi = self.dpi
+            for top in range(0, height, self.band):
+                rows = min(self.band, height - top)
+                tiles, bottom = self.GetTiles(top, rows)
+                band = numpy.empty((rows, width, 4), numpy.uint8)
+                for left, columns in tiles:
+                    band[:, left:left + columns] = self.Draw(left, bottom,
+                                                             columns, rows)
+                writer.Write(band)
+                if progress is not None:
+                    progress(float(top + rows) / height)
+        except:
+            writer.Abort()
+            raise
+        finally:
+            figure.transFigure._boxout = boxout
+            figure.transFigure.invalidate()
+            figure.set_size_inches(*inches)
+            figure.dpi = dpi
+        writer.Close()
@@ -0,0 +1,210 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+from   matplotlib       import cm
+from   matplotlib.colors import Normalize
+from   matplotlib.image import AxesImage
+import numpy
+
+class TextureImage(AxesImage):
+    """
+    An image of RGBA bytes that shows the array it is given, rather than
+    checking and copying it, so pointing it at part of a large buffer
+    costs nothing.
+    """
+
+    def set_data(self, A):
+        self._A         = A
+        self._imcache   = None
+        self._rgbacache = None
+        self.stale      = True
+
+class Waterfall:
+    """
+    A time versus channel image that grows by one row per integration.
+    Rows go into a preallocated circular buffer, together with their
+    colors, so appending a row colors only that row and the cost of
+    drawing depends on the capacity of the buffer, never on the length
+    of the history.  The buffer is shown as two images, the rows before
+    and after the wrap point, each a view of it, so it is never
+    reordered or copied.
+
+    Unless fixed limits are given, the color scale follows the data.  It
+    is widened, with some headroom, when a row falls outside it; only
+    then are the stored rows colored again.
+    """
+
+    def __init__(self, axes, channels, capacity=1024, xlim=None, dt=1.0,
+                 cmap=None, vmin=None, vmax=None, headroom=0.1, follow=True):
+        self.axes     = axes
+        self.channels = channels
+        self.capacity = capacity
+        self.xlim     = xlim or (0, channels)
+        self.dt       = dt       # time between rows
+        self.cmap     = cmap or cm.get_cmap()
+        self.fixed    = vmin is not None and vmax is not None
+        self.norm     = Normalize(vmin, vmax)
+        self.headroom = headroom # fraction of the range added when widening
+        self.follow   = follow   # keep the newest rows in view
+
+        self.data     = numpy.zeros((capacity, channels), numpy.float32)
+        self.texture  = numpy.zeros((capacity, channels, 4), numpy.uint8)
+        self.head     = 0        # next row to write
+        self.count    = 0        # rows held
+        self.total    = 0        # rows appended since the start
+
+        self.images = []
+        for i in range(2):
+            image = TextureImage(axes, origin = 'lower',
+                                 interpolation = 'nearest')
+            image.set_figure(axes.figure)
+            image.set_visible(False)
+            axes.images.append(image)
+            self.images.append(image)
+
+    def GetImages(self):
+        """
+        Returns the images showing the older and the newer rows.
+        """
+        return self.images
+
+    def GetData(self):
+        """
+        Returns a copy of the rows held, oldest first.
+        """
+        if self.count < self.capacity:
+            return self.data[:self.count].copy()
+        return numpy.concatenate((self.data[self.head:],
+                                  self.data[:self.head]))
+
+    def SetClim(self, vmin=None, vmax=None):
+        """
+        Fixes the color scale limits, or lets them follow the data again
+        if none are given.
+        """
+        self.fixed = vmin is not None and vmax is not None
+        self.norm.vmin, self.norm.vmax = vmin, vmax
+        if not self.fixed:
+            self.Renormalize()
+        else:
+            self.Recolor()
+
+    def Renormalize(self):
+        """
+        Fits the color scale to the rows held, e.g., once rows with
+        outlying values have scrolled out.
+        """
+        self.norm.vmin = self.norm.vmax = None
+        rows = self.GetData()
+        rows = rows[numpy.isfinite(rows)]
+        if len(rows):
+            self.Widen(rows.min(), rows.max())
+        self.Recolor()
+
+    def Widen(self, lower, upper):
+        """
+        Extends the color scale to include C{lower} to C{upper}, with
+        headroom so that slowly drifting data does not recolor every row.
+        Returns a boolean indicating if the scale changed.
+        """
+        vmin, vmax = self.norm.vmin, self.norm.vmax
+        if vmin is not None and lower >= vmin and upper <= vmax:
+            return False
+
+        if vmin is not None:
+            lower, upper = min(lower, vmin), max(upper, vmax)
+        room = (upper - lower) * self.headroom or 1.0
+        self.norm.vmin = lower - (vmin is None or lower < vmin) * room
+        self.norm.vmax = upper + (vmax is None or upper > vmax) * room
+        return True
+
+    def Colors(self, rows):
+        "Returns the RGBA bytes of C{rows} on the current color scale."
+        return self.cmap(self.norm(numpy.ma.masked_invalid(rows)),
+                         bytes = True)
+
+    def Recolor(self):
+        """
+        Colors all the rows held again.
+        """
+        if self.count:
+            self.texture[:self.count] = self.Colors(self.data[:self.count])
+        self.Refresh()
+
+    def Append(self, row):
+        """
+        Adds one row, or several as a 2D array, at the top.
+        """
+        rows = numpy.atleast_2d(numpy.asarray(row, dtype = numpy.float32))
+        if rows.shape[1] != self.channels:
+            raise ValueError("Rows must have %d channels, not %d."
+                             % (self.channels, rows.shape[1]))
+        appended = len(rows)
+        rows = rows[-self.capacity:]
+
+        recolor = False
+        if not self.fixed:
+            finite = rows[numpy.isfinite(rows)]
+            if len(finite):
+                recolor = self.Widen(finite.min(), finite.max())
+
+        first = self.head
+        for row in rows:
+            self.data[self.head] = row
+            self.head = (self.head + 1) % self.capacity
+        self.count = min(self.capacity, self.count + len(rows))
+        self.total += appended
+
+        if recolor:
+            self.Recolor()
+            return
+
+        if first + len(rows) <= self.capacity:
+            self.texture[first:first + len(rows)] = self.Colors(rows)
+        else:
+            split = self.capacity - first
+            self.texture[first:] = self.Colors(rows[:split])
+            self.texture[:len(rows) - split] = self.Colors(rows[split:])
+        self.Refresh()
+
+    def Refresh(self):
+        """
+        Points the two images at the rows before and after the wrap point.
+        """
+        older, newer = self.images
+        if self.count < self.capacity:
+            segments = [(older, 0, 0), (newer, 0, self.count)]
+        else:
+            segments = [(older, self.head, self.capacity),
+                        (newer, 0, self.head)]
+
+        # Time, in rows, of the oldest row held.
+        start = self.total - self.count
+        x0, x1 = self.xlim
+        for image, first, last in segments:
+            image.set_visible(last > first)
+            if last <= first: continue
+
+            image.set_data(self.texture[first:last])
+            image._extent = (x0, x1, start * self.dt,
+                             (start + last - first) * self.dt)
+            start += last - first
+
+        if self.follow and self.count:
+            self.axes.set_xlim(x0, x1)
+            self.axes.set_ylim((self.total - self.capacity) * self.dt,
+                               self.total * self.dt)
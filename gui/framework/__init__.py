@@ -23,10 +23,27 @@ hosting a DEAPPanel inside a top-level window derived from Frame.
 """
 
 from   ConfigValues import ConfigValues
+from   AggregateImage import AggregateImage
 from   Application import Application
+from   ArtistCuller import ArtistCuller
+from   DensityImage import DensityImage
 from   Frame       import *
+from   FrameRateGovernor import FrameRateGovernor
+from   GridLayout  import GridLayout
+from   LayoutCache import LayoutCache
+from   LineIndex   import LineIndex
+from   LRUCache    import LRUCache
 from   Notebook    import Notebook
+from   OutOfCoreLine import OutOfCoreLine
 from   Panel       import Panel
 from   PlotView    import PlotView
+from   PngWriter   import PngWriter
+from   ProgressiveRenderer import ProgressiveRenderer
+from   RangeMinMax import RangeMinMax
+from   ResizeCoalescer import ResizeCoalescer
+from   ScanPrefetcher import ScanPrefetcher
 from   Shell       import Shell
+from   SmallMultiples import SmallMultiples
+from   TiledExporter import TiledExporter
+from   Waterfall   import Waterfall
 import wxUnit
@@ -15,26 +15,101 @@
 # 675 Mass Ave
 # Cambridge, MA 02139, USA.
 
+from   data          import AsciiLoader
+from   data          import DataExporter
+from   data          import FileFollower
+from   data          import FitsTable
+from   data          import FolderWatcher
+from   data          import OutOfCoreSeries
+from   data          import ParseCache
+from   document      import Document
+from   document      import ReportBuilder
+from   gui           import ScanBrowserFrame
+from   gui.framework import AggregateImage
+from   gui.framework import DensityImage
+from   gui.framework import OutOfCoreLine
+from   gui.framework import SmallMultiples
+from   gui.framework import Waterfall
+from   gui.framework.PlotView import MyAxesLimits
+from   matplotlib.lines import Line2D
+import numpy
 import wx
 import os
+import time
 
 # A list of functions available to the user from the command line.
 # These are *really* methods of the Interpreter class masquerading as functions.
 FUNCTIONS = [
-    "clear"       # repeat of pylab function (clf)
+    "aggregate"
+  , "browse"
+  , "cache_info"
+  , "cache_purge"
+  , "clear"       # repeat of pylab function (clf)
+  , "density"
   , "draw"        # repeat of pylab function (draw)
   , "export"      # repeat of pylab function (savefig)
+  , "export_data"
+  , "fit_y"
+  , "follow"
   , "freeze"
   , "get_data"
   , "get_figure"  # repeat of pylab function (gcf)
+  , "get_statistics"
   , "get_subplot" # repeat of pylab function (gca)
+  , "governor"
   , "hold"        # repeat of pylab function (hold)
+  , "layout_cache"
+  , "load_data"
+  , "multiples"
   , "open_file"   # should just be execfile
+  , "plot_series"
+  , "read_fits"
   , "redo"
+  , "report"
   , "set_scale"
+  , "tight_grid"
   , "undo"
+  , "unfollow"
+  , "unwatch"
+  , "watch"
+  , "waterfall"
 ]
 
+class OffscreenView:
+    """
+    Stands in for the plot view of a document while a report script is
+    run in a worker process.  The figure is the current pylab figure,
+    drawn off screen once the script ends, and zooms are kept as the
+    plot view keeps them.
+    """
+
+    def __init__(self):
+        self.limits   = MyAxesLimits()
+        self.director = self # set_scale keeps zooms in director.limits
+
+    def get_figure(self):
+        import pylab
+        return pylab.gcf()
+
+    def GetAxesLimits(self):
+        return self.limits
+
+    def Clear(self):
+        self.get_figure().clear()
+
+    def draw(self):
+        pass
+
+def get_report_namespace():
+    """
+    Returns the functions of the command line, acting on a document
+    drawn off screen, for the report scripts run in a worker process, so
+    that saved command histories can be run as they were typed.
+    """
+    document = Document()
+    document.SetPlotter(OffscreenView())
+    return Interpreter(document).DefineFunctions()
+
 class Interpreter:
     """
     The Intepreter is the mechanism whereby the user can interact with the
@@ -45,6 +120,9 @@ class Interpreter:
         "Constructor for Interpreter."
         self.document    = document
         self.commandLine = None
+        self.parseCache  = ParseCache()
+        self.watchers    = []
+        self.followers   = { }
 
     def DefineFunctions(self):
         "Defines list of functions that the user calls from the command line."
@@ -72,8 +150,110 @@ class Interpreter:
         "Returns a reference to the Document contained in the Interpreter."
         return self.document
 
+    def GetCurrentAxes(self):
+        """
+        Returns the current subplot, cleared unless hold is on.
+        """
+        axes = self.get_figure().gca()
+        if not axes.ishold():
+            axes.cla()
+        return axes
+
+    def AddImage(self, image):
+        """
+        Adds an image that computes its own data, such as a density or
+        aggregate image, to its axes and scales the axes to fit it.
+        """
+        axes = image.axes
+        image.set_figure(axes.figure)
+        axes.images.append(image)
+
+        xmin, xmax, ymin, ymax = image.GetDataLimits()
+        axes.update_datalim(((xmin, ymin), (xmax, ymax)))
+        axes.autoscale_view()
+        self.GetDocument().draw()
+        return image
+
     #### Functions available from the command line ####
 
+    def aggregate(self, x, y, values = None, how = 'count',
+                  threshold = 100000, **kwds):
+        """
+        Shows a scatter plot of millions of points as an image with one
+        cell per screen pixel, holding the number of points there (how =
+        'count'), or the mean or maximum of their values (how = 'mean' or
+        'max').  Only the visible region is aggregated, again when zooming
+        or panning.  Once fewer than threshold points are visible, they
+        are drawn as markers instead.  Other keywords, such as cmap, are
+        passed to the image.  Returns the image.
+
+        Eg.
+        aggregate(ra, dec)                          # point density
+        aggregate(position, intensity, how='count', cmap=cm.hot)
+        aggregate(ra, dec, values=flux, how='max', threshold=5000)
+        """
+        axes = self.GetCurrentAxes()
+        return self.AddImage(AggregateImage(axes, x, y, values, how,
+                                            threshold, **kwds))
+
+    def browse(self, source, load = None, ahead = 4, maxsize = 256e6):
+        """
+        Opens a scan browser, with Previous and Next buttons, to step
+        through scans one at a time.  source is a FITS table, as returned
+        by read_fits, whose scans are browsed, or a list of keys, each
+        loaded with load(key), which returns the spectra of a scan as a 2D
+        array (one row per spectrum).  While a scan is shown, the next
+        ahead scans are loaded in the background, and scans loaded are
+        kept, up to maxsize bytes, so stepping through them is quick.
+        Returns the browser.
+
+        Eg.
+        browse(read_fits("/data/AGBT08A_001.raw.acs.fits"))
+        browse(range(10, 90), lambda scan: loadtxt("/data/scan%d.txt" % scan))
+        """
+        if load is None:
+            table  = source
+            source = table.GetScans()
+            # Decoded to native floats in the background.
+            load   = lambda scan: numpy.array(table.GetSpectra(scan = scan),
+                                              dtype = numpy.float64)
+
+        browser = ScanBrowserFrame(wx.GetApp().GetTopWindow(),
+                                   self.GetDocument(), source, load, ahead,
+                                   int(maxsize))
+        browser.Show()
+        return browser
+
+    def cache_info(self):
+        """
+        Returns the directory, number of entries, size and hit rate of the
+        cache of parsed data files used by load_data, and lists the
+        entries, most recently used first.
+
+        Eg.
+        cache_info()                              # Show the cache
+        cache_info()['size']                      # Bytes used
+        """
+        cache = self.parseCache
+        for entry in cache.GetEntries():
+            used = time.localtime(entry['used'])
+            print "%10.1f MB  %s  %s" % (entry['size'] / 1e6,
+                                          time.strftime("%Y-%m-%d %H:%M", used),
+                                          entry['source'])
+        return cache.GetStatistics()
+
+    def cache_purge(self, maxsize = 0):
+        """
+        Removes the least recently used entries of the cache of parsed
+        data files until the rest take at most maxsize bytes; by default,
+        removes them all.  Returns the number of entries removed.
+
+        Eg.
+        cache_purge()                             # Empty the cache
+        cache_purge(500e6)                        # Keep at most 500 MB
+        """
+        return self.parseCache.Evict(maxsize)
+
     def clear(self):
         """
         Clears the plotting canvas.
@@ -81,6 +261,24 @@ class Interpreter:
         if self.document is not None:
             self.GetDocument().Clear()
 
+    def density(self, data, x = None, log = False, **kwds):
+        """
+        Shows many overlapping traces, such as every integration of a scan,
+        as an image of how many traces cross each pixel, instead of one
+        line per trace.  data is a 2D array with one trace per row and x
+        the values shared by all traces (channel numbers by default).  The
+        image is recomputed for the visible range when zooming.  If log is
+        True, the logarithm of the counts is shown.  Other keywords, such
+        as cmap, are passed to the image.  Returns the image.
+
+        Eg.
+        density(spectra)                   # spectra is a 10000 x 4096 array
+        density(spectra, x=freq, log=True)
+        density(spectra, cmap=cm.hot)
+        """
+        axes = self.GetCurrentAxes()
+        return self.AddImage(DensityImage(axes, data, x, log, **kwds))
+
     def draw(self):
         """
         Generates a redraw event, which refreshes the plot.
@@ -88,14 +286,20 @@ class Interpreter:
         if self.document is not None:
             self.GetDocument().draw()
 
-    def export(self, file):
+    def export(self, file, size = None, dpi = None):
         """
         Saves the plotting canvas to a graphical file format.  The file
         argument is a string representing the file name (and path) of the
         export file.  The file must have either a .png or .eps extension.
+        A PNG file can be given a size, (width, height) in pixels, of any
+        size, e.g. for a poster; it is drawn in tiles and written as they
+        are drawn, without ever holding the whole image.  The text and
+        lines are scaled with the image unless a dpi is given.
 
         Eg.
         export("plot.png") # Saves canvas to file in local directory
+        export("poster.png", size=(20000, 15000))
+        export("poster.png", size=(20000, 15000), dpi=300)
         """
         path, ext = os.path.splitext(file)
         ext = ext[1:].lower()
@@ -103,8 +307,123 @@ class Interpreter:
         if ext != 'png' and ext != 'eps':
             print 'Only the PNG and EPS image formats are supported.\n'
             print 'A file extension of `png\' or `eps\' must be used.'
+        elif size is not None and ext != 'png':
+            print 'Only PNG images can be given a size.'
         else:
-            self.GetDocument().Export(file)
+            self.GetDocument().Export(file, size, dpi)
+
+    def export_data(self, file, range = 'visible', index = None,
+                    format = None):
+        """
+        Writes the data of the plotted lines to file, with their labels.
+        range is 'visible' for the samples within the X limits of each
+        subplot, 'selection' for those in the range last selected with
+        the statistics tool, or 'all'.  index restricts the export to one
+        subplot.  The format follows the extension of file, or format:
+        'npy' (one line, as X and Y columns), 'npz', 'bin' (raw doubles
+        after a JSON header) or 'csv'.  The data is written in chunks,
+        without copying it first.  Returns the number of samples written.
+
+        Eg.
+        export_data("spectrum.npy")                  # The line in view
+        export_data("scans.npz", range='all')        # Every line, whole
+        export_data("cut.csv", range='selection')    # The selected range
+        """
+        plotter  = self.GetDocument().GetPlotter()
+        exporter = DataExporter(file, format)
+
+        if range == 'selection':
+            selection = plotter.GetSelection()
+            if selection is None:
+                raise ValueError("Nothing is selected; select a range with "
+                                 "the statistics tool first.")
+            subplots = [selection]
+        else:
+            subplots = self.get_figure().axes
+            if index is not None:
+                subplots = [self.get_subplot(index)]
+            if range == 'all':
+                subplots = [(axes, -numpy.inf, numpy.inf)
+                            for axes in subplots]
+            elif range == 'visible':
+                subplots = [(axes,) + tuple(axes.get_xlim())
+                            for axes in subplots]
+            else:
+                raise ValueError("range must be 'visible', 'selection' or "
+                                 "'all', not %r." % (range,))
+
+        for axes, xmin, xmax in subplots:
+            for label, x, y in plotter.GetLineData(axes, xmin, xmax):
+                if len(subplots) > 1:
+                    label = "subplot %d: %s" % \
+                            (self.get_figure().axes.index(axes), label)
+                exporter.Add(label, x, y)
+        return exporter.Write()
+
+    def fit_y(self, b = None):
+        """
+        Set whether the Y axis follows the data within the visible X range
+        when zooming and panning.  If b is None (default), toggle the
+        setting.  Else set it to boolean value b.  When turned on, the
+        Y axes of all subplots are fitted right away.
+
+        Eg.
+        fit_y()      # toggle fitting
+        fit_y(True)  # Y axis follows the visible data
+        fit_y(False) # Y axis keeps its limits
+        """
+        plotter = self.GetDocument().GetPlotter()
+        plotter.SetFitY(b)
+        if plotter.IsFitY():
+            for subplot in self.get_subplot():
+                plotter.director.FitY(subplot)
+            self.GetDocument().draw()
+
+    def follow(self, path, columns = None, delimiter = None, skiprows = 0,
+               interval = 1.0, **kwds):
+        """
+        Plots a text data file that keeps growing, like tail -f: every
+        interval seconds, only the lines added since the last check are
+        read, appended to the data and added to the line, so following a
+        large file costs no more than following a small one.  columns,
+        delimiter and skiprows are as for load_data; the second column
+        is plotted against the first, or a single column against the row
+        number.  Other keywords set line properties.  Returns the
+        follower, whose GetData() returns the rows read so far.
+
+        Eg.
+        follow("/data/session.log", columns=(0, 4))
+        f = follow("/data/tsys.csv", delimiter=",", skiprows=1, interval=5)
+        unfollow(f)
+        """
+        follower = FileFollower(path, columns, delimiter, skiprows = skiprows)
+        axes = self.get_figure().gca()
+        line = Line2D([], [], label = os.path.basename(path), **kwds)
+        axes.add_line(line)
+
+        def poll():
+            values = follower.Poll()
+            if not len(values): return
+
+            data = follower.GetData()
+            if data.shape[1] == 1:
+                x, y = numpy.arange(len(data)), data[:, 0]
+                new  = x[-len(values):], values[:, 0]
+            else:
+                x, y = data[:, 0], data[:, 1]
+                new  = values[:, 0], values[:, 1]
+            line.set_data(x, y)
+            # Only the new rows can extend the limits.
+            axes.update_datalim(((new[0].min(), new[1].min()),
+                                 (new[0].max(), new[1].max())))
+            axes.autoscale_view()
+            self.GetDocument().draw()
+
+        poll()
+        timer = wx.PyTimer(poll)
+        timer.Start(int(interval * 1000))
+        self.followers[follower] = timer
+        return follower
 
     def freeze(self, message = None):
         """
@@ -155,6 +474,28 @@ class Interpreter:
         """
         return self.GetDocument().get_figure()
 
+    def governor(self, **settings):
+        """
+        Shows or changes how the pan tool trades quality for speed.  While
+        panning, frames are timed and antialiasing, markers and data
+        resolution are dropped when the frame rate falls below the
+        target; full quality is restored when the mouse is released.
+        Returns the current settings, including the frame time thresholds
+        used to lower and raise quality.  The settings that can be changed
+        are enabled, targetFps, window (frames averaged per decision) and
+        raiseRatio (fraction of the frame time under which quality is
+        raised again).  They can also be given in a [Governor] section of
+        the configuration file.
+
+        Eg.
+        governor()                # Show the current settings
+        governor(targetFps=15)    # Aim for 15 frames per second
+        governor(enabled=False)   # Always draw at full quality
+        """
+        governor = self.GetDocument().GetPlotter().GetGovernor()
+        governor.SetSettings(**settings)
+        return governor.GetSettings()
+
     def hold(self, b = None):
         """
         Set the hold state.  If hold is None (default), toggle the
@@ -168,13 +509,119 @@ class Interpreter:
         """ 
         self.GetDocument().Hold(b)
 
+    def layout_cache(self, clear = False):
+        """
+        Returns the number of entries and the hit rate of the caches that
+        keep tick locations, tick labels and text sizes between redraws.
+        If clear is True the caches are emptied first.
+
+        Eg.
+        layout_cache()                            # Show the cache statistics
+        layout_cache()['ticks']['hitRate']        # Fraction of ticks reused
+        layout_cache(True)                        # Start over
+        """
+        cache = self.GetDocument().GetPlotter().GetLayoutCache()
+        if clear:
+            cache.Clear()
+        return cache.GetStatistics()
+
+    def load_data(self, path, columns = None, delimiter = None,
+                  skiprows = 0, plot = False, threads = 0, cache = True,
+                  **kwds):
+        """
+        Loads columns of numbers from a text file, which may be several
+        gigabytes, without first reading it whole: the file is parsed in
+        chunks straight into the array returned, one row per line.
+        columns selects columns by number, delimiter separates them (by
+        default, any white space) and skiprows lines of header are
+        ignored, as are comments starting with #.  threads parses that
+        many chunks at a time.  If plot is True the rows loaded so far are
+        plotted while loading continues: the second column against the
+        first, or a single column against the row number.  Other keywords
+        set line properties.  The throughput is printed at the end.
+        Unless cache is False, the result is kept in a cache (see
+        cache_info) and a file loaded again, unchanged and with the same
+        options, is mapped from it instead of being parsed.
+
+        Eg.
+        d = load_data("/data/scan.txt")                # All columns
+        d = load_data("/data/scan.csv", delimiter=",", skiprows=1)
+        d = load_data("/data/scan.txt", columns=(0, 3), plot=True)
+        """
+        progress = None
+        if plot:
+            axes = self.GetCurrentAxes()
+            line = axes.plot([], [], **kwds)[0]
+            app  = wx.GetApp()
+
+            def progress(loader):
+                data = loader.GetData()
+                if data.shape[1] == 1:
+                    x, y = numpy.arange(len(data)), data[:, 0]
+                else:
+                    x, y = data[:, 0], data[:, 1]
+                line.set_data(x, y)
+                axes.update_datalim(((x.min(), y.min()), (x.max(), y.max())))
+                axes.autoscale_view()
+                self.GetDocument().draw()
+                while app.Pending(): app.Dispatch()
+
+        loader = AsciiLoader(path, columns, delimiter, skiprows = skiprows,
+                             threads = threads, progress = progress,
+                             cache = cache and self.parseCache or None)
+        data = loader.Load()
+        if plot and len(data) and not loader.cached:
+            # The rows plotted were views of a buffer that may have moved.
+            progress(loader)
+
+        statistics = loader.GetStatistics()
+        if statistics['cached']:
+            print "Loaded %d rows from the cache" % statistics['rows']
+            return data
+        print "Loaded %d rows in %.2f s (%.1f MB/s, %d rows/s)" % \
+              (statistics['rows'], statistics['seconds'],
+               statistics['MBPerSecond'], statistics['rowsPerSecond'])
+        return data
+
+    def multiples(self, data, x = None, cols = None, titles = None,
+                  sharey = True, **kwds):
+        """
+        Replaces the figure with small multiples: one panel per series,
+        drawn with shared frames, ticks and labels on a single axes, which
+        is much faster than one subplot per panel.  data is a 2D array
+        (one row per panel), a 3D array (panels, layers, samples) or a
+        list of series, or of lists of series.  x is shared by all panels
+        or given per panel, cols sets the number of columns and titles
+        names the panels.  Other keywords set line properties.  In info
+        mode, clicking a panel shows it on its own; zooming applies to
+        all panels.  Returns the small multiples object.
+
+        Eg.
+        multiples(spectra)                      # spectra is a 16 x N array
+        multiples(data, x=freq, cols=8)         # data is 64 x 2 x N
+        multiples(data, titles=beams, linewidth=0.5)
+        """
+        figure = self.get_figure()
+        figure.clf()
+        multiples = SmallMultiples(figure, data, x, cols, titles, sharey,
+                                   **kwds)
+        self.GetDocument().draw()
+        return multiples
+
     def open_file(self, file):
         """
         Opens a previously saved session or user-created file containing DEAP
         commands.  file is a string containing the path to the desired file.
+        A session saved as a .deap file is restored as it was saved, with
+        its data read from the file as needed, instead of by running its
+        commands again.
 
         Remove me - use execfile instead.
         """
+        if file.endswith(".deap"):
+            self.GetDocument().OpenSnapshot(file)
+            return
+
         f = open(file, "r")
         history = f.readlines()
         f.close()
@@ -184,14 +631,194 @@ class Interpreter:
         self.GetCommandLine().SetHistory(history)
         self.draw()
 
+    def plot_series(self, path, dtype = '<f8', offset = 0, x0 = 0.0,
+                    dx = 1.0, **kwds):
+        """
+        Plots a uniformly sampled series from a raw binary file, which
+        may be larger than memory.  The file is memory mapped and never
+        read in full: the first time it is opened, a pyramid of minimum,
+        maximum and mean values is built in one pass and saved next to
+        it (as path + ".pyr"), and every view is then drawn from the
+        pyramid, or from the raw samples once zoomed in.  dtype and
+        offset describe the samples and where they start in the file;
+        x0 and dx give the X values.  Other keywords set line properties.
+        Returns the line.
+
+        Eg.
+        plot_series("/data/voltage.f8")
+        plot_series("/data/samples.i2", dtype='<i2', offset=512, dx=1e-6)
+        """
+        series = OutOfCoreSeries(path, dtype, offset, x0, dx)
+        axes   = self.GetCurrentAxes()
+        line   = OutOfCoreLine(series, **kwds)
+        axes.add_line(line)
+        axes.autoscale_view()
+        self.GetDocument().draw()
+        return line
+
+    def read_fits(self, path, extension = 0):
+        """
+        Opens a FITS binary table, such as an SDFITS file, without reading
+        it.  extension is the number of the binary table in the file
+        (counting from zero) or its EXTNAME.  Spectra are selected by
+        scan, integration, polarization, feed and window, and returned as
+        views of the file, so only the rows selected are read.  Returns
+        the table.
+
+        Eg.
+        t = read_fits("/data/AGBT08A_001.raw.acs.fits")
+        t.GetScans()                              # scans in the file
+        plot(t.GetSpectra(scan=12, polarization=0, feed=0)[0])
+        t.GetColumn('TSYS')                       # any column, all rows
+        """
+        return FitsTable(path, extension)
+
     def redo(self):
         "Redoes the last command typed in the interactive shell."
         self.GetDocument().Redo()
 
+    def report(self, file, pages, processes = None, ahead = None):
+        """
+        Writes a multi-page PDF file with one page per item of pages,
+        each the path of a command script, run off screen with the pylab
+        functions and those of this command line and drawn as an image at
+        150 dpi, or of a session saved as a .deap file.  The scripts are
+        run by worker processes (one per CPU, started with DEAP), at most
+        ahead pages in advance, while the pages before them are written;
+        each page is written to file as soon as it is ready, so memory
+        does not grow with the number of pages.  processes is only used
+        when the workers were not started.  Returns the number of pages
+        written.
+
+        Eg.
+        report("nightly.pdf", ["scan%d.py" % n for n in range(1, 200)])
+        report("sessions.pdf", ["before.deap", "after.deap"])
+        """
+        return ReportBuilder(file, processes, ahead,
+                             namespace = get_report_namespace).Build(pages)
+
+    def tight_grid(self, b = None):
+        """
+        Set whether the space around and between subplots is sized to their
+        tick labels, axis labels and titles instead of the fixed fractions
+        of the figure set by subplots_adjust.  If b is None (default),
+        toggle the setting.  Else set it to boolean value b.
+
+        Eg.
+        tight_grid()      # toggle the tight grid
+        tight_grid(True)  # gaps follow the labels
+        tight_grid(False) # gaps follow subplots_adjust
+        """
+        layout = self.GetDocument().GetPlotter().GetGridLayout()
+        if b is None:
+            b = not layout.IsTight()
+        self.GetDocument().GetPlotter().SetTightLayout(b)
+        self.GetDocument().draw()
+
     def undo(self):
         "Undoes the last command typed in the interactive shell."
         self.GetDocument().Undo()
 
+    def unfollow(self, follower = None):
+        """
+        Stops following the file of follower, as returned by follow, or
+        stops following all files.
+
+        Eg.
+        unfollow()                                # Stop following all files
+        """
+        followers = follower and [follower] or self.followers.keys()
+        for follower in followers:
+            timer = self.followers.pop(follower, None)
+            if timer is not None:
+                timer.Stop()
+
+    def unwatch(self, watcher = None):
+        """
+        Stops watching the directory of watcher, as returned by watch, or
+        stops all watching.
+
+        Eg.
+        unwatch()                                 # Stop all watching
+        """
+        watchers = watcher and [watcher] or list(self.watchers)
+        for watcher in watchers:
+            watcher.Stop()
+            if watcher in self.watchers:
+                self.watchers.remove(watcher)
+
+    def waterfall(self, channels, capacity = 1024, **kwds):
+        """
+        Creates a time versus channel waterfall in the current subplot and
+        returns it.  Rows are added with its Append method, which colors
+        only the new row, so appending stays fast however long the
+        history; the most recent capacity rows are kept.  Keywords are
+        xlim (channel axis range), dt (time per row), cmap, vmin and vmax
+        (fixed color scale), and follow (keep the newest rows in view).
+        Call draw() to show the new rows.
+
+        Eg.
+        w = waterfall(4096)                       # 4096 channels
+        w.Append(spectrum); draw()                # add one integration
+        w = waterfall(1024, capacity=600, xlim=(1.40e9, 1.42e9), dt=0.5)
+        """
+        waterfall = Waterfall(self.GetCurrentAxes(), channels, capacity,
+                              **kwds)
+        self.GetDocument().draw()
+        return waterfall
+
+    def watch(self, directory, pattern = "*", recipe = None,
+              interval = 2.0, load = None, **kwds):
+        """
+        Watches directory for new or changed files matching pattern and
+        plots them as they arrive.  Files are loaded, as columns of text
+        unless a load function is given, on a background thread; the
+        directory is checked every interval seconds, or as soon as it
+        changes if pyinotify is installed.  recipe(path, data) is then
+        called to plot each file; by default, the second column of the
+        data is plotted against the first (or a single column against
+        the row number) in the current subplot, as a new line for a new
+        file, or by updating the line of a changed one.  Other artists
+        are left alone.  Other keywords set line properties.  Returns
+        the watcher, to pass to unwatch.
+
+        Eg.
+        watch("/data/incoming", "*.txt")
+        watch("/data/incoming", "*.csv", load=lambda p: loadtxt(p, delimiter=","))
+        watch("/data/incoming", "*.txt", lambda path, d: plot(d[:, 2]))
+        """
+        lines = { }
+        def plot(path, data):
+            data = data.reshape(len(data), -1)
+            if data.shape[1] == 1:
+                x, y = numpy.arange(len(data)), data[:, 0]
+            else:
+                x, y = data[:, 0], data[:, 1]
+            if path in lines:
+                lines[path].set_data(x, y)
+                axes = lines[path].axes
+            else:
+                axes = self.get_figure().gca()
+                properties = { 'color' : "bgrcmyk"[len(lines) % 7] }
+                properties.update(kwds)
+                lines[path] = Line2D(x, y, label = os.path.basename(path),
+                                     **properties)
+                axes.add_line(lines[path])
+            if len(x):
+                axes.update_datalim(((x.min(), y.min()), (x.max(), y.max())))
+            axes.autoscale_view()
+
+        recipe = recipe or plot
+        def apply(path, data):
+            # Runs on the GUI thread.
+            recipe(path, data)
+            self.GetDocument().draw()
+
+        deliver = lambda path, data: wx.CallAfter(apply, path, data)
+        watcher = FolderWatcher(directory, pattern, deliver, load, interval)
+        self.watchers.append(watcher.Start())
+        return watcher
+
     def get_data(self, index=-1):
         """
         Returns either data for the indicated subplot or a list of all 
@@ -211,6 +838,32 @@ class Interpreter:
             return data[index]
         return data
 
+    def get_statistics(self, index=0, xlim=None):
+        """
+        Returns statistics on the data of every line of the given subplot
+        as a list of (label, statistics) pairs, where statistics is a
+        dictionary with the count, sum, mean, rms, min and max of the
+        samples.  xlim is an (xmin, xmax) pair restricting the samples
+        used; it defaults to the range last selected with the statistics
+        tool, or to all the data if there is none.
+
+        Eg.
+        get_statistics()               # Statistics of the selected range
+        get_statistics(0, (1.0, 2.5))  # Statistics of the first subplot
+                                       # between x = 1.0 and x = 2.5
+        """
+        subplot   = self.get_subplot(index)
+        plotter   = self.GetDocument().GetPlotter()
+        selection = plotter.GetSelection()
+
+        if xlim is None:
+            if selection is not None and selection[0] is subplot:
+                xlim = selection[1:]
+            else:
+                xlim = (-numpy.inf, numpy.inf)
+
+        return plotter.GetStatistics(subplot, xlim[0], xlim[1])
+
     def set_scale(self, index=0, xlim=None, ylim=None, autoscale=True):
         """
         Rescale axes of given subplot to limits (xmin, xmax) and (ymin, ymax).
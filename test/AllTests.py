@@ -19,9 +19,9 @@
 import unittest
 
 def suite():
-    modules_to_test = ('actionTests', 'analysisTests', 'documentTests', \
-                       'eventTests', 'guiTests', 'interpreterTests', \
-                       'plotTests')
+    modules_to_test = ('actionTests', 'analysisTests', 'dataTests', \
+                       'documentTests', 'eventTests', 'guiTests', \
+                       'interpreterTests', 'plotTests')
     alltests = unittest.TestSuite()
     for module in map(__import__, modules_to_test):
         alltests.addTest(unittest.findTestCases(module))
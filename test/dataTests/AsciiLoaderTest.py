@@ -0,0 +1,78 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import sys
+
+if __name__ == "__main__":
+    sys.path[1:1] = ["..", "../../"]
+
+from data.AsciiLoader import AsciiLoader, parse_chunk
+import numpy
+import os
+import tempfile
+import unittest
+
+class AsciiLoaderTest(unittest.TestCase):
+    "Tests of the chunked text file loader."
+
+    def setUp(self):
+        self.data = numpy.arange(3000, dtype = numpy.float64).reshape(-1, 3)
+        self.data[:, 2] /= 7.0
+        self.path = tempfile.mktemp(suffix = ".csv")
+        f = open(self.path, "w")
+        f.write("time,channel,value\n")
+        f.write("# comment before the data\n")
+        for n, row in enumerate(self.data):
+            f.write("%r,%r,%r\n" % tuple(row))
+            if n == 500:
+                f.write("\n# and one in the middle\n")
+        f.close()
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def testParseChunk(self):
+        values = parse_chunk("1 2 3\n4 5 6 # six\n\n7 8 9", 3, [2, 0])
+        assert values.tolist() == [[3, 1], [6, 4], [9, 7]]
+        self.assertRaises(ValueError, parse_chunk, "1 2 3\n4 x 6\n", 3)
+
+    def testLoad(self):
+        # Chunks much smaller than the file, so lines are split across
+        # reads and the result is grown.
+        progress = []
+        loader = AsciiLoader(self.path, delimiter = ",", skiprows = 1,
+                             chunk = 1000,
+                             progress = lambda l: progress.append(l.rows))
+        data = loader.Load()
+        assert data.shape == self.data.shape
+        assert (data == self.data).all()
+        assert len(progress) > 10 and progress[-1] == len(self.data)
+        assert progress == sorted(progress)
+        assert loader.GetStatistics()['rows'] == len(self.data)
+        assert loader.GetStatistics()['bytes'] == os.path.getsize(self.path)
+
+    def testColumnsAndThreads(self):
+        loader = AsciiLoader(self.path, columns = (2, 0), delimiter = ",",
+                             skiprows = 1, chunk = 700, threads = 3)
+        data = loader.Load()
+        assert (data == self.data[:, [2, 0]]).all()
+
+        data = AsciiLoader(self.path, 1, ",", skiprows = 1).Load()
+        assert data.shape == (len(self.data), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import sys
+
+if __name__ == "__main__":
+    sys.path[1:1] = ["..", "../../"]
+
+from data.DataExporter import DataExporter
+import json
+import numpy
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+class DataExporterTest(unittest.TestCase):
+    "Tests of writing plotted data to files."
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.x = numpy.arange(1000.0)
+        self.y = self.x ** 0.5
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def export(self, name, chunk=64):
+        path = os.path.join(self.directory, name)
+        exporter = DataExporter(path, chunk = chunk)
+        exporter.Add("sqrt", self.x, self.y)
+        exporter.Add('"odd" %d', self.x[:5], -self.y[:5])
+        return path, exporter
+
+    def testNpy(self):
+        path, exporter = self.export("line.npy")
+        self.assertRaises(ValueError, exporter.Write)
+        exporter.series = exporter.series[:1]
+        assert exporter.Write() == 1000
+        data = numpy.load(path)
+        assert (data[:, 0] == self.x).all() and (data[:, 1] == self.y).all()
+
+    def testNpz(self):
+        path, exporter = self.export("lines.npz")
+        exporter.Write()
+        data = numpy.load(path)
+        assert list(data['labels']) == ["sqrt", '"odd" %d']
+        assert (data['y0'] == self.y).all() and len(data['x1']) == 5
+
+    def testBin(self):
+        path, exporter = self.export("lines.bin")
+        assert exporter.Write() == 1005
+        f = open(path, "rb")
+        assert f.read(8) == "DEAPBIN1"
+        header = json.loads(f.read(struct.unpack("<Q", f.read(8))[0]))
+        f.close()
+
+        second = header['series'][1]
+        assert second['label'] == '"odd" %d' and second['length'] == 5
+        assert (header['start'] + second['y']) % 64 == 0
+        y = numpy.memmap(path, '<f8', 'r', header['start'] + second['y'], (5,))
+        assert (y == -self.y[:5]).all()
+
+    def testCsv(self):
+        path, exporter = self.export("lines.csv")
+        exporter.Write()
+        lines = open(path).read().splitlines()
+        assert lines[0] == "label,x,y"
+        assert len(lines) == 1006
+        assert lines[2] == '"sqrt",1,1'
+        assert lines[-1] == '"""odd"" %d",4,-2'
+
+    def testLabels(self):
+        path = os.path.join(self.directory, "labels.csv")
+        exporter = DataExporter(path)
+        exporter.Add(None, [1], [2])
+        exporter.Add(7, [3], [4])
+        exporter.Add(u"T\u2090", [5], [6])
+        exporter.Write()
+        assert open(path).read().splitlines()[1:] == \
+               ['"",1,2', '"7",3,4', '"T\xe2\x82\x90",5,6']
+
+    def testPermissions(self):
+        path, exporter = self.export("lines.csv")
+        umask = os.umask(022)
+        try:
+            exporter.Write()
+        finally:
+            os.umask(umask)
+        self.assertEqual(os.stat(path).st_mode & 0777, 0644)
+
+    def testFailedWrite(self):
+        path, exporter = self.export("line.npy")
+        exporter.series = exporter.series[:1]
+        exporter.Write()
+        exporter.Add("more", self.x, self.y)
+        self.assertRaises(ValueError, exporter.Write)
+        assert os.listdir(self.directory) == ["line.npy"]
+        assert len(numpy.load(path)) == 1000
+
+    def testFormat(self):
+        self.assertRaises(ValueError, DataExporter, "data.txt")
+        assert DataExporter("data.txt", "csv").format == "csv"
+
+if __name__ == '__main__':
+    unittest.main()
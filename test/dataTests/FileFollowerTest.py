@@ -0,0 +1,71 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import sys
+
+if __name__ == "__main__":
+    sys.path[1:1] = ["..", "../../"]
+
+from data.FileFollower import FileFollower
+import os
+import tempfile
+import unittest
+
+class FileFollowerTest(unittest.TestCase):
+    "Tests of following a growing text data file."
+
+    def setUp(self):
+        self.path = tempfile.mktemp(suffix = ".csv")
+        self.append("time,value\n")
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def append(self, text, mode="a"):
+        f = open(self.path, mode)
+        f.write(text)
+        f.close()
+
+    def testFollow(self):
+        follower = FileFollower(self.path, delimiter = ",", skiprows = 1)
+        assert len(follower.Poll()) == 0
+
+        # An incomplete line waits for the rest of it.
+        self.append("0,10\n1,11\n2,1")
+        assert follower.Poll().tolist() == [[0, 10], [1, 11]]
+        assert len(follower.Poll()) == 0
+        self.append("2\n# comment\n3,13\n")
+        assert follower.Poll().tolist() == [[2, 12], [3, 13]]
+        assert follower.GetData()[:, 1].tolist() == [10, 11, 12, 13]
+        assert follower.offset == os.path.getsize(self.path)
+
+        # Many rows grow the result.
+        self.append("".join(["%d,%d\n" % (n, n) for n in range(4, 3000)]))
+        assert len(follower.Poll()) == 2996
+        assert follower.GetData()[:, 0].tolist() == range(3000)
+
+    def testReplaced(self):
+        follower = FileFollower(self.path, columns = 1, delimiter = ",",
+                                skiprows = 1)
+        self.append("0,10\n1,11\n")
+        follower.Poll()
+        self.append("time,value\n5,15\n", "w")
+        assert follower.Poll().tolist() == [[15]]
+        assert follower.GetData().tolist() == [[15]]
+
+if __name__ == '__main__':
+    unittest.main()
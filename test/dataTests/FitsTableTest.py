@@ -0,0 +1,154 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import sys
+
+if __name__ == "__main__":
+    sys.path[1:1] = ["..", "../../"]
+
+from data.FitsTable import FitsTable, parse_value
+import numpy
+import os
+import tempfile
+import unittest
+
+def card(key, value):
+    "Returns an 80 character header card."
+    if isinstance(value, str):
+        value = "'%-8s'" % value.replace("'", "''")
+    elif isinstance(value, bool):
+        value = value and "T" or "F"
+    return ("%-8s= %20s" % (key, value)).ljust(80)
+
+def header(cards):
+    text = "".join(cards) + "END".ljust(80)
+    return text + " " * (-len(text) % 2880)
+
+def write_table(path, rows, extname="SINGLE DISH"):
+    "Writes C{rows}, a structured array, as an SDFITS-like binary table."
+    formats = { 'i2' : 'I', 'i4' : 'J', 'f4' : 'E', 'f8' : 'D' }
+    columns = []
+    for n, name in enumerate(rows.dtype.names):
+        base, shape = rows.dtype[name].base, rows.dtype[name].shape
+        repeat = shape and shape[0] or 1
+        if base.kind == 'S':
+            form = "%dA" % base.itemsize
+        else:
+            form = "%d%s" % (repeat, formats[base.str[1:]])
+        columns += [card("TTYPE%d" % (n + 1), name),
+                    card("TFORM%d" % (n + 1), form)]
+
+    data = rows.astype(rows.dtype.newbyteorder('>')).tostring()
+    f = open(path, "wb")
+    f.write(header([card("SIMPLE", True), card("BITPIX", 8),
+                    card("NAXIS", 0), card("EXTEND", True)]))
+    f.write(header([card("XTENSION", "BINTABLE"), card("BITPIX", 8),
+                    card("NAXIS", 2), card("NAXIS1", rows.dtype.itemsize),
+                    card("NAXIS2", len(rows)), card("PCOUNT", 0),
+                    card("GCOUNT", 1), card("TFIELDS", len(rows.dtype))]
+                   + columns + [card("EXTNAME", extname)]))
+    f.write(data + "\0" * (-len(data) % 2880))
+    f.close()
+
+class FitsTableTest(unittest.TestCase):
+    "Tests of the memory mapped FITS binary table reader."
+
+    def setUp(self):
+        dtype = numpy.dtype([('SCAN', '<i4'), ('PLNUM', '<i2'),
+                             ('FDNUM', '<i2'), ('OBJECT', 'S8'),
+                             ('DATA', '<f4', (16,))])
+        rows = numpy.zeros(24, dtype = dtype)
+        rows['SCAN']  = numpy.repeat([10, 11, 12], 8)
+        rows['PLNUM'] = numpy.tile([0, 1], 12)
+        rows['FDNUM'] = numpy.tile([0, 0, 1, 1], 6)
+        rows['OBJECT'] = "W3OH"
+        rows['DATA'] = numpy.arange(24 * 16).reshape(24, 16)
+        self.rows = rows
+        self.path = tempfile.mktemp(suffix = ".fits")
+        write_table(self.path, rows)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def testParseValue(self):
+        assert parse_value(" 'O''Hara '   / name") == "O'Hara"
+        assert parse_value("                   T") is True
+        assert parse_value("                  42 / answer") == 42
+        assert parse_value("              1.5D3") == 1500.0
+
+    def testColumns(self):
+        table = FitsTable(self.path, "SINGLE DISH")
+        assert len(table) == 24
+        assert table.GetColumnNames() == list(self.rows.dtype.names)
+        assert (table.GetColumn('DATA') == self.rows['DATA']).all()
+        assert table.GetColumn('OBJECT')[3] == "W3OH"
+        assert list(table.GetScans()) == [10, 11, 12]
+
+    def testIndex(self):
+        table = FitsTable(self.path)
+        integrations = table.GetIndex()['integration']
+        assert list(integrations[:8]) == [0, 0, 0, 0, 1, 1, 1, 1]
+        assert list(table.GetRows(scan = 11, polarization = 1, feed = 1)) \
+               == [11, 15]
+        assert list(table.GetRows(scan = [10, 12], integration = 1,
+                                  polarization = 0, feed = 0)) == [4, 20]
+
+    def testViews(self):
+        table = FitsTable(self.path)
+        spectra = table.GetSpectra(scan = 11)
+        assert isinstance(spectra, numpy.memmap)
+        assert (spectra == self.rows['DATA'][8:16]).all()
+
+        # Evenly spaced rows are still a view; others are read.
+        spectra = table.GetSpectra(scan = 12, polarization = 1)
+        assert isinstance(spectra, numpy.memmap)
+        assert (spectra == self.rows['DATA'][17:24:2]).all()
+        spectra = table.GetSpectra(scan = [10, 12], integration = 0,
+                                   polarization = 0, feed = 0)
+        assert (spectra == self.rows['DATA'][[0, 16]]).all()
+
+    def testLookups(self):
+        # Rows in no particular order, found as a scan of them would.
+        random = numpy.random.RandomState(1)
+        dtype = numpy.dtype([('SCAN', '<i4'), ('INT', '<i4'),
+                             ('PLNUM', '<i2'), ('FDNUM', '<i2'),
+                             ('DATA', '<f4', (2,))])
+        rows = numpy.zeros(200, dtype = dtype)
+        for name, top in (('SCAN', 5), ('INT', 4), ('PLNUM', 2),
+                          ('FDNUM', 3)):
+            rows[name] = random.randint(0, top, len(rows))
+        write_table(self.path, rows)
+        table = FitsTable(self.path)
+
+        for query in ({ 'scan' : 3 }, { 'scan' : [1, 4], 'integration' : 2 },
+                      { 'scan' : 0, 'polarization' : 1 },
+                      { 'feed' : [0, 2] }, { 'integration' : 1, 'feed' : 1 },
+                      { 'scan' : 2, 'integration' : [0, 3],
+                        'polarization' : 0, 'feed' : 2, 'window' : 0 },
+                      { 'scan' : 9 }, { 'window' : 1 }, {}):
+            match = numpy.ones(len(rows), dtype = bool)
+            for key, name in (('scan', 'SCAN'), ('integration', 'INT'),
+                              ('polarization', 'PLNUM'), ('feed', 'FDNUM')):
+                if key in query:
+                    match &= numpy.in1d(rows[name], query[key])
+            if query.get('window', 0) != 0:
+                match[:] = False
+            self.assertEqual(list(table.GetRows(**query)),
+                             list(numpy.flatnonzero(match)))
+
+if __name__ == '__main__':
+    unittest.main()
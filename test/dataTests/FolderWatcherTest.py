@@ -0,0 +1,123 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import sys
+
+if __name__ == "__main__":
+    sys.path[1:1] = ["..", "../../"]
+
+from data.FolderWatcher import FolderWatcher, pyinotify
+import os
+import shutil
+import StringIO
+import tempfile
+import time
+import unittest
+
+class FolderWatcherTest(unittest.TestCase):
+    "Tests of the watcher of directories of incoming data files."
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.write("old.txt", "1 2\n")
+        self.loaded  = []
+        self.watcher = FolderWatcher(self.directory, "*.txt",
+                                     lambda path, data: self.loaded.append(
+                                         (os.path.basename(path), data)),
+                                     inotify = False)
+
+    def tearDown(self):
+        self.watcher.Stop()
+        shutil.rmtree(self.directory)
+
+    def write(self, name, text, mtime=None):
+        path = os.path.join(self.directory, name)
+        f = open(path, "w")
+        f.write(text)
+        f.close()
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+
+    def testScan(self):
+        self.watcher.settle = 0
+        self.watcher.seen = self.watcher.List()
+        self.write("new.txt", "1 2\n3 4\n", 100)
+        self.write("other.dat", "5 6\n")
+
+        # New files are loaded once they have settled.
+        assert self.watcher.Scan() == []
+        ready = self.watcher.Scan()
+        assert [os.path.basename(path) for path in ready] == ["new.txt"]
+        assert self.watcher.Scan() == []
+
+        # Changed files again.
+        self.write("new.txt", "1 2\n3 4\n5 6\n", 200)
+        self.watcher.Scan()
+        assert len(self.watcher.Scan()) == 1
+
+    def testSettle(self):
+        # Listings in quick succession, as inotify events cause, do not
+        # load a file until it has been unchanged for the settle time.
+        self.watcher.settle = 0.2
+        self.watcher.seen = self.watcher.List()
+        self.write("new.txt", "1 2\n", 100)
+        assert self.watcher.Scan() == []
+        assert self.watcher.Scan() == []
+        time.sleep(0.1)
+        self.write("new.txt", "1 2\n3 4\n", 100)
+        assert self.watcher.Scan() == []
+        time.sleep(0.15)
+        assert self.watcher.Scan() == []
+        time.sleep(0.1)
+        ready = self.watcher.Scan()
+        assert [os.path.basename(path) for path in ready] == ["new.txt"]
+
+    def testWatch(self):
+        self.watcher.interval = 0.01
+        self.watcher.Start()
+        self.write("new.txt", "1 2\n3 4\n")
+        self.write("bad.txt", "1 x\n")
+        for i in range(200):
+            if self.loaded: break
+            time.sleep(0.01)
+        self.watcher.Stop()
+
+        assert [name for name, data in self.loaded] == ["new.txt"]
+        assert self.loaded[0][1].tolist() == [[1, 2], [3, 4]]
+
+    @unittest.skipIf(pyinotify is None, "pyinotify is not installed")
+    def testInotify(self):
+        self.watcher.interval = 0.5
+        self.watcher.inotify  = True
+        stdout, sys.stdout = sys.stdout, StringIO.StringIO()
+        try:
+            self.watcher.Start()
+            self.write("new.txt", "1 2\n3 4\n")
+            for i in range(200):
+                if self.loaded: break
+                time.sleep(0.01)
+            self.watcher.Stop()
+            printed = sys.stdout.getvalue()
+        finally:
+            sys.stdout = stdout
+
+        assert [name for name, data in self.loaded] == ["new.txt"]
+        # Events are handled quietly.
+        assert printed == ""
+
+if __name__ == '__main__':
+    unittest.main()
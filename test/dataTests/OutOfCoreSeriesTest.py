@@ -0,0 +1,93 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import sys
+
+if __name__ == "__main__":
+    sys.path[1:1] = ["..", "../../"]
+
+from data.OutOfCoreSeries import OutOfCoreSeries
+import numpy
+import os
+import tempfile
+import unittest
+
+class OutOfCoreSeriesTest(unittest.TestCase):
+    "Tests of memory mapped series and their pyramid index."
+
+    def setUp(self):
+        random = numpy.random.RandomState(7)
+        self.y = random.standard_normal(100000).cumsum()
+        self.y[500:600] = numpy.nan
+        self.path = tempfile.mktemp(suffix = ".f8")
+        self.y.astype('<f8').tofile(self.path)
+
+    def tearDown(self):
+        for path in (self.path, self.path + ".pyr", self.path + ".pyr.tmp"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def testLimits(self):
+        series = OutOfCoreSeries(self.path, x0 = 10.0, dx = 0.5, block = 64,
+                                 fanout = 4, chunk = 1000)
+        xmin, xmax, ymin, ymax = series.GetDataLimits()
+        assert (xmin, xmax) == (10.0, 10.0 + 0.5 * 99999)
+        assert ymin == numpy.nanmin(self.y) and ymax == numpy.nanmax(self.y)
+
+    def testReuse(self):
+        series = OutOfCoreSeries(self.path, block = 64, fanout = 4)
+        assert os.path.exists(self.path + ".pyr")
+
+        reopened = OutOfCoreSeries(self.path, block = 64, fanout = 4)
+        assert isinstance(reopened.levels[0], numpy.memmap)
+        for a, b in zip(series.levels, reopened.levels):
+            assert numpy.array_equal(numpy.isnan(a), numpy.isnan(b))
+            assert (a[numpy.isfinite(a)] == b[numpy.isfinite(b)]).all()
+
+        # A different layout replaces the pyramid, which no longer fits.
+        OutOfCoreSeries(self.path, block = 32, fanout = 4)
+        assert series.Load() is None
+
+    def testInterruptedBuild(self):
+        series = OutOfCoreSeries(self.path, block = 64, fanout = 4)
+        os.remove(self.path + ".pyr")
+
+        def interrupt(fraction):
+            if fraction > 0.5:
+                raise KeyboardInterrupt
+        self.assertRaises(KeyboardInterrupt, series.Build, interrupt)
+        assert not os.path.exists(self.path + ".pyr")
+        assert not os.path.exists(self.path + ".pyr.tmp")
+        assert series.Load() is None
+
+        # The next series builds the pyramid again, in full.
+        rebuilt = OutOfCoreSeries(self.path, block = 64, fanout = 4)
+        assert rebuilt.Load() is not None
+        assert rebuilt.GetDataLimits()[2:] == series.GetDataLimits()[2:]
+
+    def testEnvelope(self):
+        series = OutOfCoreSeries(self.path, block = 64, fanout = 4)
+        x, y = series.envelope(0, 99999, 100)
+        assert 100 <= len(x) // 2 <= 400
+        assert numpy.nanmin(y) == numpy.nanmin(self.y)
+        assert numpy.nanmax(y) == numpy.nanmax(self.y)
+
+        x, y = series.envelope(1000, 1100, 100)
+        assert (y == self.y[int(x[0]):int(x[-1]) + 1]).all()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import sys
+
+if __name__ == "__main__":
+    sys.path[1:1] = ["..", "../../"]
+
+from data.AsciiLoader import AsciiLoader
+from data.ParseCache import ParseCache
+import numpy
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+class ParseCacheTest(unittest.TestCase):
+    "Tests of the cache of parsed data files."
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "data.txt")
+        numpy.savetxt(self.path, numpy.arange(300.0).reshape(-1, 3))
+        self.cache = ParseCache(os.path.join(self.directory, "cache"))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testKeys(self):
+        key = self.cache.GetKey(self.path, {'columns' : None})
+        assert key == self.cache.GetKey(self.path, {'columns' : None})
+        assert key != self.cache.GetKey(self.path, {'columns' : [0]})
+        assert self.cache.get(key) is None
+
+        # A changed file has a new key.
+        os.utime(self.path, (time.time() + 10, time.time() + 10))
+        assert key != self.cache.GetKey(self.path, {'columns' : None})
+
+    def testLoad(self):
+        data = AsciiLoader(self.path, cache = self.cache).Load()
+        loader = AsciiLoader(self.path, cache = self.cache)
+        again = loader.Load()
+        assert loader.GetStatistics()['cached']
+        assert isinstance(again, numpy.memmap)
+        assert (again == data).all()
+
+        loader = AsciiLoader(self.path, columns = 1, cache = self.cache)
+        assert (loader.Load()[:, 0] == data[:, 1]).all()
+        assert not loader.GetStatistics()['cached']
+        assert self.cache.GetStatistics()['entries'] == 2
+        assert self.cache.GetEntries()[0]['source'] == self.path
+
+    def testWritableHit(self):
+        data = AsciiLoader(self.path, cache = self.cache).Load()
+        for n in range(2):
+            again = AsciiLoader(self.path, cache = self.cache).Load()
+            # Changes stay with the array; the entry is unchanged.
+            again -= 1.0
+            assert (again == data - 1.0).all()
+
+    def testEviction(self):
+        array = numpy.zeros(1000)
+        self.cache.maxsize = 3 * array.nbytes + 1000 # room for 3 entries
+        for n in range(3):
+            self.cache.put("entry%d" % n, array)
+            os.utime(self.cache.GetPath("entry%d" % n), (n, n))
+        self.cache.get("entry0") # now the most recently used
+        self.cache.put("entry3", array)
+
+        keys = [entry['key'] for entry in self.cache.GetEntries()]
+        assert sorted(keys) == ["entry0", "entry2", "entry3"]
+        assert self.cache.Purge() == 3
+        assert self.cache.GetEntries() == []
+
+if __name__ == '__main__':
+    unittest.main()
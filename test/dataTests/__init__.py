@@ -0,0 +1,7 @@
+from OutOfCoreSeriesTest import OutOfCoreSeriesTest
+from FitsTableTest import FitsTableTest
+from AsciiLoaderTest import AsciiLoaderTest
+from ParseCacheTest import ParseCacheTest
+from FolderWatcherTest import FolderWatcherTest
+from FileFollowerTest import FileFollowerTest
+from DataExporterTest import DataExporterTest
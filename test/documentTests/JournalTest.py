@@ -0,0 +1,90 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import sys
+
+if __name__ == "__main__":
+    sys.path[1:1] = ["..", "../../"]
+
+from   document.Journal import Journal, find_orphans, read_journal
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+class JournalTest(unittest.TestCase):
+    "Tests of the append-only session journal."
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.journal   = Journal(self.directory, interval = 0.01)
+
+    def tearDown(self):
+        self.journal.Close()
+        shutil.rmtree(self.directory)
+
+    def testRecords(self):
+        for command in ("x = 1", "plot([x, 2])", "title('a\\nb')"):
+            self.journal.Append(command)
+        self.journal.Undo()
+        self.journal.Undo()
+        self.journal.Redo()
+        undo, redo = read_journal(self.journal.GetPath())
+        assert undo == ["x = 1", "plot([x, 2])"]
+        assert redo == ["title('a\\nb')"]
+
+        # A new command drops those undone.
+        self.journal.Append("grid()")
+        assert read_journal(self.journal.GetPath()) == \
+               (["x = 1", "plot([x, 2])", "grid()"], [])
+
+    def testTornRecord(self):
+        self.journal.Append("x = 1")
+        f = open(self.journal.GetPath(), "a")
+        f.write('{"do": "plot(')
+        f.close()
+        assert read_journal(self.journal.GetPath()) == (["x = 1"], [])
+
+    def testCompact(self):
+        for command in ("a = 1", "b = 2", "c = 3", "d = 4"):
+            self.journal.Append(command)
+        self.journal.Undo()
+        self.journal.Undo()
+        undo, redo = read_journal(self.journal.GetPath())
+        self.journal.Compact(undo, redo)
+        assert read_journal(self.journal.GetPath()) == (undo, redo)
+
+        # The journal is still appended to after compaction.
+        self.journal.Redo()
+        assert read_journal(self.journal.GetPath())[0][-1] == "c = 3"
+
+    def testOrphans(self):
+        assert find_orphans(self.directory) == []
+
+        child = subprocess.Popen([sys.executable, "-c", "pass"])
+        child.wait()
+        orphan = os.path.join(self.directory, "session-%d.journal" % child.pid)
+        open(orphan, "w").close()
+        assert find_orphans(self.directory) == [orphan]
+
+        path = self.journal.GetPath()
+        self.journal.Close()
+        assert not os.path.exists(path)
+
+if __name__ == '__main__':
+    unittest.main()
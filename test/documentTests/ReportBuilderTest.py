@@ -0,0 +1,173 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import sys
+
+if __name__ == "__main__":
+    sys.path[1:1] = ["..", "../../"]
+
+from   document.ReportBuilder import ReportBuilder, render_script
+from   document.ReportBuilder import start_workers
+import numpy
+import os
+import re
+import shutil
+import tempfile
+import unittest
+
+SCRIPT = """
+bar([1, 2, 3], [3, 1, 2], label = "bars")
+scatter([1, 2, 3], [2, 3, 1], c = [1, 2, 3], label = "points")
+annotate("peak", (1, 3), xytext = (2, 3.5), arrowprops = dict())
+legend()
+title("report")
+"""
+
+def caption(text):
+    "Stands in for a function of the command line."
+    import pylab
+    pylab.gca().set_title(text)
+
+def namespace():
+    return { 'caption' : caption }
+
+def render(script, directory, dpi, namespace=None):
+    "Stands in for running a script: the page holds the script's name."
+    if script == "broken.py":
+        raise ValueError(script)
+    handle, path = tempfile.mkstemp(".npy", "page", directory)
+    os.write(handle, script)
+    os.close(handle)
+    return path
+
+class Recorder(ReportBuilder):
+    "Keeps the pages written instead of drawing them."
+
+    def WritePage(self, pdf, snapshot):
+        f = open(snapshot)
+        self.written.append((f.read(), os.path.dirname(snapshot)))
+        f.close()
+
+class ReportBuilderTest(unittest.TestCase):
+    "Tests of the pipelined writing of report pages."
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "report.pdf")
+        self.builder = Recorder(self.path, 2, 3, render)
+        self.builder.written = []
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testOrder(self):
+        scripts = ["page%d.py" % n for n in range(10)]
+        counts = []
+        self.assertEqual(self.builder.Build(scripts, counts.append), 10)
+        self.assertEqual([page for page, directory in self.builder.written],
+                         scripts)
+        self.assertEqual(counts, range(1, 11))
+        # The rendered pages are removed once written.
+        directory = self.builder.written[0][1]
+        self.failIf(os.path.exists(directory))
+        self.failUnless(os.path.exists(self.path))
+
+    def testSnapshots(self):
+        snapshot = os.path.join(self.directory, "saved.deap")
+        f = open(snapshot, "w")
+        f.write("saved")
+        f.close()
+        self.builder.Build(["first.py", snapshot, "last.py"])
+        self.assertEqual([page for page, directory in self.builder.written],
+                         ["first.py", "saved", "last.py"])
+        # Snapshots given as pages are left alone.
+        self.failUnless(os.path.exists(snapshot))
+
+    def testError(self):
+        self.assertRaises(ValueError, self.builder.Build,
+                          ["page0.py", "broken.py", "page2.py"])
+        self.assertEqual([page for page, directory in self.builder.written],
+                         ["page0.py"])
+
+    def testScripts(self):
+        script = os.path.join(self.directory, "page.py")
+        f = open(script, "w")
+        f.write(SCRIPT)
+        f.close()
+        builder = ReportBuilder(self.path, 1, dpi = 50)
+        self.assertEqual(builder.Build([script, script]), 2)
+        f = open(self.path, "rb")
+        pdf = f.read()
+        f.close()
+        self.failUnless(pdf.startswith("%PDF"))
+        self.assertEqual(re.findall(r"/Count (\d+)", pdf), ["2"])
+
+    def testRenderScript(self):
+        # The page is drawn from the figure the script made, with all of
+        # its artists.
+        script = os.path.join(self.directory, "page.py")
+        f = open(script, "w")
+        f.write(SCRIPT)
+        f.close()
+        pixels = numpy.load(render_script(script, self.directory, 50))
+
+        import pylab
+        pylab.switch_backend('Agg')
+        pylab.close('all')
+        namespace = {}
+        exec "from pylab import *" in namespace
+        exec SCRIPT in namespace
+        figure = pylab.gcf()
+        figure.set_dpi(50)
+        figure.canvas.draw()
+        width, height = figure.canvas.get_width_height()
+        expected = numpy.frombuffer(figure.canvas.buffer_rgba(), numpy.uint8)
+        pylab.close('all')
+        self.failUnless((pixels == expected.reshape((height, width, 4))).all())
+
+    def testNamespace(self):
+        script = os.path.join(self.directory, "page.py")
+        f = open(script, "w")
+        f.write("plot([1, 2])\ncaption('page')\n")
+        f.close()
+        self.assertRaises(NameError, render_script, script, self.directory,
+                          50)
+        pixels = numpy.load(render_script(script, self.directory, 50,
+                                          namespace))
+        self.assertEqual(pixels.shape, (240, 320, 4))
+
+    def testWorkers(self):
+        script = os.path.join(self.directory, "page.py")
+        f = open(script, "w")
+        f.write("plot([1, 2])\ncaption('page')\n")
+        f.close()
+        module  = sys.modules[ReportBuilder.__module__]
+        workers = start_workers(1)
+        try:
+            self.failUnless(start_workers() is workers)
+            builder = ReportBuilder(self.path, dpi = 50,
+                                    namespace = namespace)
+            self.assertEqual(builder.Build([script, script]), 2)
+            # The workers are still there for the next report.
+            self.assertEqual(workers.apply(abs, (-1,)), 1)
+        finally:
+            workers.terminate()
+            workers.join()
+            module.workers = None
+
+if __name__ == "__main__":
+    unittest.main()
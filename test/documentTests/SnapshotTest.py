@@ -0,0 +1,208 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import sys
+
+if __name__ == "__main__":
+    sys.path[1:1] = ["..", "../../"]
+
+from   document.Document import Document
+from   document.Journal import Journal, read_journal
+from   document.Snapshot import Snapshot
+from   document.Snapshot import jsonable, read_snapshot, write_snapshot
+from   matplotlib.backends.backend_agg import FigureCanvasAgg
+from   matplotlib.figure import Figure
+from   matplotlib.ticker import FuncFormatter
+import numpy
+import os
+import shutil
+import tempfile
+import unittest
+
+class Plotter:
+    "Stands in for the plot view of a document."
+
+    def __init__(self):
+        self.figure = Figure()
+
+    def get_figure(self):
+        return self.figure
+
+    def GetAxesLimits(self):
+        return None
+
+    def draw(self):
+        pass
+
+class SnapshotTest(unittest.TestCase):
+    "Tests of the session snapshot file format."
+
+    def setUp(self):
+        self.path = tempfile.mktemp(suffix = ".deap")
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def testJsonable(self):
+        value = jsonable(((0, 1), numpy.float32(0.5), numpy.arange(2)))
+        assert value == [[0, 1], 0.5, [0, 1]]
+        assert type(value[1]) is float
+
+    def testRoundTrip(self):
+        arrays = [numpy.arange(10.0), numpy.zeros((0,)),
+                  numpy.arange(12, dtype = numpy.uint8).reshape(3, 4),
+                  numpy.arange(20, dtype = '>i4')[::2]]
+        write_snapshot(self.path, {'history' : ["plot([1, 2])\n"]}, arrays)
+
+        header, restored = read_snapshot(self.path)
+        assert header['history'] == ["plot([1, 2])\n"]
+        assert len(restored) == len(arrays)
+        for array, entry in zip(restored, header['arrays']):
+            assert (header['start'] + entry['offset']) % 64 == 0
+        for array, saved in zip(arrays, restored):
+            assert array.dtype == saved.dtype
+            assert (array == saved).all()
+        assert isinstance(restored[0], numpy.memmap)
+
+    def testOverwriteMapped(self):
+        # Saving over a snapshot that is mapped leaves the mapping intact.
+        write_snapshot(self.path, {}, [numpy.arange(5.0)])
+        header, arrays = read_snapshot(self.path)
+        write_snapshot(self.path, {}, [numpy.ones(5)])
+        assert list(arrays[0]) == [0, 1, 2, 3, 4]
+        assert list(read_snapshot(self.path)[1][0]) == [1] * 5
+
+    def render(self, figure):
+        "Returns the pixels of C{figure}."
+        canvas = FigureCanvasAgg(figure)
+        canvas.draw()
+        return numpy.frombuffer(canvas.tostring_rgb(), numpy.uint8)
+
+    def makeFigure(self):
+        figure = Figure(figsize = (4, 3), dpi = 72)
+        FigureCanvasAgg(figure)
+        return figure
+
+    def testArtists(self):
+        figure = self.makeFigure()
+        axes = figure.add_subplot(211)
+        x = numpy.linspace(0, 10, 50)
+        axes.plot(x, numpy.sin(x), 'r-', label = 'sine')
+        axes.scatter(x[::5], numpy.cos(x[::5]), s = x[::5] * 10,
+                     c = 'b', marker = 's', label = 'points')
+        axes.scatter(x[::7], -numpy.cos(x[::7]), c = x[::7])
+        axes.fill_between(x, -0.5, numpy.sin(x) / 2, alpha = 0.3)
+        axes.bar([1, 3, 5], [0.5, -0.5, 1.0], color = 'g', label = 'bars')
+        axes.annotate("peak", (1.6, 1.0), xytext = (4, 1.5),
+                      arrowprops = {'arrowstyle' : '->'})
+        axes.text(0.05, 0.9, "corner", transform = axes.transAxes)
+        axes.legend(loc = 'lower left')
+        axes.grid(True)
+        axes.set_xticks([0, 5, 10])
+        axes.set_xticklabels(['start', 'middle', 'end'])
+
+        other = figure.add_subplot(212)
+        y, x = numpy.mgrid[0:5, 0:6]
+        other.pcolormesh(x, y, x * y, cmap = 'gray')
+        other.contour(x, y, x + y, colors = 'r')
+        figure.suptitle("title")
+
+        before = self.render(figure)
+        assert Snapshot(self.path).Save(figure) == []
+
+        restored = self.makeFigure()
+        Snapshot(self.path).Restore(restored)
+        after = self.render(restored)
+        # Meshes come back as paths, whose edges are rasterized a little
+        # differently; anything missing would change far more.
+        assert (before != after).mean() < 0.02
+
+        axes = restored.get_axes()[0]
+        assert [t.get_text() for t in axes.get_legend().get_texts()] == \
+               ['sine', 'points', 'bars']
+        assert [t.get_text() for t in axes.texts] == ["peak", "corner"]
+        assert axes.texts[0].xy == [1.6, 1.0]
+        assert len(axes.collections) == 3 and len(axes.patches) == 3
+
+    def testTwins(self):
+        figure = self.makeFigure()
+        axes = figure.add_subplot(111)
+        axes.plot([0, 1, 2], [0, 1, 4], 'r-')
+        twin = axes.twinx()
+        twin.plot([0, 1, 2], [30, 20, 10], 'b-')
+        twin.set_ylabel("twin")
+        inset = figure.add_axes([0.6, 0.6, 0.2, 0.2])
+        figure.add_axes([0.6, 0.6, 0.2, 0.2], label = "overlay")
+
+        before = self.render(figure)
+        Snapshot(self.path).Save(figure)
+        restored = self.makeFigure()
+        Snapshot(self.path).Restore(restored)
+        after = self.render(restored)
+        assert (before != after).mean() < 0.001
+
+        axes, twin, inset, overlay = restored.get_axes()
+        assert list(axes.lines[0].get_ydata()) == [0, 1, 4]
+        assert list(twin.lines[0].get_ydata()) == [30, 20, 10]
+        assert twin.get_ylim() == (9.0, 31.0)
+        assert twin.get_ylabel() == "twin"
+        assert inset is not overlay
+
+    def testSkipped(self):
+        figure = self.makeFigure()
+        axes = figure.add_subplot(111)
+        axes.plot([1, 2, 3])
+        axes.xaxis.set_major_formatter(FuncFormatter(lambda x, n: "%d" % x))
+        axes.text(0, 0, "offset", transform = axes.transAxes
+                                              + axes.transData.inverted())
+
+        snapshot = Snapshot(self.path)
+        assert len(snapshot.Save(figure, history = ["plot([1, 2, 3])\n"])) == 2
+        assert len(snapshot.GetSkipped()) == 2
+        assert snapshot.GetHistory() == ["plot([1, 2, 3])\n"]
+
+    def testNotASnapshot(self):
+        f = open(self.path, "w")
+        f.write("plot([1, 2])\n")
+        f.close()
+        self.assertRaises(ValueError, read_snapshot, self.path)
+
+    def testOpenJournal(self):
+        figure = Figure()
+        figure.add_subplot(111).plot([1, 2, 3])
+        Snapshot(self.path).Save(figure, history = ["plot([1, 2, 3])"])
+
+        directory = tempfile.mkdtemp()
+        document  = Document()
+        document.SetPlotter(Plotter())
+        document.SetJournal(Journal(directory))
+        try:
+            for command in ("x = 1", "plot([x])"):
+                document.AddUndo(command)
+            document.OpenSnapshot(self.path)
+            # Recovering the journal gives the session opened, alone.
+            path = document.GetJournal().GetPath()
+            assert read_journal(path) == (["plot([1, 2, 3])"], [])
+            document.AddUndo("grid()")
+            assert read_journal(path) == (["plot([1, 2, 3])", "grid()"], [])
+        finally:
+            document.CloseJournal()
+            shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,6 @@
 from DocumentTest import DocumentTestCase
 from ImageElementTest import ImageElementTestCase
 
+from SnapshotTest import SnapshotTest
+from JournalTest import JournalTest
+from ReportBuilderTest import ReportBuilderTest
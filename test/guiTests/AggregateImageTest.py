@@ -0,0 +1,57 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import sys
+
+if __name__ == "__main__":
+    sys.path[1:1] = ["..", "../../"]
+
+from gui.framework.AggregateImage import aggregate_points
+import numpy
+import unittest
+
+class AggregateImageTest(unittest.TestCase):
+    "Tests of the scatter plot aggregation."
+
+    def setUp(self):
+        self.x = numpy.array([0.1, 0.2, 1.5, 1.6, 1.7, 5.0])
+        self.y = numpy.array([0.1, 0.1, 1.2, 1.3, 0.5, 0.5])
+        self.v = numpy.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+
+    def aggregate(self, how):
+        return aggregate_points(self.x, self.y, self.v, (0, 2), (0, 2), 2, 2,
+                                how)
+
+    def testCount(self):
+        grid = self.aggregate('count')
+        assert grid[0, 0] == 2 and grid[0, 1] == 1 and grid[1, 1] == 2
+        assert grid.mask[1, 0]
+        assert grid.sum() == 5
+
+    def testMean(self):
+        grid = self.aggregate('mean')
+        assert grid[0, 0] == 1.5 and grid[1, 1] == 3.5
+
+    def testMax(self):
+        grid = self.aggregate('max')
+        assert grid[0, 0] == 2.0 and grid[0, 1] == 5.0 and grid[1, 1] == 4.0
+
+    def testUnknown(self):
+        self.assertRaises(ValueError, self.aggregate, 'median')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import sys
+
+if __name__ == "__main__":
+    sys.path[1:1] = ["..", "../../"]
+from   gui.framework.ArtistCuller import ArtistCuller
+from   matplotlib.backends.backend_agg import FigureCanvasAgg
+from   matplotlib.figure import Figure
+from   matplotlib.patches import Rectangle
+import numpy
+import unittest
+
+class ArtistCullerTest(unittest.TestCase):
+    "Tests of the culling of artists outside the view."
+
+    def setUp(self):
+        self.figure = Figure(figsize = (4, 4), dpi = 100)
+        FigureCanvasAgg(self.figure)
+        self.axes = self.figure.add_subplot(111)
+        self.axes.set_xlim(0, 10)
+        self.axes.set_ylim(0, 10)
+        self.culler = ArtistCuller()
+
+    def testCull(self):
+        inside,  = self.axes.plot([1, 2], [1, 2])
+        outside, = self.axes.plot([20, 30], [20, 30])
+        across,  = self.axes.plot([-5, 15], [5, 5])
+        patch    = self.axes.add_patch(Rectangle((50, 50), 1, 1))
+        far      = self.axes.text(100, 100, "far")
+        near     = self.axes.text(9, 9, "near")
+        # Text placed in axes coordinates has no data bounds.
+        fixed    = self.axes.text(5, 5, "fixed",
+                                  transform = self.axes.transAxes)
+
+        hidden = self.culler.Cull(self.figure)
+        self.assertEqual(set(hidden), set([outside, patch, far]))
+        for artist in (inside, across, near, fixed):
+            self.failUnless(artist.get_visible())
+
+        self.culler.Restore(hidden)
+        for artist in hidden:
+            self.failUnless(artist.get_visible())
+
+    def testAnnotations(self):
+        outside = self.axes.annotate("far", (50, 50), xytext = (60, 60))
+        inside  = self.axes.annotate("near", (5, 5), xytext = (60, 60))
+        offset  = self.axes.annotate("offset", (50, 50), xytext = (0, 0),
+                                     textcoords = 'offset points')
+        self.assertEqual(self.culler.Cull(self.figure), [outside])
+
+    def testInverted(self):
+        inside,  = self.axes.plot([1, 2], [1, 2])
+        outside, = self.axes.plot([-20, -10], [1, 2])
+        self.axes.set_xlim(10, 0)
+        self.assertEqual(self.culler.Cull(self.figure), [outside])
+
+    def testMargin(self):
+        # A line just beyond the edge still reaches in with its markers.
+        edge, = self.axes.plot([10.05], [5], 'o', markersize = 20)
+        self.assertEqual(self.culler.Cull(self.figure), [])
+
+    def testDisabled(self):
+        outside, = self.axes.plot([20, 30], [20, 30])
+        self.culler.SetEnabled(False)
+        self.failIf(self.culler.IsEnabled())
+        self.assertEqual(self.culler.Cull(self.figure), [])
+
+    def testBounds(self):
+        line, = self.axes.plot([1, 2, numpy.nan], [3, 4, 5])
+        self.assertEqual(self.culler.GetBounds(self.axes, line), (1, 3, 2, 5))
+        # New data is picked up without invalidating.
+        line.set_data([20, 30], [20, 30])
+        self.assertEqual(self.culler.GetBounds(self.axes, line),
+                         (20, 20, 30, 30))
+        self.assertEqual(self.culler.Cull(self.figure), [line])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import sys
+
+if __name__ == "__main__":
+    sys.path[1:1] = ["..", "../../"]
+
+from gui.framework.DensityImage import rasterize_traces
+import numpy
+import unittest
+
+class DensityImageTest(unittest.TestCase):
+    "Tests of the trace density raster."
+
+    def testStep(self):
+        x      = numpy.arange(10.0)
+        traces = numpy.array([[0, 0, 0, 0, 0, 9, 9, 9, 9, 9.0]])
+        raster = rasterize_traces(x, traces, (0, 9), (0, 10), 9, 10)
+        assert raster.shape == (10, 9)
+        assert list(raster[0]) == [1, 1, 1, 1, 1, 0, 0, 0, 0]
+        assert list(raster[9]) == [0, 0, 0, 0, 1, 1, 1, 1, 1]
+        assert list(raster[:, 4]) == [1] * 10
+
+    def testCounts(self):
+        # Every trace crosses every column once, whatever the sampling.
+        x      = numpy.linspace(0.0, 1.0, 1000)
+        traces = numpy.sin(numpy.outer(numpy.arange(1, 21), x))
+        raster = rasterize_traces(x, traces, (0.0, 1.0), (-2.0, 2.0), 50, 40)
+        assert (raster.sum(axis = 0) >= 20).all()
+        assert raster.max() <= 20
+
+    def testVisibleRange(self):
+        x      = numpy.arange(100.0)[::-1]
+        traces = numpy.ones((3, 100))
+        traces[1, :] = numpy.nan
+        raster = rasterize_traces(x, traces, (40, 60), (0, 2), 20, 4)
+        assert list(raster[2]) == [2] * 20
+        assert raster.sum() == 40
+        empty = rasterize_traces(x, traces, (200, 300), (0, 2), 20, 4)
+        assert empty.shape == (4, 20) and empty.sum() == 0
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import sys
+
+if __name__ == "__main__":
+    sys.path[1:1] = ["..", "../../"]
+from gui.framework.ConfigValues import ConfigValues
+from gui.framework.FrameRateGovernor import FrameRateGovernor, LEVELS
+import os
+import tempfile
+import unittest
+
+class Application:
+    "Stands in for the application, holding its configuration."
+
+    def __init__(self, configPath):
+        self.configValues = ConfigValues(configPath)
+
+class FrameRateGovernorTest(unittest.TestCase):
+    "Tests of the interactive frame rate governor."
+
+    def setUp(self):
+        self.governor = FrameRateGovernor(None, targetFps = 10.0, window = 2)
+
+    def testSettings(self):
+        self.governor.SetSettings(targetFps = 20, window = 0)
+        settings = self.governor.GetSettings()
+        self.assertEqual(settings['targetFps'], 20.0)
+        self.assertEqual(settings['window'], 1)
+        self.assertAlmostEqual(settings['lowerAbove'], 0.05)
+
+    def testInvalidRate(self):
+        for rate in (0, -5):
+            self.assertRaises(ValueError, self.governor.SetSettings,
+                              targetFps = rate)
+        self.assertEqual(self.governor.GetBudget(), 0.1)
+        self.assertRaises(ValueError, FrameRateGovernor, None, 0)
+
+    def testAdjust(self):
+        for elapsed in (0.2, 0.2, 0.2, 0.2):
+            self.governor.Adjust(elapsed)
+        self.assertEqual(self.governor.level, 2)
+        for elapsed in [0.01] * 10:
+            self.governor.Adjust(elapsed)
+        self.assertEqual(self.governor.level, 0)
+        for elapsed in [1.0] * 4 * len(LEVELS):
+            self.governor.Adjust(elapsed)
+        self.assertEqual(self.governor.level, len(LEVELS) - 1)
+
+    def testLoadSettings(self):
+        handle, path = tempfile.mkstemp(".conf")
+        os.write(handle, "[Governor]\ntargetFps = 15\nwindow = 8\n")
+        os.close(handle)
+        try:
+            application = Application(path)
+            # The configuration has not been read yet.
+            self.governor.LoadSettings(application)
+            self.assertEqual(self.governor.targetFps, 10.0)
+            self.governor.LoadSettings(None)
+            self.assertEqual(self.governor.targetFps, 10.0)
+
+            application.configValues.InitConfig()
+            self.governor.LoadSettings(application)
+            self.assertEqual(self.governor.targetFps, 15.0)
+            self.assertEqual(self.governor.window, 8)
+        finally:
+            os.remove(path)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import sys
+
+if __name__ == "__main__":
+    sys.path[1:1] = ["..", "../../"]
+from   gui.framework.GridLayout import GridLayout
+from   matplotlib.backends.backend_agg import FigureCanvasAgg
+from   matplotlib.figure import Figure
+import unittest
+
+class GridLayoutTest(unittest.TestCase):
+    "Tests of the subplot grid layout."
+
+    def setUp(self):
+        self.figure = Figure(figsize = (6, 4), dpi = 100)
+        FigureCanvasAgg(self.figure)
+        self.axes = [self.figure.add_subplot(2, 2, n) for n in range(1, 5)]
+        self.layout = GridLayout()
+
+    def assertPosition(self, axes, position):
+        for a, b in zip(axes.get_position().bounds, position):
+            self.assertAlmostEqual(a, b)
+
+    def testPositions(self):
+        positions = self.layout.GetPositions(self.figure, 2, 2)
+        self.assertEqual(len(positions), 4)
+        for axes, position in zip(self.axes, positions):
+            self.assertPosition(axes, position)
+        # Positions are computed once per grid.
+        self.failUnless(self.layout.GetPositions(self.figure, 2, 2)
+                        is positions)
+
+    def testFocus(self):
+        focus = self.axes[1]
+        self.layout.Focus(self.figure, focus)
+        self.assertPosition(focus, self.layout.GetFocusPosition(self.figure))
+        self.assertEqual([axes.get_visible() for axes in self.axes],
+                         [False, True, False, False])
+
+        self.layout.Unfocus(self.figure, focus)
+        self.assertPosition(focus, self.layout.GetCellPosition(focus))
+        self.failUnless(all([axes.get_visible() for axes in self.axes]))
+
+    def testUnfocusKeepsPosition(self):
+        focus = self.axes[2]
+        focus.set_position([0.1, 0.1, 0.3, 0.2])
+        self.layout.Focus(self.figure, focus)
+        self.layout.Unfocus(self.figure, focus)
+        self.assertPosition(focus, [0.1, 0.1, 0.3, 0.2])
+
+    def testTightKeepsPosition(self):
+        moved = self.axes[3]
+        moved.set_position([0.6, 0.1, 0.3, 0.2])
+        renderer = self.figure.canvas.get_renderer()
+        for axes in self.axes:
+            axes.set_ylabel("label")
+
+        self.layout.SetTight(True)
+        self.failUnless(self.layout.Apply(self.figure, renderer))
+        tight = self.layout.GetPositions(self.figure, 2, 2,
+                                         self.layout.extents)
+        for axes, position in zip(self.axes[:3], tight):
+            self.assertPosition(axes, position)
+        self.assertPosition(moved, [0.6, 0.1, 0.3, 0.2])
+
+        # A panel moved while in tight mode is kept when it is turned off.
+        self.axes[0].set_position([0.05, 0.6, 0.2, 0.3])
+        self.layout.SetTight(False)
+        self.layout.Apply(self.figure, renderer)
+        self.assertPosition(self.axes[0], [0.05, 0.6, 0.2, 0.3])
+        for axes in self.axes[1:3]:
+            self.assertPosition(axes, self.layout.GetCellPosition(axes))
+        self.assertPosition(moved, [0.6, 0.1, 0.3, 0.2])
+
+    def testFocusKeepsOwnership(self):
+        focus = self.axes[2]
+        focus.set_position([0.1, 0.1, 0.3, 0.2])
+        self.layout.Focus(self.figure, focus)
+        self.layout.Unfocus(self.figure, focus)
+        self.layout.Apply(self.figure)
+        self.assertPosition(focus, [0.1, 0.1, 0.3, 0.2])
+
+        # A panel the layout placed is placed again after a focus.
+        self.layout.SetTight(True)
+        self.layout.Apply(self.figure, self.figure.canvas.get_renderer())
+        self.layout.Focus(self.figure, self.axes[0])
+        self.layout.Unfocus(self.figure, self.axes[0])
+        self.layout.SetTight(False)
+        self.layout.Apply(self.figure)
+        self.assertPosition(self.axes[0],
+                            self.layout.GetCellPosition(self.axes[0]))
+
+if __name__ == "__main__":
+    unittest.main()
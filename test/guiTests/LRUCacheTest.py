@@ -0,0 +1,63 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import sys
+
+if __name__ == "__main__":
+    sys.path[1:1] = ["..", "../../"]
+
+from gui.framework.LRUCache import LRUCache
+import unittest
+
+class LRUCacheTest(unittest.TestCase):
+    "Tests of the bounded cache."
+
+    def testEviction(self):
+        cache = LRUCache(3)
+        for key in "abc":
+            cache.put(key, key.upper())
+        assert cache.get("a") == "A"
+        cache.put("d", "D")
+        assert "b" not in cache
+        assert len(cache) == 3
+        assert cache.get("a") == "A" and cache.get("d") == "D"
+
+    def testWeigh(self):
+        cache = LRUCache(10, weigh = len)
+        cache.put(1, "xxxx")
+        cache.put(2, "xxxx")
+        cache.put(3, "xxxx")
+        assert 1 not in cache and cache.size == 8
+        cache.put(4, "x" * 11)
+        assert 4 not in cache
+        cache.put(2, "x")
+        assert cache.size == 5
+
+    def testStatistics(self):
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.get("a")
+        cache.get("b")
+        cache.get("a")
+        stats = cache.GetStatistics()
+        assert stats['hits'] == 2 and stats['misses'] == 1
+        assert abs(stats['hitRate'] - 2.0 / 3) < 1e-12
+        cache.clear()
+        assert len(cache) == 0 and cache.GetStatistics()['hits'] == 2
+
+if __name__ == '__main__':
+    unittest.main()
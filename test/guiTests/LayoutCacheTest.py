@@ -0,0 +1,102 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import sys
+
+if __name__ == "__main__":
+    sys.path[1:1] = ["..", "../../"]
+
+from gui.framework.LayoutCache import LayoutCache, CachedFormatter
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter
+import unittest
+
+class LayoutCacheTest(unittest.TestCase):
+    "Tests of the tick and text layout cache."
+
+    def setUp(self):
+        self.figure = Figure(figsize = (8, 4), dpi = 100)
+        FigureCanvasAgg(self.figure)
+        self.cache = LayoutCache()
+
+    def ticks(self, axes):
+        "Returns the major x ticks placed with the cache installed."
+        installed = self.cache.Install(self.figure)
+        try:
+            return list(axes.xaxis.major.locator())
+        finally:
+            self.cache.Uninstall(installed)
+
+    def testShared(self):
+        first  = self.figure.add_axes([0.1, 0.1, 0.35, 0.8])
+        second = self.figure.add_axes([0.55, 0.1, 0.35, 0.8])
+        for axes in (first, second):
+            axes.set_xlim(0, 1)
+        self.assertEqual(self.ticks(first), self.ticks(second))
+        self.assertEqual(self.cache.ticks.GetStatistics()['hits'], 1)
+
+    def testSize(self):
+        wide   = self.figure.add_axes([0.1, 0.55, 0.8, 0.35])
+        narrow = self.figure.add_axes([0.1, 0.1, 0.1, 0.35])
+        for axes in (wide, narrow):
+            axes.set_xlim(0, 1)
+        self.assertEqual(self.ticks(wide), list(wide.get_xticks()))
+        self.assertEqual(self.ticks(narrow), list(narrow.get_xticks()))
+        self.failUnless(len(self.ticks(narrow)) < len(self.ticks(wide)))
+
+        # Ticks follow a resize, a change of resolution and of label size.
+        self.figure.set_size_inches(2, 4)
+        self.assertEqual(self.ticks(wide), list(wide.get_xticks()))
+        self.figure.set_size_inches(8, 4)
+        self.figure.set_dpi(50)
+        self.assertEqual(self.ticks(wide), list(wide.get_xticks()))
+        self.figure.set_dpi(100)
+        wide.tick_params(labelsize = 40)
+        self.assertEqual(self.ticks(wide), list(wide.get_xticks()))
+
+    def testFuncFormatter(self):
+        axes = self.figure.add_subplot(111)
+        units = ["m"]
+        axes.xaxis.set_major_formatter(
+            FuncFormatter(lambda x, pos: "%g %s" % (x, units[0])))
+        installed = self.cache.Install(self.figure)
+        try:
+            formatter = axes.xaxis.major.formatter
+            self.failIf(isinstance(formatter, CachedFormatter))
+            self.assertEqual(formatter(1), "1 m")
+            units[0] = "km"
+            self.assertEqual(formatter(1), "1 km")
+        finally:
+            self.cache.Uninstall(installed)
+
+    def testExtents(self):
+        axes = self.figure.add_subplot(111)
+        axes.set_title("title")
+        renderer = self.figure.canvas.get_renderer()
+        for n in range(2):
+            installed = self.cache.Install(self.figure, renderer)
+            try:
+                self.figure.draw(renderer)
+            finally:
+                self.cache.Uninstall(installed)
+        statistics = self.cache.GetStatistics()
+        self.failUnless(statistics['extents']['hits'] > 0)
+        self.failUnless(statistics['labels']['hits'] > 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import sys
+
+if __name__ == "__main__":
+    sys.path[1:1] = ["..", "../../"]
+
+from gui.framework.LineIndex   import LineIndex
+from gui.framework.LineIndex   import fit_y
+from gui.framework.RangeMinMax import RangeMinMax
+from matplotlib.figure         import Figure
+import numpy
+import unittest
+
+class LineIndexTest(unittest.TestCase):
+    "Tests of the per-line search structures."
+
+    def setUp(self):
+        self.x = numpy.arange(0.0, 100.0, 0.5)
+        self.y = numpy.sin(self.x)
+
+        random = numpy.random.RandomState(42)
+        self.sx = random.uniform(-10.0, 10.0, 5000)
+        self.sy = random.uniform(-1.0, 1.0, 5000)
+
+    def testMonotonic(self):
+        index = LineIndex(self.x, self.y)
+        assert index.IsMonotonic()
+        assert not LineIndex(self.sx, self.sy).IsMonotonic()
+
+    def testNearestSorted(self):
+        index = LineIndex(self.x, self.y)
+        assert index.nearest(10.2, 0.0) == 20
+        assert index.nearest(10.3, 5.0) == 21
+        assert index.nearest(-3.0, 0.0) == 0
+        assert index.nearest(500.0, 0.0) == len(self.x) - 1
+
+    def testNearestScatter(self):
+        index = LineIndex(self.sx, self.sy)
+        for qx, qy in ((0.0, 0.0), (9.9, -0.9), (-25.0, 3.0), (3.3, 0.1)):
+            # Y is scaled up so that it dominates the distance metric.
+            distance = (self.sx - qx)**2 + ((self.sy - qy) * 10.0)**2
+            assert index.nearest(qx, qy, 1.0, 10.0) == distance.argmin()
+
+    def testNonFinite(self):
+        self.sy[:10] = numpy.nan
+        index = LineIndex(self.sx, self.sy)
+        assert index.nearest(self.sx[0], 0.0) >= 10
+        assert LineIndex([numpy.nan], [numpy.nan]).nearest(0.0, 0.0) is None
+
+    def testIsCurrent(self):
+        index = LineIndex(self.x, self.y)
+        assert index.IsCurrent(self.x, self.y)
+        assert not index.IsCurrent(self.x.copy(), self.y)
+
+    def testRangeMinMax(self):
+        extrema = RangeMinMax(self.sy, fanout = 4)
+        for lo, hi in ((0, 5000), (3, 4), (17, 2049), (4000, 4096), (9, 9)):
+            lower, upper = extrema.query(lo, hi)
+            if lo == hi:
+                assert numpy.isnan(lower) and numpy.isnan(upper)
+            else:
+                assert lower == self.sy[lo:hi].min()
+                assert upper == self.sy[lo:hi].max()
+
+    def testStatistics(self):
+        self.y[5] = numpy.nan
+        for x, y in ((self.x, self.y), (self.sx, self.sy)):
+            stats  = LineIndex(x, y).statistics(2.25, -1.0)
+            values = y[(x >= -1.0) & (x <= 2.25) & numpy.isfinite(y)]
+            assert stats['count'] == len(values)
+            assert abs(stats['sum']  - values.sum()) < 1e-9
+            assert abs(stats['mean'] - values.mean()) < 1e-9
+            assert abs(stats['rms']  - numpy.sqrt((values**2).mean())) < 1e-9
+            assert stats['min'] == values.min()
+            assert stats['max'] == values.max()
+
+        stats = LineIndex(self.x, self.y).statistics(200.0, 300.0)
+        assert stats['count'] == 0 and numpy.isnan(stats['mean'])
+
+    def testYRange(self):
+        index = LineIndex(self.sx, self.sy)
+        inside = (self.sx >= 1.5) & (self.sx <= 4.0)
+        assert index.yrange(4.0, 1.5) == (self.sy[inside].min(),
+                                          self.sy[inside].max())
+
+    def testSelect(self):
+        x, y = LineIndex(self.x, self.y).select(10.0, 5.0)
+        assert x[0] == 5.0 and x[-1] == 10.0 and len(y) == 11
+        assert numpy.may_share_memory(x, self.x)
+
+        x, y = LineIndex(self.sx, self.sy).select(1.5, 4.0)
+        inside = (self.sx >= 1.5) & (self.sx <= 4.0)
+        assert (x == self.sx[inside]).all() and (y == self.sy[inside]).all()
+
+    def testFitY(self):
+        axes = Figure().add_subplot(111)
+        axes.plot([0.0, 1.0, 2.0, 3.0], [5.0, -1.0, 2.0, 9.0])
+        axes.plot([2.5, 10.0], [4.0, 100.0])
+        hidden, = axes.plot([1.0, 2.0], [-50.0, 50.0])
+        hidden.set_visible(False)
+
+        # Only -1.0, 2.0 and 4.0 lie within the X view.
+        axes.set_xlim(0.5, 2.6)
+        fit_y(axes, margin = 0.1)
+        assert numpy.allclose(axes.get_ylim(), (-1.5, 4.5))
+
+        # With nothing in view the limits are left alone.
+        axes.set_xlim(20.0, 30.0)
+        fit_y(axes, margin = 0.1)
+        assert numpy.allclose(axes.get_ylim(), (-1.5, 4.5))
+
+    def testFitYNaN(self):
+        axes = Figure().add_subplot(111)
+        axes.set_ylim(-3.0, 3.0)
+        fit_y(axes)
+        assert axes.get_ylim() == (-3.0, 3.0)
+
+        axes.plot([0.0, 1.0, 2.0], [numpy.nan] * 3)
+        axes.set_xlim(0.0, 2.0)
+        axes.set_ylim(-3.0, 3.0)
+        fit_y(axes)
+        assert axes.get_ylim() == (-3.0, 3.0)
+
+        axes.plot([0.0, 1.0, 2.0], [numpy.nan, 7.0, numpy.nan])
+        fit_y(axes, margin = 0.1)
+        assert numpy.allclose(axes.get_ylim(), (6.3, 7.7))
+
+if __name__ == '__main__':
+    unittest.main()
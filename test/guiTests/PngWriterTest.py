@@ -0,0 +1,96 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import sys
+
+if __name__ == "__main__":
+    sys.path[1:1] = ["..", "../../"]
+from   gui.framework.PngWriter import PngWriter, SIGNATURE
+import numpy
+import os
+import struct
+import tempfile
+import unittest
+import zlib
+
+def read_png(path):
+    "Returns the chunks of a PNG file as a list of types and data."
+    f = open(path, "rb")
+    text = f.read()
+    f.close()
+    assert text.startswith(SIGNATURE)
+    chunks, position = [], len(SIGNATURE)
+    while position < len(text):
+        length, = struct.unpack(">I", text[position:position + 4])
+        kind = text[position + 4:position + 8]
+        data = text[position + 8:position + 8 + length]
+        crc, = struct.unpack(">I", text[position + 8 + length:
+                                        position + 12 + length])
+        assert crc == zlib.crc32(kind + data) & 0xffffffff
+        chunks.append((kind, data))
+        position += 12 + length
+    return chunks
+
+class PngWriterTest(unittest.TestCase):
+    "Tests of the streaming PNG writer."
+
+    def setUp(self):
+        self.path = tempfile.mktemp(suffix = ".png")
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def testImage(self):
+        width, height = 301, 200
+        image = numpy.random.randint(0, 256, (height, width, 4)) \
+                     .astype(numpy.uint8)
+        writer = PngWriter(self.path, width, height, chunk = 10000)
+        for top in range(0, height, 17):
+            writer.Write(image[top:top + 17])
+        self.failIf(os.path.exists(self.path))
+        writer.Close()
+
+        chunks = read_png(self.path)
+        kinds  = [kind for kind, data in chunks]
+        self.assertEqual(kinds[0], "IHDR")
+        self.assertEqual(kinds[-1], "IEND")
+        # Random pixels do not compress, so the data is split in chunks.
+        self.failUnless(kinds.count("IDAT") > 1)
+        self.assertEqual(struct.unpack(">IIBBBBB", chunks[0][1]),
+                         (width, height, 8, 6, 0, 0, 0))
+
+        data = zlib.decompress("".join([data for kind, data in chunks
+                                        if kind == "IDAT"]))
+        lines = numpy.fromstring(data, numpy.uint8).reshape(height, -1)
+        self.failIf(lines[:, 0].any())
+        self.failUnless((lines[:, 1:].reshape(image.shape) == image).all())
+
+    def testShape(self):
+        writer = PngWriter(self.path, 10, 2)
+        self.assertRaises(ValueError, writer.Write,
+                          numpy.zeros((1, 11, 4), numpy.uint8))
+        self.assertRaises(ValueError, writer.Write,
+                          numpy.zeros((3, 10, 4), numpy.uint8))
+        writer.Write(numpy.zeros((1, 10, 4), numpy.uint8))
+        # An image missing rows is not left behind.
+        self.assertRaises(ValueError, writer.Close)
+        self.failIf(os.path.exists(self.path))
+        self.failIf(os.path.exists(self.path + ".tmp"))
+
+if __name__ == "__main__":
+    unittest.main()
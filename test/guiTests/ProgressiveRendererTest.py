@@ -0,0 +1,148 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+import sys
+
+if __name__ == "__main__":
+    sys.path[1:1] = ["..", "../../"]
+from   gui.framework.ProgressiveRenderer import ProgressiveRenderer
+from   matplotlib.backends.backend_agg import FigureCanvasAgg
+from   matplotlib.figure import Figure
+import numpy
+import unittest
+
+class Timer:
+    "Stands in for a wx.CallLater timer that fires only when asked to."
+
+    def __init__(self, delay, callback, *args):
+        self.callback = callback
+        self.args     = args
+        self.running  = True
+
+    def Stop(self):
+        self.running = False
+
+    def Restart(self, delay):
+        self.running = True
+
+    def Fire(self):
+        self.running = False
+        self.callback(*self.args)
+
+class EventLoop:
+    "Stands in for the wx timers and application used by the renderer."
+
+    def __init__(self):
+        self.timers  = []
+        self.pending = False
+
+    def CallLater(self, delay, callback, *args):
+        self.timers.append(Timer(delay, callback, *args))
+        return self.timers[-1]
+
+    def GetApp(self):
+        return self
+
+    def Pending(self):
+        return self.pending
+
+class ProgressiveRendererTest(unittest.TestCase):
+    "Tests of the coarse and full resolution rendering passes."
+
+    def setUp(self):
+        self.module = sys.modules[ProgressiveRenderer.__module__]
+        self.wx     = self.module.wx
+        self.events = self.module.wx = EventLoop()
+
+        self.figure = Figure(figsize = (2, 2), dpi = 100)
+        FigureCanvasAgg(self.figure)
+        self.axes = self.figure.add_subplot(111)
+        x = numpy.arange(20000.0)
+        self.large, = self.axes.plot(x, numpy.sin(x))
+        self.small, = self.axes.plot([0.0, 20000.0], [0.0, 1.0])
+
+        self.renderer = ProgressiveRenderer(self, threshold = 10000)
+        self.passes   = []
+
+    def tearDown(self):
+        self.module.wx = self.wx
+
+    def get_figure(self):
+        return self.figure
+
+    def draw(self):
+        "Records the visible lines and their lengths."
+        self.passes.append([(line, len(line.get_xdata(orig=True)))
+                            for line in self.axes.lines
+                            if line.get_visible()])
+
+    def testCoarse(self):
+        self.renderer.Draw(self.draw)
+        self.failUnless(self.renderer.IsRefining())
+
+        drawn = dict(self.passes[0])
+        self.failIf(self.large in drawn)
+        self.assertEqual(drawn[self.small], 2)
+        standIns = [line for line in drawn if line is not self.small]
+        self.assertEqual(len(standIns), 1)
+        self.failUnless(drawn[standIns[0]] < 20000)
+        self.assertEqual(standIns[0].get_color(), self.large.get_color())
+
+        self.assertEqual(self.axes.lines, [self.large, self.small])
+        self.failUnless(self.large.get_visible())
+
+    def testRefine(self):
+        self.renderer.Draw(self.draw)
+        timer, = self.events.timers
+
+        # Refinement waits while user events are pending.
+        self.events.pending = True
+        timer.Fire()
+        self.assertEqual(len(self.passes), 1)
+        self.failUnless(self.renderer.IsRefining())
+
+        self.events.pending = False
+        timer.Fire()
+        self.failIf(self.renderer.IsRefining())
+        self.assertEqual(self.passes[1], [(self.large, 20000),
+                                          (self.small, 2)])
+
+    def testAbandon(self):
+        self.renderer.Draw(self.draw)
+        self.renderer.Draw(self.draw)
+        first, second = self.events.timers
+        self.failIf(first.running)
+        self.failUnless(second.running)
+
+        # A stale timer that still fires draws nothing.
+        first.Fire()
+        self.assertEqual(len(self.passes), 2)
+        self.failUnless(self.renderer.IsRefining())
+
+        second.Fire()
+        self.assertEqual(len(self.passes), 3)
+        self.assertEqual(self.passes[2][0], (self.large, 20000))
+
+    def testDirect(self):
+        self.renderer.SetEnabled(False)
+        self.renderer.Draw(self.draw)
+        self.failIf(self.renderer.IsRefining())
+        self.assertEqual(self.events.timers, [])
+        self.assertEqual(self.passes, [[(self.large, 20000),
+                                        (self.small, 2)]])
+
+if __name__ == '__main__':
+    unittest.main()
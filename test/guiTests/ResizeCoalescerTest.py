@@ -0,0 +1,88 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+import sys
+
+if __name__ == "__main__":
+    sys.path[1:1] = ["..", "../../"]
+from   gui.framework.ResizeCoalescer import ResizeCoalescer
+import unittest
+
+class Timer:
+    "Stands in for a wx.CallLater timer that fires only when asked to."
+
+    def __init__(self, delay, callback):
+        self.callback = callback
+        self.restarts = 0
+
+    def Restart(self, delay):
+        self.restarts += 1
+
+    def Fire(self):
+        self.callback()
+
+class ResizeCoalescerTest(unittest.TestCase):
+    "Tests of the coalescing of size events into one redraw."
+
+    def setUp(self):
+        self.module = sys.modules[ResizeCoalescer.__module__]
+        self.wx     = self.module.wx
+        self.module.wx = self
+
+        self.timers  = []
+        self.draws   = 0
+        self.resizer = ResizeCoalescer(self, 200)
+
+    def tearDown(self):
+        self.module.wx = self.wx
+
+    def CallLater(self, delay, callback):
+        self.assertEqual(delay, 200)
+        self.timers.append(Timer(delay, callback))
+        return self.timers[-1]
+
+    def draw(self):
+        self.draws += 1
+
+    def onSize(self, size):
+        "Handles a size event the way the plot view does."
+        if self.resizer.SetSize(size):
+            self.resizer.Defer()
+
+    def testCoalesce(self):
+        for size in [(400, 300), (410, 300), (420, 305), (420, 305),
+                     (430, 310)]:
+            self.onSize(size)
+
+        timer, = self.timers
+        self.assertEqual(timer.restarts, 3)
+        self.assertEqual(self.draws, 0)
+        self.failUnless(self.resizer.IsPending())
+
+        timer.Fire()
+        self.assertEqual(self.draws, 1)
+        self.failIf(self.resizer.IsPending())
+
+        # The same size again needs no redraw; a new one starts over.
+        self.onSize((430, 310))
+        self.assertEqual(len(self.timers), 1)
+        self.onSize([440, 320])
+        self.assertEqual(len(self.timers), 2)
+        self.timers[1].Fire()
+        self.assertEqual(self.draws, 2)
+
+if __name__ == '__main__':
+    unittest.main()
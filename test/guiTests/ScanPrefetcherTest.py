@@ -0,0 +1,90 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import sys
+
+if __name__ == "__main__":
+    sys.path[1:1] = ["..", "../../"]
+
+from gui.framework.ScanPrefetcher import ScanPrefetcher, get_nbytes
+import numpy
+import threading
+import time
+import unittest
+
+class ScanPrefetcherTest(unittest.TestCase):
+    "Tests of the read-ahead scan cache."
+
+    def setUp(self):
+        self.loaded = []
+        self.lock   = threading.Lock()
+
+    def load(self, key):
+        self.lock.acquire()
+        self.loaded.append(key)
+        self.lock.release()
+        return numpy.zeros(100) + key # 800 bytes
+
+    def wait(self, scans):
+        "Waits for the background loads to finish."
+        for i in range(500):
+            if not scans.wanted and scans.loading is None: return
+            time.sleep(0.01)
+
+    def testGetNBytes(self):
+        assert get_nbytes([numpy.zeros(4), {'a' : numpy.zeros(2)}]) == 48
+        assert get_nbytes("text") == 0
+        # Shared arrays and views count once.
+        x = numpy.zeros(10)
+        spectra = numpy.zeros((3, 10))
+        assert get_nbytes([(x, row) for row in spectra]) == 320
+
+    def testPrefetch(self):
+        scans = ScanPrefetcher(range(10, 20), self.load, ahead = 2)
+        try:
+            assert scans.Get(0)[0] == 10
+            self.wait(scans)
+            assert sorted(self.loaded) == [10, 11, 12]
+
+            # The next scans come from the cache and ask for more.
+            assert scans.Get(1)[0] == 11
+            assert scans.Get(2)[0] == 12
+            self.wait(scans)
+            assert sorted(self.loaded) == [10, 11, 12, 13, 14]
+            assert scans.GetCache().GetStatistics()['hits'] == 2
+
+            # Going back reads ahead backwards, and stops at the start.
+            scans.Get(9, -1)
+            self.wait(scans)
+            assert sorted(self.loaded)[-3:] == [17, 18, 19]
+        finally:
+            scans.Stop()
+
+    def testMemoryCap(self):
+        scans = ScanPrefetcher(range(10), self.load, ahead = 1,
+                               maxsize = 2000)
+        try:
+            for i in range(10):
+                scans.Get(i)
+            self.wait(scans)
+            assert scans.GetCache().GetStatistics()['size'] <= 2000
+            assert 9 in scans.GetCache() and 0 not in scans.GetCache()
+        finally:
+            scans.Stop()
+
+if __name__ == '__main__':
+    unittest.main()
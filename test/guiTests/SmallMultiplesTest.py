@@ -0,0 +1,86 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import sys
+
+if __name__ == "__main__":
+    sys.path[1:1] = ["..", "../../"]
+from   gui.framework.SmallMultiples import SmallMultiples, get_panels
+from   gui.framework.SmallMultiples import nice_ticks
+from   matplotlib.backends.backend_agg import FigureCanvasAgg
+from   matplotlib.figure import Figure
+import numpy
+import unittest
+
+class SmallMultiplesTest(unittest.TestCase):
+    "Tests of the small multiples grid."
+
+    def setUp(self):
+        self.figure = Figure(figsize = (6, 6), dpi = 100)
+        FigureCanvasAgg(self.figure)
+        self.data = numpy.arange(7 * 2 * 10, dtype = numpy.float64) \
+                         .reshape(7, 2, 10)
+        self.multiples = SmallMultiples(self.figure, self.data)
+
+    def testGrid(self):
+        self.assertEqual(self.multiples.GetPanelCount(), 7)
+        self.assertEqual((self.multiples.rows, self.multiples.cols), (3, 3))
+        self.assertEqual(len(self.multiples.layers), 2)
+        # One segment per panel in every layer.
+        for layer in self.multiples.layers:
+            self.assertEqual(len(layer.get_segments()), 7)
+
+        self.multiples.SetData(self.data[:, 0], cols = 4)
+        self.assertEqual((self.multiples.rows, self.multiples.cols), (2, 4))
+
+    def testSharedLimits(self):
+        xlim, ylim = self.multiples.GetLimits(0)
+        self.assertEqual(xlim, (0, 9))
+        self.assertEqual(ylim, (0, self.data.max()))
+        self.assertEqual(self.multiples.GetLimits(6), (xlim, ylim))
+
+        multiples = SmallMultiples(self.figure, self.data, sharey = False)
+        self.assertEqual(multiples.GetLimits(1)[1], (20, 39))
+
+    def testZoom(self):
+        self.multiples.SetLimits((2, 4), (5, 50))
+        self.assertEqual(self.multiples.GetLimits(3), ((2, 4), (5, 50)))
+        self.failUnless(self.multiples.Unzoom())
+        self.assertEqual(self.multiples.GetLimits(3)[0], (0, 9))
+        self.failIf(self.multiples.Unzoom())
+
+    def testPanelAt(self):
+        # The middle of the cell in the second row, first column.
+        panel, x, y = self.multiples.PanelAtGrid(0.5, 1.5)
+        self.assertEqual(panel, 3)
+        self.assertAlmostEqual(x, 4.5)
+        self.assertEqual(self.multiples.PanelAtGrid(1.5, 2.5), None)
+        self.assertEqual(self.multiples.PanelAtGrid(0.01, 0.5), None)
+
+        self.multiples.Focus(5)
+        self.assertEqual(self.multiples.PanelAtGrid(0.5, 0.5)[0], 5)
+        self.multiples.Unfocus()
+        self.assertEqual(self.multiples.GetFocus(), None)
+
+    def testPanels(self):
+        panels = get_panels([numpy.zeros(3), [numpy.ones(4), numpy.ones(2)]])
+        self.assertEqual([len(panel) for panel in panels], [1, 2])
+        self.assertRaises(ValueError, get_panels, numpy.zeros(3))
+        self.assertEqual(list(nice_ticks(0, 10)), [0, 2, 4, 6, 8, 10])
+
+if __name__ == "__main__":
+    unittest.main()
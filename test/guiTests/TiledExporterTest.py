@@ -0,0 +1,83 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+import sys
+
+if __name__ == "__main__":
+    sys.path[1:1] = ["..", "../../"]
+from   gui.framework.TiledExporter import TiledExporter
+from   matplotlib.backends.backend_agg import FigureCanvasAgg
+from   matplotlib.figure import Figure
+from   PngWriterTest import read_png
+import numpy
+import os
+import tempfile
+import unittest
+import zlib
+
+class TiledExporterTest(unittest.TestCase):
+    "Tests of exporting a figure in tiles."
+
+    def setUp(self):
+        self.path = tempfile.mktemp(suffix = ".png")
+        self.figure = Figure(figsize = (4, 3), dpi = 80)
+        FigureCanvasAgg(self.figure)
+        axes = self.figure.add_subplot(111)
+        axes.plot([1, 2, 3], [3, 1, 2], label = "line")
+        axes.scatter([1, 2], [2, 3], label = "points")
+        axes.annotate("peak", (1, 3), xytext = (2, 2.5),
+                      arrowprops = dict())
+        axes.legend()
+        axes.set_title("title")
+        axes.set_xlabel("x")
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def read(self, width, height):
+        "Returns the pixels of the image written."
+        data = zlib.decompress("".join([data for kind, data
+                                        in read_png(self.path)
+                                        if kind == "IDAT"]))
+        lines = numpy.fromstring(data, numpy.uint8).reshape(height, -1)
+        return lines[:, 1:].reshape(height, width, 4)
+
+    def testTiles(self):
+        # Bands of 50 rows, each of 7 tiles.
+        exporter = TiledExporter(self.figure, (400, 300), tile = 64,
+                                 memory = 400 * 4 * 50)
+        exporter.Write(self.path)
+        image = self.read(400, 300)
+
+        self.figure.set_dpi(100)
+        self.figure.canvas.draw()
+        expected = numpy.frombuffer(self.figure.canvas.buffer_rgba(),
+                                    numpy.uint8).reshape(300, 400, 4)
+        # Only the antialiasing of a few edges may differ.
+        difference = abs(image.astype(int) - expected).max(2)
+        self.failUnless((difference > 64).sum() < 100)
+        self.failUnless((difference > 0).mean() < 0.01)
+
+    def testRestore(self):
+        TiledExporter(self.figure, (200, 100), tile = 64).Write(self.path)
+        self.assertEqual(list(self.figure.get_size_inches()), [4, 3])
+        self.assertEqual(self.figure.dpi, 80)
+        self.assertEqual(list(self.figure.transFigure.transform((1, 1))),
+                         [320, 240])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, write to the
+#
+# Free Software Foundation, Inc.,
+# 675 Mass Ave
+# Cambridge, MA 02139, USA.
+
+import sys
+
+if __name__ == "__main__":
+    sys.path[1:1] = ["..", "../../"]
+from   gui.framework.Waterfall import Waterfall
+from   matplotlib.backends.backend_agg import FigureCanvasAgg
+from   matplotlib.figure import Figure
+import numpy
+import unittest
+
+class WaterfallTest(unittest.TestCase):
+    "Tests of the scrolling time versus channel image."
+
+    def setUp(self):
+        figure = Figure()
+        FigureCanvasAgg(figure)
+        self.axes = figure.add_subplot(111)
+        self.waterfall = Waterfall(self.axes, 3, capacity = 4)
+
+    def rows(self, first, last):
+        "Returns rows whose values are their number."
+        return numpy.repeat(numpy.arange(first, last), 3).reshape(-1, 3)
+
+    def testAppend(self):
+        self.waterfall.Append(self.rows(0, 2))
+        self.failUnless((self.waterfall.GetData() == self.rows(0, 2)).all())
+        older, newer = self.waterfall.GetImages()
+        self.failIf(older.get_visible())
+        self.assertEqual(newer.get_array().shape, (2, 3, 4))
+
+    def testWrap(self):
+        for n in range(6):
+            self.waterfall.Append(self.rows(n, n + 1)[0])
+        # The oldest rows were overwritten; the rest stay in order.
+        self.failUnless((self.waterfall.GetData() == self.rows(2, 6)).all())
+        self.assertEqual(self.waterfall.head, 2)
+
+        # The rows before the wrap point are older, and drawn below.
+        older, newer = self.waterfall.GetImages()
+        self.assertEqual(older.get_array().shape[0], 2)
+        self.assertEqual(newer.get_array().shape[0], 2)
+        self.assertEqual(tuple(older.get_extent()[2:]), (2, 4))
+        self.assertEqual(tuple(newer.get_extent()[2:]), (4, 6))
+        self.assertEqual(tuple(self.axes.get_ylim()), (2, 6))
+
+    def testAppendMany(self):
+        # More rows than the capacity keep only the newest.
+        self.waterfall.Append(self.rows(0, 3))
+        self.waterfall.Append(self.rows(3, 10))
+        self.failUnless((self.waterfall.GetData() == self.rows(6, 10)).all())
+        self.assertEqual(self.waterfall.total, 10)
+
+    def testColorScale(self):
+        self.waterfall.Append(self.rows(0, 2))
+        vmin, vmax = self.waterfall.norm.vmin, self.waterfall.norm.vmax
+        self.failUnless(vmin < 0 and vmax > 1)
+        # Rows within the scale do not change it; others widen it.
+        self.waterfall.Append(self.rows(1, 2))
+        self.assertEqual(self.waterfall.norm.vmax, vmax)
+        self.waterfall.Append(self.rows(5, 6))
+        self.failUnless(self.waterfall.norm.vmax > 5)
+
+        self.waterfall.SetClim(0, 10)
+        self.assertEqual((self.waterfall.norm.vmin,
+                          self.waterfall.norm.vmax), (0, 10))
+        self.waterfall.Append(self.rows(20, 21))
+        self.assertEqual(self.waterfall.norm.vmax, 10)
+
+    def testChannels(self):
+        self.assertRaises(ValueError, self.waterfall.Append, numpy.zeros(4))
+
+    def testViews(self):
+        # The images show the buffer itself, not copies of it.
+        for n in range(6):
+            self.waterfall.Append(self.rows(n, n + 1)[0])
+            for image in self.waterfall.GetImages():
+                if image.get_visible():
+                    self.failUnless(image.get_array().base is
+                                    self.waterfall.texture)
+        self.axes.figure.canvas.draw()
+
+if __name__ == "__main__":
+    unittest.main()
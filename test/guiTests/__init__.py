@@ -1,3 +1,16 @@
 from ConfigValuesTest import ConfigValuesTest
-
-
+from LineIndexTest import LineIndexTest
+from LRUCacheTest import LRUCacheTest
+from DensityImageTest import DensityImageTest
+from AggregateImageTest import AggregateImageTest
+from ScanPrefetcherTest import ScanPrefetcherTest
+from PngWriterTest import PngWriterTest
+from FrameRateGovernorTest import FrameRateGovernorTest
+from ArtistCullerTest import ArtistCullerTest
+from GridLayoutTest import GridLayoutTest
+from SmallMultiplesTest import SmallMultiplesTest
+from WaterfallTest import WaterfallTest
+from TiledExporterTest import TiledExporterTest
+from LayoutCacheTest import LayoutCacheTest
+from ProgressiveRendererTest import ProgressiveRendererTest
+from ResizeCoalescerTest import ResizeCoalescerTest